@@ -16,8 +16,8 @@ FUNCTION:  ioDevices.py provides classes to define and manage six types
    USAGE:  ioDevices.py is included by the primary plugin module,
            plugin.py.  Its methods are called as needed by plugin.py methods.
   AUTHOR:  papamac
- VERSION:  0.10.1
-    DATE:  March 25, 2024
+ VERSION:  0.11.0
+    DATE:  October 18, 2026
 
 UNLICENSE:
 
@@ -52,10 +52,11 @@ The Pi GPIO plugin bundle has two primary Python modules: plugin.py
 encapsulates the plugin device behavior in the Plugin class, and this module,
 ioDevices.py, encapsulates detailed io device behavior in the IoDevice
 class and its six subclasses.  An IoDevice subclass instance is created for
-each plugin device started by plugin.py.  The plugin bundle contains two
-supporting Python modules: rgpio.pi with classes/methods to access the rgpio
-daemon and conditionalLogging.py to provide flexible Indigo logging by message
-type and logging level.  It also includes several xml files that define plugin
+each plugin device started by plugin.py.  The plugin bundle contains three
+supporting Python modules: rgpio.py with classes/methods to access the rgpio
+daemon, conditionalLogging.py to provide flexible Indigo logging by message
+type and logging level, and pollScheduler.py to schedule io device polling.
+It also includes several xml files that define plugin
 devices, actions, and events.
 
 MODULE ioDevices.py DESCRIPTION:
@@ -171,6 +172,70 @@ v0.10.1  3/25/2024  (1) Refactor a key filename and class name to be consistent
                     comments for readability.
                     (4) Update ioDevices.py comments and docstrings.
 v0.10.2   4/1/2024  Update the wiki in preparation for the initial release.
+v0.11.0 10/18/2026  (1) Poll io devices from a deadline heap poll scheduler
+                    (pollScheduler.py) instead of a run loop search of the
+                    Indigo device database.  IoDevice start/stop methods
+                    add/remove devices from the scheduler.
+                    (2) Save polling properties in IoDevice.__init__ and use
+                    the monotonic clock for polling status monitoring.
+                    (3) Poll devices on one worker thread per rgpiod
+                    connection id and log per-host polling lag statistics at
+                    shutdown.
+                    (4) Use rgpio batches for the consecutive spi integrity
+                    check reads in ADC12 and IoExpander devices.
+                    (5) Read the GPIO ports of each MCP23XXX chip once per
+                    poll window using a shared ExpanderChip object and
+                    share the port values with all IoExpander devices on the
+                    chip.
+                    (6) Keep shadow copies of the MCP23XXX configuration and
+                    OLAT registers in the ExpanderChip object.  Write
+                    IoExpander outputs to OLAT without read-modify-write bus
+                    transactions and verify the shadow registers
+                    periodically and on status requests.
+                    (7) Configure MCP23XXX chips once for all their devices
+                    when the ExpanderChip object is created using sequential
+                    register block reads/writes.
+                    (8) Service io expander interrupts once per chip.  Read
+                    INTF and INTCAP in a single sequential read and update
+                    all flagged devices on the chip.
+                    (9) Add an ADC12 scan mode that reads all the scan mode
+                    channels of an MCP320X chip in a single rgpio batch using
+                    a shared ADC12Chip object.
+                    (10) Replace the ADC12 double read spi check with
+                    batched oversampling reduced by a mean, median, or
+                    trimmed mean.  Log spi integrity statistics once per
+                    status interval.
+                    (11) Read ADC18 conversion results after the datasheet
+                    conversion time with bounded ready bit retries.  Schedule
+                    polled result reads on the poll scheduler.  Serialize the
+                    conversions of the channels on a chip using a shared
+                    ADC18Chip object.
+                    (12) Add an ADC18 continuous mode that converts the
+                    continuous mode channels of a chip in a background round
+                    robin and reads the latest cached results.
+                    (13) Use i2c_zip commands for multiple register transfers
+                    on i2c io expanders and to chain ADC18 round robin steps.
+                    (14) Add a DAC12 writeBoth method that writes both
+                    channels of a dual channel DAC in one rgpio batch with an
+                    optional LDAC GPIO pulse to latch the outputs together.
+                    (15) Add DAC12 ramp, steps, and stream methods that write
+                    precomputed DAC input words on a DacStream timing thread
+                    and report the achieved sample rate and jitter.
+                    (16) Read the polled PiGPIO digital inputs on a gpio chip
+                    with a single group_read per poll window using a shared
+                    GpioGroup object.
+                    (17) Add a writeScene function that switches sets of
+                    digital outputs together with one group_write per gpio
+                    chip and one OLAT write per io expander port.  Claim the
+                    non-pwm PiGPIO outputs as an output group.
+                    (18) Schedule momentary turn-offs on the poll scheduler
+                    instead of sleeping in the write action thread.
+                    Re-triggering a momentary output extends its pulse.
+                    (19) Pulse momentary PiGPIO outputs with a single
+                    daemon timed tx_pulse command.
+                    (20) Optionally coalesce PiGPIO callback edges and
+                    publish the onOffState at a maximum rate with edgeCount,
+                    firstEdge, and lastEdge states.
 """
 ###############################################################################
 #                                                                             #
@@ -179,23 +244,41 @@ v0.10.2   4/1/2024  Update the wiki in preparation for the initial release.
 ###############################################################################
 
 __author__ = 'papamac'
-__version__ = '0.10.1'
-__date__ = '3/25/2024'
+__version__ = '0.11.0'
+__date__ = '10/18/2026'
 
 import indigo
 
 from abc import ABC, abstractmethod
 from datetime import datetime
 from logging import getLogger
+from statistics import mean, median
+from math import ceil
+from threading import Condition, Event, Lock, RLock, Thread, current_thread
 import time
 
 from conditionalLogging import LD, LI
+from pollScheduler import PollScheduler
 import rgpio
 
 # General global constants:
 
 L = getLogger("Plugin")  # Standard Plugin logger.
 ON_OFF = ('off', 'on')   # onOffState text values.
+SHADOW_VERIFY_INTERVAL = 600.0  # io expander shadow register verify interval
+#                                 (seconds).
+OUTLIER_COUNTS = 10  # ADC12 oversampling spi integrity outlier threshold
+#                      (counts from the median).
+LATE_TURN_OFF = 0.1  # Momentary turn-off lateness warning threshold
+#                      (seconds).
+ZERO_TURN_OFF_DELAY = 0.25  # Momentary turn-off delay used for a 0 setting
+#                             (seconds).
+
+# i2c_zip command codes and the maximum number of i2c messages (write or read
+# segments) in a single i2c_zip command:
+
+ZIP_END, ZIP_READ, ZIP_WRITE = 0, 4, 5
+MAX_ZIP_SEGMENTS = 32
 
 # Global dictionary of io device class names keyed by io device type:
 # IO_DEV_CLASS[ioDevType] = ioDevClass
@@ -243,12 +326,17 @@ _ioDevices = {}
 
 _resources = {}
 
+# Poll scheduler for all running io devices with polling enabled:
+
+_pollScheduler = PollScheduler()
+
 
 ###############################################################################
 #                                                                             #
 #                          INTERNAL MODULE FUNCTIONS                          #
 #                                                                             #
 # def _executeEventTriggers(dev, eventType, eventName, description='')        #
+# def _connectionId(pluginProps)                                              #
 # def _pigpioError(dev, errorType, errorMessage)                              #
 #                                                                             #
 ###############################################################################
@@ -296,6 +384,18 @@ def _executeEventTriggers(dev, eventType, eventName, description='',
     _priorTriggerTime[eventName] = eventTime
 
 
+def _connectionId(pluginProps):
+    """
+    Return the rgpiod connection id for a device's pluginProps.  The
+    connection id is the host id if it is specified and the default port
+    number is used.  Otherwise, it is the host address and port number.
+    """
+    hostId = pluginProps['hostId']
+    portNumber = pluginProps['portNumber']
+    return (hostId if hostId and portNumber == '8889'
+            else pluginProps['hostAddress'] + ':' + portNumber)
+
+
 def _pigpioError(dev, errorType, errorMessage):
     """
     Perform the following standard functions for an io device error:
@@ -324,6 +424,10 @@ def _pigpioError(dev, errorType, errorMessage):
 # def getRpiModel(connection)                                                 #
 # def logStartupSummary()                                                     #
 # def logShutdownSummary()                                                    #
+# def runPolling(minInterval)                                                 #
+# def setMinPollingInterval(minInterval)                                      #
+# def stopPolling()                                                           #
+# def writeScene(scene)                                                       #
 #                                                                             #
 ###############################################################################
 
@@ -421,6 +525,70 @@ def logShutdownSummary():
     else:
         L.info('All rgpiod resources stopped/closed')
 
+    _pollScheduler.logSummary()
+
+
+def runPolling(minInterval):
+    """
+    Run the poll scheduler with a minimum polling interval (the run loop sleep
+    time from the pluginPrefs).  Dispatch io device polls in deadline order to
+    per-host worker threads until stopPolling is called.
+    """
+    _pollScheduler.setMinInterval(minInterval)
+    _pollScheduler.run()
+
+
+def setMinPollingInterval(minInterval):
+    """ Change the minimum polling interval for all io devices. """
+    _pollScheduler.setMinInterval(minInterval)
+
+
+def stopPolling():
+    """ Stop the poll scheduler run loop. """
+    _pollScheduler.stop()
+
+
+def writeScene(scene):
+    """
+    Write a scene (a list of (Indigo device, bit) tuples) to a set of digital
+    outputs so that the outputs on each chip switch together.  Group the
+    writes by their shared GpioGroup or ExpanderChip object.  Write each
+    gpio group with a single group_write and each io expander with a single
+    port-wide OLAT write per port (one i2c_zip command or rgpio batch).
+    Write pwm and momentary outputs individually.  Update/log the Indigo
+    device onOffStates.  If a group or chip write fails, report the error
+    for every device in the write.
+    """
+    targets = {}  # Lists of (ioDev, bit) tuples keyed by group/chip object.
+    for dev, bit in scene:
+        ioDev = getIoDev(dev)
+        if not ioDev or dev.deviceTypeId != 'digitalOutput':
+            L.warning('"%s" digital output not available; scene write '
+                      'ignored', dev.name)
+            continue
+        target = (getattr(ioDev, '_group', None)
+                  or getattr(ioDev, '_chip', None))
+        if target and not dev.pluginProps.get('momentary'):
+            targets.setdefault(target, []).append((ioDev, bit))
+        else:
+            ioDev.write(bit)
+
+    for target, ioDevBits in targets.items():
+        try:
+            if isinstance(target, GpioGroup):
+                target.write({ioDev._gpioNumber: bit
+                              for ioDev, bit in ioDevBits})
+            else:  # ExpanderChip
+                target.writeOutputs([(ioDev._offset, ioDev._mask, bit)
+                                     for ioDev, bit in ioDevBits])
+        except Exception as errorMessage:
+            for ioDev, bit in ioDevBits:  # Report the error for each device.
+                _pigpioError(ioDev._dev, 'write', errorMessage)
+            continue
+        for ioDev, bit in ioDevBits:
+            LD.digital('"%s" scene write %s', ioDev._dev.name, ON_OFF[bit])
+            ioDev._updateOnOffState(bit)
+
 
 ###############################################################################
 #                                                                             #
@@ -472,12 +640,12 @@ class IoDevice(ABC):
                               device.
     write                     Calls the subclass _write method to write to the
                               io device.
-    poll                      Called by the runConcurrentThread method in
-                              plugin.py to read io devices (poll them) at a
-                              unique rate for each device.
+    poll                      Called by the poll scheduler to read io devices
+                              (poll them) at a unique rate for each device.
     start                     Starts the io device by signaling that all
                               startup functions have completed successfully and
-                              the device is running.
+                              the device is running.  Adds the device to the
+                              poll scheduler if polling is enabled.
     running                   Returns the io device running status.
     stop                      Stops an io device and releases its reserved
                               resources.
@@ -589,8 +757,24 @@ class IoDevice(ABC):
         self._h = None           # gpio, i2c or spi handle.
         self._hId = None         # gpio, i2c or spi handle id.
         self._callbackId = None  # gpio callback identification object.
+        self._turnOffEntry = None  # Pending momentary turn-off call.
+        self._turnOffTime = None   # Monotonic time of the pending turn-off.
+        self._turnOffWrite = True  # Write the output off (False if pulsed).
+        self._turnOffLock = RLock()  # Serialize writes and turn-offs.
         self._pollCount = 0      # Poll count for polling status monitoring.
-        self._lastPoll = self._lastStatus = indigo.server.getTime()
+        self._lastStatus = time.monotonic()  # Time of last status log.
+
+        # Save the polling properties for use by the poll method.  A change
+        # in pluginProps forces a device stop/restart, so these do not change
+        # while the device is running.
+
+        pluginProps = dev.pluginProps
+        self._polling = pluginProps.get('polling', False)
+        self._pollingInterval = float(pluginProps.get('pollingInterval', 0))
+        self._logAll = pluginProps.get('logAll', False)
+        self._monitorStatus = pluginProps.get('monitorStatus', False)
+        self._statusInterval = 60 * float(pluginProps.get('statusInterval',
+                                                          10.0))
 
         # Connect to the rgpio daemon and set internal connection attributes
         # for use by all subclass methods.
@@ -622,7 +806,7 @@ class IoDevice(ABC):
     # def _getI2cHandle(self)                                                 #
     # def _getSpiHandle(self)                                                 #
     # def _releaseConnection(self)                                            #
-    # def _releaseHandle(self)                                                #
+    # def _releaseHandle(self, handleId=None)                                 #
     #                                                                         #
     ###########################################################################
     """
@@ -727,11 +911,9 @@ class IoDevice(ABC):
         Log the connection usage for debug and return the connection and its
         id.
         """
-        hostId = self._dev.pluginProps['hostId']
         hostAddress = self._dev.pluginProps['hostAddress']
         portNumber = self._dev.pluginProps['portNumber']
-        connectionId = (hostId if hostId and portNumber == '8889'
-                        else hostAddress + ':' + portNumber)
+        connectionId = _connectionId(self._dev.pluginProps)
         connection, useCount, gpioChip = _resources.get(connectionId,
                                                         (None, 0, None))
 
@@ -874,26 +1056,28 @@ class IoDevice(ABC):
             del _resources[self._cId]
             connection.stop()
 
-    def _releaseHandle(self):
+    def _releaseHandle(self, handleId=None):
         """
         Release/close the handle for the io device and update the resources
         dictionary:
 
-        Use the handle id (self._hId) to get the handle and use count for this
-        io device from the resources dictionary.  Decrement the use count and
-        update the dictionary to release the handle from this io device.  If
-        the use count is zero, delete the handle from the dictionary and close
-        it to return it to the rgpio daemon for reuse.
+        Use the handle id (self._hId or the handleId argument for a secondary
+        handle) to get the handle and use count for this io device from the
+        resources dictionary.  Decrement the use count and update the
+        dictionary to release the handle from this io device.  If the use count
+        is zero, delete the handle from the dictionary and close it to return
+        it to the rgpio daemon for reuse.
         """
-        handle, useCount = _resources[self._hId]
+        handleId = handleId or self._hId
+        handle, useCount = _resources[handleId]
         useCount -= 1
-        hSplit = self._hId.split('.')
+        hSplit = handleId.split('.')
         hName = hSplit[0] + '.' + hSplit[1] + str(handle)
         LD.resource('"%s" releasing handle %s(%s)',
                     self._dev.name, hName, useCount)
-        _resources[self._hId] = handle, useCount
+        _resources[handleId] = handle, useCount
         if not useCount:
-            del _resources[self._hId]
+            del _resources[handleId]
             LD.resource('"%s" closing handle %s', self._dev.name, hName)
             if hSplit[1] == 'gpio':
                 self._c.gpiochip_close(handle)
@@ -918,6 +1102,10 @@ class IoDevice(ABC):
     #                                                                         #
     # def _updateOnOffState(self, onOffState, sensorUiValue=None, logAll=True)#
     # def _updateSensorValueStates(self, voltage, logAll=True)                #
+    # def _scheduleTurnOff(self, write=True)                                  #
+    # def _cancelTurnOff(self)                                                #
+    # def _momentaryTurnOff(self)                                             #
+    # def _completeTurnOff(self)                                              #
     #                                                                         #
     ###########################################################################
 
@@ -1058,6 +1246,79 @@ class IoDevice(ABC):
             if not priorLimitFault:
                 _executeEventTriggers(self._dev, 'limitFault', triggerEvent)
 
+    def _scheduleTurnOff(self, write=True):
+        """
+        Schedule a momentary turn-off after the turnOffDelay time and return
+        immediately.  The turn-off is called by the poll scheduler on the
+        worker thread for the device's host.  If a turn-off is already pending
+        (the output was re-triggered), cancel it so that the output stays on
+        for a full turnOffDelay from now.  If write is False, the rgpio daemon
+        times the pulse and the turn-off only updates the onOffState.  A
+        turnOffDelay of 0 is replaced by ZERO_TURN_OFF_DELAY.
+        """
+        delay = float(self._dev.pluginProps['turnOffDelay']) \
+            or ZERO_TURN_OFF_DELAY
+        with self._turnOffLock:
+            self._cancelTurnOff()
+            self._turnOffWrite = write
+            self._turnOffTime = time.monotonic() + delay
+            self._turnOffEntry = _pollScheduler.callLater(
+                delay, self._momentaryTurnOff, self._cId)
+        LD.digital('"%s" turn-off scheduled in %s secs', self._dev.name,
+                   delay)
+
+    def _cancelTurnOff(self):
+        """ Cancel a pending momentary turn-off, if any. """
+        with self._turnOffLock:
+            entry, self._turnOffEntry = self._turnOffEntry, None
+            self._turnOffTime = None
+        if entry:
+            _pollScheduler.cancel(entry)
+
+    def _momentaryTurnOff(self):
+        """
+        Turn off a momentary output when its scheduled turn-off is called.
+        Ignore the call if the turn-off was cancelled or extended after it was
+        dispatched or if the device is stopped.  Hold the turn-off lock so
+        that a concurrent re-trigger either extends the pulse before the check
+        or turns the output on again after the turn-off.  Log the scheduling
+        lateness and log a warning if it exceeds LATE_TURN_OFF seconds.
+        """
+        with self._turnOffLock:
+            turnOffTime, now = self._turnOffTime, time.monotonic()
+            if turnOffTime is None or now < turnOffTime:  # Cancelled/extended.
+                return
+            self._turnOffEntry = self._turnOffTime = None
+            lateness = now - turnOffTime
+            LD.digital('"%s" turn-off %4.3f secs late', self._dev.name,
+                       lateness)
+            if lateness > LATE_TURN_OFF:
+                L.warning('"%s" momentary turn-off was %4.3f secs late',
+                          self._dev.name, lateness)
+            if not self._running:
+                return
+            if self._turnOffWrite:
+                self.write(0)
+            else:  # The pulse was timed by the rgpio daemon.
+                self._updateOnOffState(0)
+
+    def _completeTurnOff(self):
+        """
+        Turn the output off immediately if a momentary turn-off is pending and
+        cancel the pending turn-off.  Log a warning if the turn-off write
+        fails, but always cancel the turn-off so that the device stop can
+        continue.  Called when the device is stopped.
+        """
+        with self._turnOffLock:
+            if self._turnOffEntry:
+                try:
+                    self._write(0)
+                except Exception as errorMessage:
+                    L.warning('"%s" momentary turn-off error: %s',
+                              self._dev.name, errorMessage)
+                finally:
+                    self._cancelTurnOff()
+
     ###########################################################################
     #                                                                         #
     #                             CLASS IoDevice                              #
@@ -1104,6 +1365,7 @@ class IoDevice(ABC):
     # def read(self, logAll=True)                                             #
     # def write(self, value)                                                  #
     # def poll(self)                                                          #
+    # def monitorPolling(self)                                                #
     # def start(self)                                                         #
     # def running(self)                                                       #
     # def stop(self)                                                          #
@@ -1122,50 +1384,55 @@ class IoDevice(ABC):
 
     def write(self, value):
         """
-        Write to the io device using the subclassed _write method.  Direct any
-        exceptions to the module-level standard error handling method.
+        Write to the io device using the subclassed _write method.  Hold the
+        turn-off lock so that writes and momentary turn-offs do not interleave.
+        Direct any exceptions to the module-level standard error handling
+        method.
         """
         try:
-            self._write(value)
+            with self._turnOffLock:
+                self._write(value)
         except Exception as errorMessage:
             _pigpioError(self._dev, 'write', errorMessage)
 
     def poll(self):
         """
-        Read the io device at the specified polling interval.  Log the polled
-        value if it has changed from the previous value or if the logAll
-        property is set.  If status monitoring is enabled, accumulate polling
-        statistics and log them at the specified status interval.
-        """
-        if self._dev.pluginProps['polling']:
-            now = indigo.server.getTime()
-            secsSinceLast = (now - self._lastPoll).total_seconds()
-            pollingInterval = float(self._dev.pluginProps['pollingInterval'])
-            if secsSinceLast >= pollingInterval:
-                logAll = self._dev.pluginProps['logAll']
-                self.read(logAll=logAll)
-                self._pollCount += 1
-                self._lastPoll = now
-                if self._dev.pluginProps['monitorStatus']:
-                    secsSinceLast = (now - self._lastStatus).total_seconds()
-                    statusInterval = float(self._dev.pluginProps
-                                           ['statusInterval'])
-                    if secsSinceLast >= 60 * statusInterval:
-                        averageInterval = secsSinceLast / self._pollCount
-                        averageRate = 1 / averageInterval
-                        L.info('"%s" average polling interval is %4.2f '
-                               'secs, rate is %4.2f per sec',
-                               self._dev.name, averageInterval, averageRate)
-                        self._pollCount = 0
-                        self._lastStatus = now
+        Read the io device when called by the poll scheduler at the specified
+        polling interval.  Log the polled value if it has changed from the
+        previous value or if the logAll property is set.  Accumulate polling
+        statistics for status monitoring.
+        """
+        self.read(logAll=self._logAll)
+        self.monitorPolling()
+
+    def monitorPolling(self):
+        """
+        Count a completed poll.  If status monitoring is enabled, log the
+        average polling interval and rate at the specified status interval.
+        """
+        self._pollCount += 1
+        if self._monitorStatus:
+            now = time.monotonic()
+            secsSinceLast = now - self._lastStatus
+            if secsSinceLast >= self._statusInterval:
+                averageInterval = secsSinceLast / self._pollCount
+                averageRate = 1 / averageInterval
+                L.info('"%s" average polling interval is %4.2f secs, rate is '
+                       '%4.2f per sec', self._dev.name, averageInterval,
+                       averageRate)
+                self._pollCount = 0
+                self._lastStatus = now
 
     def start(self):
         """
         Start the io device by setting the self._running attribute.  This
         indicates that all startup functions have been successfully completed
-        and the device is running.
+        and the device is running.  If polling is enabled, add the device to
+        the poll scheduler.
         """
         self._running = True
+        if self._polling:
+            _pollScheduler.add(self, self._pollingInterval, self._cId)
 
     def running(self):
         """
@@ -1175,15 +1442,21 @@ class IoDevice(ABC):
 
     def stop(self):
         """
-        Stop the io device by removing it from the io devices dictionary
-        and the interrupt devices list in the linked interrupt relay GPIO
-        device (if applicable).  Cancel any gpio callback and release/close/
-        stop any rgpio daemon shared resources.
+        Stop the io device by clearing the running status and removing it from
+        the io devices dictionary, the poll scheduler, and the interrupt
+        devices list in the linked interrupt relay GPIO device (if
+        applicable).  Complete any pending momentary turn-off.  Cancel any gpio
+        callback and release/close/stop any rgpio daemon shared resources.
         """
+        self._running = False
         try:
-            # Remove the io device from the io devices dictionary.
+            # Remove the io device from the io devices dictionary and the poll
+            # scheduler.  Then complete any pending momentary turn-off.  The
+            # turn-off logs its own errors so that the stop can continue.
 
             del _ioDevices[self._dev.id]
+            _pollScheduler.remove(self)
+            self._completeTurnOff()
 
             # Check to see if the io device is an interrupt device.  If so,
             # remove it from the interrupt devices list in the interrupt relay
@@ -1233,11 +1506,22 @@ class IoDevice(ABC):
 #                                                                             #
 # def __init__(self, dev)                                                     #
 #                                                                             #
+#                          INTERNAL INSTANCE METHODS                          #
+#                                                                             #
+# def _getChip(self)                                                          #
+# def _releaseChip(self)                                                      #
+# def _reduce(self, codes)                                                    #
+# def _checkIntegrity(self, codes, counts)                                    #
+#                                                                             #
 #                     IMPLEMENTATION OF ABSTRACT METHODS                      #
 #                                                                             #
 # def _read(self, logAll=True)                                                #
 # def _write(self, value)                                                     #
 #                                                                             #
+#                           PUBLIC INSTANCE METHOD                            #
+#                                                                             #
+# def stop(self)                                                              #
+#                                                                             #
 ###############################################################################
 
 class ADC12(IoDevice):
@@ -1248,11 +1532,23 @@ class ADC12(IoDevice):
     from the following hardware references:
     MCP3202:   <https://ww1.microchip.com/downloads/en/DeviceDoc/21034F.pdf>
     MCP3204/8: <https://ww1.microchip.com/downloads/en/devicedoc/21298e.pdf>
-    Check the spi read integrity if requested in the pluginProps.
+    Oversample the input if requested in the pluginProps by sending multiple
+    conversion frames in a single rgpio batch and reducing the output codes
+    with a mean, median, or trimmed mean.  Count the outlier samples as a
+    measure of spi integrity.  If scan mode is selected in the pluginProps,
+    read the channel from a shared ADC12Chip object that scans all the scan
+    mode channels on the chip in a single rgpio batch.
     """
+    # Shared chip object and chip id for scan mode (set in __init__ and
+    # released in stop):
+
+    _chip = None
+    _chipId = None
+
     def __init__(self, dev):
         """
         Initialize common and unique instance attributes for ADC12 devices.
+        Attach the device to the shared chip object if scan mode is selected.
         """
         IoDevice.__init__(self, dev)  # Common initialization.
         self._h, self._hId = self._getSpiHandle()  # spi interface.
@@ -1266,32 +1562,140 @@ class ADC12(IoDevice):
         if self._dev.pluginProps['ioDevType'] == 'MCP3202':
             self._data = (0x01, inputConfiguration << 7 | adcChannel << 6, 0)
 
+        # Set the oversampling properties.  Devices that were configured
+        # before oversampling was added use two samples if checkSPI is set.
+
+        defaultReads = 2 if dev.pluginProps.get('checkSPI') else 1
+        self._reads = int(dev.pluginProps.get('oversampling', defaultReads))
+        self._reduction = dev.pluginProps.get('reduction', 'mean')
+        self._samples = 0        # Sample count for integrity statistics.
+        self._outliers = 0       # Outlier count for integrity statistics.
+        self._maxSpread = 0      # Maximum sample spread (counts).
+        self._lastIntegrity = time.monotonic()  # Time of last integrity log.
+
+        # Get the shared chip object for scan mode.  Polled reads use the
+        # chip's scan results if they were read less than half a polling
+        # interval ago.
+
+        if dev.pluginProps.get('scanChannels', False):
+            self._chip, self._chipId = self._getChip()
+            self._maxAge = self._pollingInterval / 2 if self._polling else 0.0
+
+    def _getChip(self):
+        """
+        Get the shared ADC12Chip object for the io device and update the
+        resources dictionary.  Append '.adc12' to the spi handle id to create
+        a chip id.  Get the resource tuple (chip object, use count) for this
+        id, if available, from the resources dictionary or create a new chip
+        object.  Reserve the chip object by incrementing its use count, attach
+        the device to the chip, and return the chip object and its id.
+        """
+        chipId = self._hId + '.adc12'
+        chip, useCount = _resources.get(chipId, (None, 0))
+        if chip is None:  # No existing chip object; create a new one.
+            LD.resource('"%s" creating new chip id %s',
+                        self._dev.name, chipId)
+            chip = ADC12Chip(chipId, self._c, self._h)
+
+        useCount += 1  # Reserve the chip object for this io device.
+        _resources[chipId] = chip, useCount
+        chip.attach(self._data, self._reads)
+        LD.resource('"%s" using chip %s(%s)',
+                    self._dev.name, chipId, useCount)
+        return chip, chipId
+
+    def _releaseChip(self):
+        """
+        Release the shared chip object for the io device by detaching the
+        device and decrementing the chip use count in the resources
+        dictionary.  Delete the chip object from the dictionary when the use
+        count is zero.
+        """
+        chip, useCount = _resources[self._chipId]
+        chip.detach(self._data, self._reads)
+        useCount -= 1
+        LD.resource('"%s" releasing chip %s(%s)',
+                    self._dev.name, self._chipId, useCount)
+        _resources[self._chipId] = chip, useCount
+        if not useCount:
+            del _resources[self._chipId]
+
+    def _reduce(self, codes):
+        """
+        Reduce a list of ADC output codes to a single count value using the
+        mean, median, or trimmed mean as specified in the pluginProps.  The
+        trimmed mean discards the highest and lowest quarter of the codes
+        (at least one of each if there are three or more codes).
+        """
+        if len(codes) == 1:
+            return codes[0]
+        if self._reduction == 'median':
+            return median(codes)
+        if self._reduction == 'trimmed' and len(codes) > 2:
+            trim = max(len(codes) // 4, 1)
+            return mean(sorted(codes)[trim:-trim])
+        return mean(codes)
+
+    def _checkIntegrity(self, codes, counts):
+        """
+        Accumulate spi integrity statistics for an oversampled read.  An
+        outlier is a sample that differs from the median by more than
+        OUTLIER_COUNTS.  Log the statistics once per status interval instead
+        of logging each inconsistent read: a warning if there were any
+        outliers, or an info message if status monitoring is enabled.
+        """
+        center = median(codes)
+        self._samples += len(codes)
+        self._outliers += sum(1 for code in codes
+                              if abs(code - center) > OUTLIER_COUNTS)
+        self._maxSpread = max(self._maxSpread, max(codes) - min(codes))
+
+        now = time.monotonic()
+        if now - self._lastIntegrity >= self._statusInterval:
+            if self._outliers or self._monitorStatus:
+                log = L.warning if self._outliers else L.info
+                log('"%s" spi integrity: %s outliers in %s samples, maximum '
+                    'spread %s counts, last value %4.1f counts',
+                    self._dev.name, self._outliers, self._samples,
+                    self._maxSpread, counts)
+            self._samples = self._outliers = self._maxSpread = 0
+            self._lastIntegrity = now
+
     def _read(self, logAll=True):
         """
-        Read the ADC output code.  Check the spi integrity, if requested, by
-        reading it a second time and comparing the results.  Log a warning
-        message if the values differ by more than 10 counts.  Convert the
+        Read the ADC output code.  If oversampling is requested, send all the
+        conversion frames in a single rgpio batch to avoid multiple network
+        round trips.  In scan mode, get the results from the chip's scan of
+        all its scan mode channels.  Reduce the output codes to a single
+        count value and accumulate spi integrity statistics.  Convert the
         counts to a voltage and perform common sensor value processing, state
         updating, and logging.
         """
-        def _readADCOutputCode():
+        def _ADCOutputCode(nBytes, bytes_):
             """
-            Read and return a single 12-bit ADC output code (0-4095).
+            Extract and return a single 12-bit ADC output code (0-4095) from
+            the spi_xfer return values.
             """
-            nBytes, bytes_ = self._c.spi_xfer(self._h, self._data)
             code = (bytes_[1] & 0x0f) << 8 | bytes_[2]
             LD.analog('"%s" read %s | %s | %s | %s',
                       self._dev.name, self._hexStr(self._data), nBytes,
                       self._hexStr(bytes_), code)
             return code
 
-        counts = _readADCOutputCode()
-        if self._dev.pluginProps['checkSPI']:  # Check spi integrity.
-            counts_ = _readADCOutputCode()
-            if abs(counts - counts_) > 10:
-                L.warning('"%s" spi check: different values on consecutive '
-                          'reads %s %s', self._dev.name, counts, counts_)
-            counts = counts_
+        if self._chip:  # Scan mode.
+            results = self._chip.read(self._data, self._maxAge, self._reads)
+        elif self._reads == 1:
+            results = [self._c.spi_xfer(self._h, self._data)]
+        else:  # Oversample.
+            with self._c.batch() as batch:
+                for read in range(self._reads):
+                    batch.spi_xfer(self._h, self._data)
+            results = batch.results
+
+        codes = [_ADCOutputCode(*result) for result in results]
+        counts = self._reduce(codes)
+        if len(codes) > 1:
+            self._checkIntegrity(codes, counts)
 
         referenceVoltage = float(self._dev.pluginProps['referenceVoltage'])
         voltage = referenceVoltage * counts / 4096
@@ -1301,6 +1705,112 @@ class ADC12(IoDevice):
         """ Dummy method to allow writing to a read-only device. """
         pass
 
+    def stop(self):
+        """
+        Release the shared chip object, if any, and then stop the io device
+        using the common IoDevice stop method.
+        """
+        if self._chipId:
+            try:
+                self._releaseChip()
+            except Exception as errorMessage:
+                L.warning('"%s" stop error: %s', self._dev.name, errorMessage)
+        IoDevice.stop(self)
+
+
+###############################################################################
+#                                                                             #
+#                               CLASS ADC12Chip                               #
+#                                                                             #
+#                             CONSTRUCTOR METHOD                              #
+#                                                                             #
+# def __init__(self, chipId, connection, handle)                              #
+#                                                                             #
+#                          INTERNAL INSTANCE METHOD                           #
+#                                                                             #
+# def _scan(self)                                                             #
+#                                                                             #
+#                          PUBLIC INSTANCE METHODS                            #
+#                                                                             #
+# def attach(self, data, reads)                                               #
+# def detach(self, data, reads)                                               #
+# def read(self, data, maxAge=0.0, reads=1)                                   #
+#                                                                             #
+###############################################################################
+
+class ADC12Chip:
+    """
+    Scan all the scan mode channels of a single MCP320X ADC chip that is
+    shared by multiple ADC12 devices.  Without scan mode, each channel device
+    reads its own channel with a separate spi_xfer network round trip.  In
+    scan mode, the first channel device polled in a poll window sends the
+    conversion frames for all the scan mode channels on the chip in a single
+    rgpio batch (one network round trip) and caches the results.  The other
+    channel devices use the cached results.  The poll scheduler aligns the
+    deadlines of devices with the same polling interval so that the channels
+    are sampled nearly simultaneously in each window.
+
+    Each MCP320X conversion is started by the falling edge of the chip
+    select, so the channels cannot be converted in a single spi transfer.
+    Each frame is a separate spi_xfer command in the batch.
+
+    ADC12Chip objects are shared resources that are saved in the resources
+    dictionary keyed by a chip id.  The chip id is the spi handle id with
+    '.adc12' appended.
+    """
+    def __init__(self, chipId, connection, handle):
+        """ Initialize the chip interface and an empty scan list. """
+        self._chipId = chipId       # Chip id in the resources dictionary.
+        self._c = connection        # rgpiod connection object.
+        self._h = handle            # spi handle.
+        self._lock = RLock()        # Scan lock.
+        self._frames = []           # Attached (data, reads) frames.
+        self._results = {}          # Cached scan results keyed by data.
+        self._readTime = 0.0        # Monotonic time of the cached scan.
+
+    def _scan(self):
+        """
+        Send the conversion frames for all attached channels in a single rgpio
+        batch and cache the spi_xfer results keyed by the frame data.  Repeat
+        a frame for the largest oversampling count of the devices that use it.
+        """
+        reads = {}
+        for data, nReads in self._frames:
+            reads[data] = max(reads.get(data, 0), nReads)
+        with self._c.batch() as batch:
+            for data, nReads in reads.items():
+                for read in range(nReads):
+                    batch.spi_xfer(self._h, data)
+        results = iter(batch.results)
+        self._results = {data: [next(results) for read in range(nReads)]
+                         for data, nReads in reads.items()}
+        LD.analog('chip %s scanned %s channels', self._chipId, len(reads))
+
+    def attach(self, data, reads):
+        """ Add a channel frame to the scan. """
+        with self._lock:
+            self._frames.append((data, reads))
+            self._results = {}
+
+    def detach(self, data, reads):
+        """ Remove a channel frame from the scan. """
+        with self._lock:
+            if (data, reads) in self._frames:
+                self._frames.remove((data, reads))
+
+    def read(self, data, maxAge=0.0, reads=1):
+        """
+        Return a list of reads spi_xfer results for a channel frame.  Scan all
+        channels if the cached results are more than maxAge seconds old or
+        do not include the frame.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._readTime > maxAge or data not in self._results:
+                self._scan()
+                self._readTime = now
+            return self._results[data][:reads]
+
 
 ###############################################################################
 #                                                                             #
@@ -1310,11 +1820,28 @@ class ADC12(IoDevice):
 #                                                                             #
 # def __init__(self, dev)                                                     #
 #                                                                             #
+#                          INTERNAL INSTANCE METHODS                          #
+#                                                                             #
+# def _getChip(self)                                                          #
+# def _releaseChip(self)                                                      #
+# def _startConversion(self)                                                  #
+# def _readResult(self, continuous=False)                                     #
+# def _updateStates(self, bytes_, numReads, logAll=True)                      #
+# def _startPoll(self)                                                        #
+# def _completePoll(self, numReads=1)                                         #
+# def _finishPoll(self)                                                       #
+#                                                                             #
 #                     IMPLEMENTATION OF ABSTRACT METHODS                      #
 #                                                                             #
 # def _read(self, logAll=True)                                                #
 # def _write(self, value)                                                     #
 #                                                                             #
+#                          PUBLIC INSTANCE METHODS                            #
+#                                                                             #
+# def poll(self)                                                              #
+# def start(self)                                                             #
+# def stop(self)                                                              #
+#                                                                             #
 ###############################################################################
 
 class ADC18(IoDevice):
@@ -1324,8 +1851,32 @@ class ADC18(IoDevice):
     Implement device operation instructions and i2c communications protocols
     from the following hardware reference:
     MCP3422/3/4: <https://ww1.microchip.com/downloads/en/devicedoc/22088c.pdf>
-    Check the spi read integrity if requested in the pluginProps.
+
+    Read the conversion result after the datasheet conversion time for the
+    configured resolution instead of continuously reading the not-ready bit.
+    If the conversion is not complete, retry a limited number of times at a
+    fraction of the conversion time.  For polled reads, schedule the result
+    read on the poll scheduler so that the host worker thread is free to poll
+    other devices during the conversion.  The channels of a chip share a
+    single converter, so conversions are serialized by a shared ADC18Chip
+    object.
+
+    If continuous mode is selected in the pluginProps, the ADC18Chip object
+    converts the channel in continuous mode in a background round robin with
+    the other continuous mode channels on the chip.  Reads and polls use the
+    latest cached result without waiting for a conversion.
     """
+    # Conversion times (seconds) keyed by resolution (bits).  These are the
+    # reciprocals of the typical data rates in the datasheet (240, 60, 15,
+    # and 3.75 samples per second).  The minimum data rates are 27% lower, so
+    # the retries extend the wait to 140% of the typical conversion time.
+
+    CONVERSION_TIME = {12: 1 / 240, 14: 1 / 60, 16: 1 / 15, 18: 1 / 3.75}
+    READY_RETRIES = 4        # Maximum number of not-ready retries.
+    RETRY_FRACTION = 0.1     # Retry delay as a fraction of conversion time.
+    NOT_READY = 0x80         # Not-ready bit in the configuration byte.
+    CONTINUOUS = 0x10        # Continuous conversion mode bit.
+
     def __init__(self, dev):
         """
         Initialize common and unique instance attributes for ADC18 devices.
@@ -1335,65 +1886,550 @@ class ADC18(IoDevice):
 
         # Assemble ADC configuration byte.
 
-        notReady = 0x80  # Not-ready bit.
         adcChannel = int(dev.pluginProps['adcChannel'])
         conversionMode = 0  # One-shot conversion mode.
         resolution = int(dev.pluginProps['resolution'])
         resolutionIndex = (resolution - 12) >> 1
         gain = dev.pluginProps['gain']
         gainIndex = '1248'.find(gain)
-        self._config = notReady | adcChannel << 5 | conversionMode << 4 \
-            | resolutionIndex << 2 | gainIndex
+        self._config = self.NOT_READY | adcChannel << 5 \
+            | conversionMode << 4 | resolutionIndex << 2 | gainIndex
 
-    def _read(self, logAll=True):
+        # Set conversion timing and deferred read attributes.
+
+        self._resolution = resolution
+        self._conversionTime = self.CONVERSION_TIME[resolution]
+        self._retryDelay = self.RETRY_FRACTION * self._conversionTime
+        self._pending = None     # Scheduled result read entry.
+        self._continuous = dev.pluginProps.get('continuousMode', False)
+        self._chip, self._chipId = self._getChip()
+
+    def _getChip(self):
         """
-        Start a conversion and then iteratively read the ADC until the
-        conversion completes. Convert the ADC counts to a voltage and perform
-        common sensor value processing, state updating, and logging.
+        Get the shared ADC18Chip object for the io device and update the
+        resources dictionary.  Append '.adc18' to the i2c handle id to create
+        a chip id.  Get the resource tuple (chip object, use count) for this
+        id, if available, from the resources dictionary or create a new chip
+        object.  Reserve the chip object by incrementing its use count and
+        return the chip object and its id.
         """
+        chipId = self._hId + '.adc18'
+        chip, useCount = _resources.get(chipId, (None, 0))
+        if chip is None:  # No existing chip object; create a new one.
+            LD.resource('"%s" creating new chip id %s',
+                        self._dev.name, chipId)
+            chip = ADC18Chip(chipId)
+
+        useCount += 1  # Reserve the chip object for this io device.
+        _resources[chipId] = chip, useCount
+        LD.resource('"%s" using chip %s(%s)',
+                    self._dev.name, chipId, useCount)
+        return chip, chipId
+
+    def _releaseChip(self):
+        """
+        Release the shared chip object for the io device by decrementing the
+        chip use count in the resources dictionary.  Delete the chip object
+        from the dictionary when the use count is zero.
+        """
+        chip, useCount = _resources[self._chipId]
+        useCount -= 1
+        LD.resource('"%s" releasing chip %s(%s)',
+                    self._dev.name, self._chipId, useCount)
+        _resources[self._chipId] = chip, useCount
+        if not useCount:
+            del _resources[self._chipId]
 
-        # Start the conversion in the single shot mode.
-
+    def _startConversion(self):
+        """ Start a conversion in the single shot mode. """
         self._c.i2c_write_byte(self._h, self._config)
 
-        # Read the conversion register until the not-ready bit is cleared in
-        # the returned config byte (last byte received).  This indicates that
-        # the output register has been updated (ready == ~ notReady).
-
-        notReady = 0x80  # Not-ready bit.
-        config = self._config & (~ notReady)  # Clear the not-ready bit.
-        resolution = int(self._dev.pluginProps['resolution'])
-        numToRead = 3 if resolution < 18 else 4  # Num of bytes to read.
-
-        numReads = 0
-        while True:
+    def _readResult(self, continuous=False):
+        """
+        Read the conversion register once.  Return the returned bytes if the
+        not-ready bit is cleared in the returned config byte (last byte
+        received), or None if the conversion is not yet complete.  In
+        continuous mode, read the device without writing a config byte so
+        that the converter stays in continuous mode.
+        """
+        config = self._config & ~self.NOT_READY  # Clear the not-ready bit.
+        numToRead = 3 if self._resolution < 18 else 4  # Num of bytes to read.
+        if continuous:
+            numBytes, bytes_ = self._c.i2c_read_device(self._h, numToRead)
+        else:
             numBytes, bytes_ = self._c.i2c_read_i2c_block_data(
                 self._h, config, numToRead)
-            numReads += 1
-            if not (bytes_[-1] & notReady):  # Stop if ready.
-                break
-
-        # Pack bytes from the returned bytearray into a single integer output
-        # code.
+        if bytes_[-1] & self.NOT_READY:
+            return None
+        return bytes_
 
+    def _updateStates(self, bytes_, numReads, logAll=True):
+        """
+        Pack the bytes from the returned bytearray into a single integer
+        output code.  Convert the ADC counts to a voltage and perform common
+        sensor value processing, state updating, and logging.
+        """
         counts = -1 if bytes_[0] & 0x80 else 0
         for byte in bytes_[:-1]:
             counts = counts << 8 | byte
 
-        # Compute the voltage and update/log the sensor value states.
-
         referenceVoltage = 2.048  # Internal reference voltage (volts).
-        maxCode = 1 << (resolution - 1)  # maxCode = 2 ** (resolution - 1).
+        maxCode = 1 << (self._resolution - 1)  # 2 ** (resolution - 1).
         gain = int(self._dev.pluginProps['gain'])
         voltage = referenceVoltage * counts / (maxCode * gain)
         LD.analog('"%s" read %s | %s | %s | %s', self._dev.name, numReads,
                   self._hexStr(bytes_), counts, voltage)
         self._updateSensorValueStates(voltage, logAll=logAll)
 
+    def _startPoll(self):
+        """
+        Start a polled conversion if the chip converter is available and
+        schedule the result read after the conversion time.  Otherwise, the
+        chip queues the device and it is started when the converter is
+        released.
+        """
+        if not self._chip.poll(self):
+            LD.analog('"%s" poll queued; converter busy', self._dev.name)
+            return
+        try:
+            self._startConversion()
+        except Exception as errorMessage:
+            _pigpioError(self._dev, 'read', errorMessage)
+            self._finishPoll()
+            return
+        self._pending = _pollScheduler.callLater(
+            self._conversionTime, self._completePoll, self._cId)
+
+    def _completePoll(self, numReads=1):
+        """
+        Complete a polled read that was started by the _startPoll method.
+        Read the conversion result and update the states.  If the conversion
+        is not complete, schedule a retry after the retry delay.  Log an error
+        if the conversion does not complete after READY_RETRIES retries.
+        """
+        if not self._running:
+            self._finishPoll()
+            return
+        try:
+            bytes_ = self._readResult()
+            if bytes_ is None:
+                if numReads > self.READY_RETRIES:
+                    raise TimeoutError('conversion not ready after %s reads'
+                                       % numReads)
+                self._pending = _pollScheduler.callLater(
+                    self._retryDelay,
+                    lambda: self._completePoll(numReads + 1), self._cId)
+                return
+            self._updateStates(bytes_, numReads, logAll=self._logAll)
+        except Exception as errorMessage:
+            _pigpioError(self._dev, 'read', errorMessage)
+        self.monitorPolling()
+        self._finishPoll()
+
+    def _finishPoll(self):
+        """
+        Release the chip converter and start the poll for the next queued
+        device, if any.
+        """
+        self._pending = None
+        nextDev = self._chip.release(self)
+        if nextDev:
+            nextDev._startPoll()
+
+    def _read(self, logAll=True):
+        """
+        In continuous mode, update the states from the latest result cached
+        by the chip's round robin, if available.  Otherwise, wait for the chip
+        converter, start a conversion, and wait for the datasheet conversion
+        time.  Read the result, retrying at the retry delay until the
+        conversion completes.  Raise an exception if the conversion does not
+        complete after READY_RETRIES retries.  Update the states from the
+        result.
+        """
+        if self._continuous:
+            bytes_ = self._chip.result(self)
+            if bytes_ is not None:
+                self._updateStates(bytes_, 0, logAll=logAll)
+                return
+
+        self._chip.acquire(self)
+        try:
+            self._startConversion()
+            time.sleep(self._conversionTime)
+            numReads = 1
+            while True:
+                bytes_ = self._readResult()
+                if bytes_ is not None:
+                    break
+                if numReads > self.READY_RETRIES:
+                    raise TimeoutError('conversion not ready after %s reads'
+                                       % numReads)
+                time.sleep(self._retryDelay)
+                numReads += 1
+        finally:
+            nextDev = self._chip.release(self)
+            if nextDev:
+                nextDev._startPoll()
+        self._updateStates(bytes_, numReads, logAll=logAll)
+
     def _write(self, value):
         """ Dummy method to allow writing to a read-only device. """
         pass
 
+    def poll(self):
+        """
+        Start a polled conversion when called by the poll scheduler.  Skip
+        the poll if the prior polled read is still pending.  In continuous
+        mode, update the states from the latest cached result instead.
+        """
+        if self._continuous:
+            bytes_ = self._chip.result(self)
+            if bytes_ is not None:
+                try:
+                    self._updateStates(bytes_, 0, logAll=self._logAll)
+                except Exception as errorMessage:
+                    _pigpioError(self._dev, 'read', errorMessage)
+                self.monitorPolling()
+            return
+        if self._pending:
+            LD.analog('"%s" poll skipped; prior read pending', self._dev.name)
+            return
+        self._startPoll()
+
+    def start(self):
+        """
+        Start the io device using the common IoDevice start method.  In
+        continuous mode, add the device to the chip's round robin.
+        """
+        IoDevice.start(self)
+        if self._continuous:
+            self._chip.attach(self)
+
+    def stop(self):
+        """
+        Remove the device from the chip's round robin, cancel any pending
+        polled read, release the chip converter and the shared chip object,
+        and then stop the io device using the common IoDevice stop method.
+        """
+        if self._chipId:
+            try:
+                self._chip.detach(self)
+                if self._pending:
+                    _pollScheduler.cancel(self._pending)
+                    self._pending = None
+                nextDev = self._chip.release(self)
+                if nextDev:
+                    nextDev._startPoll()
+                self._releaseChip()
+            except Exception as errorMessage:
+                L.warning('"%s" stop error: %s', self._dev.name, errorMessage)
+        IoDevice.stop(self)
+
+
+###############################################################################
+#                                                                             #
+#                               CLASS ADC18Chip                               #
+#                                                                             #
+#                             CONSTRUCTOR METHOD                              #
+#                                                                             #
+# def __init__(self, chipId)                                                  #
+#                                                                             #
+#                          INTERNAL INSTANCE METHODS                          #
+#                                                                             #
+# def _startPoll(self)                                                        #
+# def _completePoll(self, ioDev, numReads=1)                                  #
+# def _zipStep(self, ioDev)                                                   #
+# def _endStepIo(self)                                                        #
+#                                                                             #
+#                          PUBLIC INSTANCE METHODS                            #
+#                                                                             #
+# def acquire(self, ioDev, timeout=ACQUIRE_TIMEOUT)                           #
+# def poll(self, ioDev)                                                       #
+# def release(self, ioDev)                                                    #
+# def attach(self, ioDev)                                                     #
+# def detach(self, ioDev)                                                     #
+# def result(self, ioDev)                                                     #
+#                                                                             #
+###############################################################################
+
+class ADC18Chip:
+    """
+    Serialize the conversions of the ADC18 channel devices on a single
+    MCP3422/3/4 chip.  The channels share a single converter, and writing a
+    new configuration byte restarts the conversion.  A conversion for one
+    channel must therefore complete before the conversion for the next
+    channel is started.
+
+    Polled conversions are non-blocking.  If the converter is busy, the poll
+    method queues the device and the device's poll is started when the
+    converter is released.  Synchronous reads (e.g., at device startup or a
+    status request) wait for the converter using the acquire method, and
+    they take priority over queued polls.
+
+    The chip also runs a continuous mode round robin for its attached
+    continuous mode channel devices.  The round robin is a sequence of steps
+    scheduled on the poll scheduler host worker.  Each step reserves the
+    converter like a polled device, switches the converter to the next
+    channel in continuous mode (the config byte is not rewritten if there is
+    only one channel and the converter is still configured for it), reads the
+    result after the conversion time, caches it, and releases the converter.
+    Queued polls for one-shot devices on the same chip are interleaved with
+    the round robin steps.  While no other device needs the converter,
+    consecutive steps are chained with a single i2c_zip command that reads
+    one channel's result and switches to the next channel (one network round
+    trip per sample).
+
+    A synchronous read preempts the round robin only between steps.  The step
+    io (the config write, the result read, or the i2c_zip) is marked in
+    progress with the converter lock held, and the acquire method waits until
+    it is complete.  This keeps a step from overwriting the synchronous read's
+    one-shot config or caching a sample from the synchronous conversion.
+
+    ADC18Chip objects are shared resources that are saved in the resources
+    dictionary keyed by a chip id.  The chip id is the i2c handle id with
+    '.adc18' appended.
+    """
+    ACQUIRE_TIMEOUT = 2.0    # Maximum synchronous read wait (seconds).
+
+    def __init__(self, chipId):
+        """ Initialize an idle converter with an empty poll queue. """
+        self._chipId = chipId              # Chip id in resources dictionary.
+        self._condition = Condition()      # Converter lock and wakeup.
+        self._busy = None                  # io device using the converter.
+        self._waiting = []                 # io devices with queued polls.
+        self._acquiring = 0                # Number of synchronous waiters.
+        self._channels = []                # Continuous mode io devices.
+        self._next = 0                     # Next round robin channel index.
+        self._config = None                # Current continuous config byte.
+        self._results = {}                 # Cached results keyed by ioDev.
+        self._stepping = False             # Round robin step in progress.
+        self._stepIo = False               # Round robin step io in progress.
+        self._pending = None               # Scheduled step completion entry.
+        self._zip = True                   # Use i2c_zip round robin steps.
+
+    def _startPoll(self):
+        """
+        Start a round robin step for the next continuous mode channel if the
+        converter is available.  Otherwise, the step is queued like a polled
+        device and started when the converter is released.  Stop the round
+        robin if there are no continuous mode channels.
+        """
+        with self._condition:
+            if not self._channels:
+                self._stepping = False
+                nextDev = self.release(self) if self.poll(self) else None
+                if nextDev:
+                    nextDev._startPoll()
+                return
+            self._stepping = True
+            if not self.poll(self):
+                return
+            ioDev = self._channels[self._next % len(self._channels)]
+            self._next = (self._next + 1) % len(self._channels)
+            config = ioDev._config | ADC18.CONTINUOUS
+            writeConfig = config != self._config
+            self._config = config
+            self._stepIo = True  # Hold off synchronous reads.
+        try:
+            if writeConfig:
+                ioDev._c.i2c_write_byte(ioDev._h, config)
+        except Exception as errorMessage:
+            _pigpioError(ioDev._dev, 'read', errorMessage)
+            self._config = None
+        finally:
+            self._pending = _pollScheduler.callLater(
+                ioDev._conversionTime, lambda: self._completePoll(ioDev),
+                ioDev._cId)
+            self._endStepIo()
+
+    def _completePoll(self, ioDev, numReads=1):
+        """
+        Complete a round robin step.  Read and cache the conversion result for
+        the channel device.  Retry the read after the device retry delay if
+        the conversion is not complete.  Then release the converter, start the
+        next queued device (if any) and queue the next step.  If a synchronous
+        read has preempted the step, discard it and start a new step.
+        """
+        with self._condition:
+            preempted = self._busy is not self
+            self._stepIo = not preempted  # Hold off synchronous reads.
+        if preempted:
+            self._pending = None
+            self._startPoll()
+            return
+        try:
+            if (ioDev in self._channels and numReads == 1
+                    and self._zipStep(ioDev)):
+                return
+            if ioDev in self._channels:
+                try:
+                    bytes_ = ioDev._readResult(continuous=True)
+                    if bytes_ is None and numReads <= ADC18.READY_RETRIES:
+                        self._pending = _pollScheduler.callLater(
+                            ioDev._retryDelay,
+                            lambda: self._completePoll(ioDev, numReads + 1),
+                            ioDev._cId)
+                        return
+                    if bytes_ is None:
+                        raise TimeoutError('conversion not ready after %s '
+                                           'reads' % numReads)
+                    with self._condition:
+                        self._results[ioDev] = bytes_
+                except Exception as errorMessage:
+                    _pigpioError(ioDev._dev, 'read', errorMessage)
+                    self._config = None
+        finally:
+            self._endStepIo()
+        self._pending = None
+        nextDev = self.release(self)
+        if nextDev:
+            nextDev._startPoll()
+        self._startPoll()  # Queue the next step behind the polled device.
+
+    def _zipStep(self, ioDev):
+        """
+        Complete a round robin step and start the next one with a single
+        i2c_zip command that reads the result for the channel device and then
+        writes the continuous config byte for the next channel.  Do this only
+        if the round robin keeps the converter (there are no queued polls or
+        synchronous waiters) and there is more than one channel.  If the
+        result is not ready, the sample is lost because the next conversion
+        has already started.  In this case, stop using i2c_zip steps so that
+        the bounded ready bit retries are available.  Return True if the step
+        was completed.  Called with the step io in progress, so a synchronous
+        read cannot start between the waiter check and the i2c_zip.
+        """
+        with self._condition:
+            if (not self._zip or self._waiting or self._acquiring
+                    or len(self._channels) < 2):
+                return False
+            nextDev = self._channels[self._next]
+            self._next = (self._next + 1) % len(self._channels)
+            config = nextDev._config | ADC18.CONTINUOUS
+            self._config = config
+        numToRead = 3 if ioDev._resolution < 18 else 4
+        try:
+            numBytes, bytes_ = ioDev._c.i2c_zip(
+                ioDev._h, [ZIP_READ, numToRead, ZIP_WRITE, 1, config, ZIP_END])
+        except Exception as errorMessage:
+            _pigpioError(ioDev._dev, 'read', errorMessage)
+            self._config = None
+            return False
+        if bytes_[-1] & ADC18.NOT_READY:
+            LD.analog('chip %s zip step not ready; using separate reads',
+                      self._chipId)
+            self._zip = False
+        else:
+            with self._condition:
+                self._results[ioDev] = bytes_
+        self._pending = _pollScheduler.callLater(
+            nextDev._conversionTime, lambda: self._completePoll(nextDev),
+            nextDev._cId)
+        return True
+
+    def _endStepIo(self):
+        """
+        Mark the round robin step io complete and wake any synchronous
+        waiters.
+        """
+        with self._condition:
+            self._stepIo = False
+            self._condition.notify_all()
+
+    def acquire(self, ioDev, timeout=ACQUIRE_TIMEOUT):
+        """
+        Wait for the converter and reserve it for a synchronous read.  Preempt
+        a round robin step if one is in progress, but wait for any step io to
+        complete first.  Raise TimeoutError if the converter is not released
+        within the timeout.
+        """
+        with self._condition:
+            self._acquiring += 1
+            try:
+                if not self._condition.wait_for(
+                        lambda: (self._busy in (None, self)
+                                 and not self._stepIo), timeout):
+                    raise TimeoutError('chip %s converter busy'
+                                       % self._chipId)
+                self._busy = ioDev
+                self._config = None  # Leave continuous mode.
+            finally:
+                self._acquiring -= 1
+
+    def poll(self, ioDev):
+        """
+        Reserve the converter for a polled conversion and return True if it
+        is available.  Otherwise, queue the device and return False.
+        """
+        with self._condition:
+            if self._busy is None and not self._acquiring:
+                self._busy = ioDev
+                if ioDev is not self:
+                    self._config = None  # Leave continuous mode.
+                return True
+            if ioDev not in self._waiting:
+                self._waiting.append(ioDev)
+            return False
+
+    def release(self, ioDev):
+        """
+        Release the converter if it is reserved by the io device and remove
+        the device from the poll queue.  Return the next queued device to be
+        started by the caller, or None if there is a synchronous waiter or
+        the queue is empty.
+        """
+        with self._condition:
+            if ioDev in self._waiting:
+                self._waiting.remove(ioDev)
+            if self._busy is not ioDev:
+                return None
+            self._busy = None
+            if self._acquiring:
+                self._condition.notify_all()
+                return None
+            return self._waiting.pop(0) if self._waiting else None
+
+    def attach(self, ioDev):
+        """
+        Add a continuous mode channel device to the round robin.  Start the
+        round robin if it is not running.
+        """
+        with self._condition:
+            if ioDev not in self._channels:
+                self._channels.append(ioDev)
+            if self._stepping:
+                return
+        self._startPoll()
+
+    def detach(self, ioDev):
+        """
+        Remove a channel device from the round robin and discard its cached
+        result.  The round robin stops at its next step if there are no
+        continuous mode channels.
+        """
+        with self._condition:
+            if ioDev in self._channels:
+                self._channels.remove(ioDev)
+                self._results.pop(ioDev, None)
+                self._config = None
+            stop = not self._channels and self._pending
+        if stop:  # Cancel the pending step and release the converter.
+            _pollScheduler.cancel(self._pending)
+            self._pending = None
+            with self._condition:
+                self._stepping = False
+            nextDev = self.release(self)
+            if nextDev:
+                nextDev._startPoll()
+
+    def result(self, ioDev):
+        """
+        Return the latest cached conversion result bytes for a continuous
+        mode channel device, or None if there is no result yet.
+        """
+        with self._condition:
+            return self._results.get(ioDev)
+
 
 ###############################################################################
 #                                                                             #
@@ -1403,11 +2439,31 @@ class ADC18(IoDevice):
 #                                                                             #
 # def __init__(self, dev)                                                     #
 #                                                                             #
+#                          INTERNAL INSTANCE METHODS                          #
+#                                                                             #
+# def _claimLdac(self)                                                        #
+# def _releaseLdac(self)                                                      #
+# def _dacWord(self, value)                                                   #
+# def _send(self, frames)                                                     #
+# def _partner(self)                                                          #
+# def _startStream(self, schedule, rate=None)                                 #
+# def _cancelStream(self)                                                     #
+# def _streamComplete(self, stream, voltage, stats)                           #
+#                                                                             #
 #                     IMPLEMENTATION OF ABSTRACT METHODS                      #
 #                                                                             #
 # def _read(self, logAll=True)                                                #
 # def _write(self, value)                                                     #
 #                                                                             #
+#                           PUBLIC INSTANCE METHODS                           #
+#                                                                             #
+# def writeBoth(self, value, pairValue)                                       #
+# def ramp(self, target, slewRate, rate)                                      #
+# def steps(self, profile)                                                    #
+# def stream(self, values, rate)                                              #
+# def stopStream(self)                                                        #
+# def stop(self)                                                              #
+#                                                                             #
 ###############################################################################
 
 class DAC12(IoDevice):
@@ -1418,14 +2474,199 @@ class DAC12(IoDevice):
     and spi communications protocols from the following hardware references.
     MCP4801/11/21: <https://ww1.microchip.com/downloads/en/DeviceDoc/22244B.pdf>
     MCP4802/12/22: <https://ww1.microchip.com/downloads/aemDocuments/documents/OTH/ProductDocuments/DataSheets/20002249B.pdf>
+
+    The two channels of a dual channel DAC can be written together using the
+    writeBoth method.  The input register words for both channels are sent
+    back to back in a single rgpio batch (one network round trip).  If the
+    DAC LDAC pin is connected to a Raspberry Pi GPIO (ldacGpio property), the
+    GPIO is held high so that the outputs do not change as the input registers
+    are written.  The batch ends with an LDAC low/high pulse that latches both
+    outputs at the same time.  If ldacGpio is blank, LDAC is assumed to be
+    tied low and each output changes when its word is written.
+
+    The ramp, steps, and stream methods write a sequence of sensor values on
+    a dedicated DacStream timing thread.  The DAC input words are computed
+    before the stream starts.  A stream is cancelled by stopStream, by a new
+    stream, or by a write.
     """
+    REFERENCE_VOLTAGE = 2.048  # Internal reference voltage (volts).
+    MAX_STREAM_RATE = 1000.0     # Maximum stream sample rate (samples/s).
+    MAX_STREAM_SAMPLES = 100000  # Maximum number of samples in a stream.
+
     def __init__(self, dev):
         """
         Initialize common and unique instance attributes for DAC12 devices.
+        Claim the LDAC GPIO, if specified.
         """
         IoDevice.__init__(self, dev)  # Common initialization.
         self._h, self._hId = self._getSpiHandle()  # spi interface.
 
+        self._ldacGpio = None  # LDAC tied low; no latch pulse.
+        self._gh = self._ghId = self._ldacId = None
+        self._stream = None     # Active DacStream thread, if any.
+        self.streamStats = {}   # Statistics for the last completed stream.
+        ldacGpio = dev.pluginProps.get('ldacGpio', '').strip()
+        if ldacGpio:
+            self._ldacGpio = int(ldacGpio)
+            self._gh, self._ghId = self._getGpioHandle()
+            self._ldacId = self._claimLdac()
+
+    def _claimLdac(self):
+        """
+        Claim the LDAC GPIO as an output held high and update the resources
+        dictionary.  Append '.ldac.' and the GPIO number to the gpio handle id
+        to create an LDAC id that is shared by both channels of a DAC chip.
+        Claim the GPIO only for the first device that uses it.  Reserve the
+        LDAC GPIO by incrementing its use count and return its id.
+        """
+        ldacId = self._ghId + '.ldac.' + str(self._ldacGpio)
+        gpio, useCount = _resources.get(ldacId, (None, 0))
+        if gpio is None:  # LDAC GPIO not claimed; claim it.
+            LD.resource('"%s" claiming LDAC gpio %s',
+                        self._dev.name, self._ldacGpio)
+            self._c.gpio_claim_output(self._gh, self._ldacGpio, 1)
+            gpio = self._ldacGpio
+
+        useCount += 1  # Reserve the LDAC GPIO for this io device.
+        _resources[ldacId] = gpio, useCount
+        LD.resource('"%s" using LDAC %s(%s)',
+                    self._dev.name, ldacId, useCount)
+        return ldacId
+
+    def _releaseLdac(self):
+        """
+        Release the LDAC GPIO for the io device by decrementing its use count
+        in the resources dictionary.  When the use count is zero, delete the
+        LDAC GPIO from the dictionary and free it.  Release the gpio handle.
+        """
+        gpio, useCount = _resources[self._ldacId]
+        useCount -= 1
+        LD.resource('"%s" releasing LDAC %s(%s)',
+                    self._dev.name, self._ldacId, useCount)
+        _resources[self._ldacId] = gpio, useCount
+        if not useCount:
+            del _resources[self._ldacId]
+            self._c.gpio_free(self._gh, gpio)
+        self._releaseHandle(self._ghId)
+
+    def _dacWord(self, value):
+        """
+        Check the sensor value argument and convert it to a DAC input register
+        word for this device's channel.  Return a tuple containing the word
+        (2 bytes), the DAC voltage, and the input code.  Log a warning and
+        return None if the value is invalid or outside of the DAC range.
+        """
+        try:
+            sensorValue = float(value)
+        except ValueError:
+            L.warning('"%s" invalid output value %s; write ignored',
+                      self._dev.name, value)
+            return None
+
+        scalingFactor = float(self._dev.pluginProps['scalingFactor'])
+        voltage = sensorValue / scalingFactor
+        gain = int(self._dev.pluginProps['gain'])
+        inputCode = int(voltage * 4096 / (self.REFERENCE_VOLTAGE * gain))
+
+        if not 0 <= inputCode < 4096:
+            L.warning('"%s" converted input code %s is outside of DAC '
+                      'range; write ignored', self._dev.name, inputCode)
+            return None
+
+        dacChannel = int(self._dev.pluginProps['dacChannel'])
+        data = (dacChannel << 7 | (gain & 1) << 5 | 0x10 | inputCode >> 8,
+                inputCode & 0xff)
+        return data, voltage, inputCode
+
+    def _send(self, frames):
+        """
+        Write a list of DAC input register words to the DAC and return the
+        spi_write results.  The MCP48XX latches each word on the rising edge
+        of chip select, so each word is a separate spi_write.  Send multiple
+        words and/or the LDAC pulse in a single rgpio batch.
+        """
+        if len(frames) == 1 and self._ldacGpio is None:
+            return [self._c.spi_write(self._h, frames[0])]
+
+        with self._c.batch() as batch:
+            for data in frames:
+                batch.spi_write(self._h, data)
+            if self._ldacGpio is not None:  # Latch all outputs together.
+                batch.gpio_write(self._gh, self._ldacGpio, 0)
+                batch.gpio_write(self._gh, self._ldacGpio, 1)
+        return batch.results[:len(frames)]
+
+    def _partner(self):
+        """
+        Return the running DAC12 io device for the other channel of this
+        device's DAC chip (same spi handle), or None if there is none.
+        """
+        dacChannel = self._dev.pluginProps['dacChannel']
+        for ioDev in list(_ioDevices.values()):
+            if (isinstance(ioDev, DAC12) and ioDev is not self
+                    and ioDev._hId == self._hId
+                    and ioDev._dev.pluginProps['dacChannel'] != dacChannel):
+                return ioDev
+        return None
+
+    def _startStream(self, schedule, rate=None):
+        """
+        Convert a schedule of (time offset, sensor value) pairs to DAC input
+        words, cancel any active stream, and start a new DacStream thread to
+        write the words at their time offsets.  The target sample rate (rate)
+        is None for stepped profiles.  Log a warning and ignore the
+        stream if it is too long or if any value cannot be converted.
+        """
+        if not 0 < len(schedule) <= self.MAX_STREAM_SAMPLES:
+            L.warning('"%s" stream of %s samples is empty or too long; '
+                      'stream ignored', self._dev.name, len(schedule))
+            return
+        frames = []
+        for offset, value in schedule:
+            word = self._dacWord(value)
+            if word is None:
+                return
+            frames.append((offset, word[0], word[1]))
+
+        self._cancelStream()
+        self._stream = DacStream(self, frames, rate)
+        LD.analog('"%s" starting stream of %s samples over %.3f s',
+                  self._dev.name, len(frames), frames[-1][0])
+        self._stream.start()
+
+    def _cancelStream(self):
+        """
+        Cancel the active stream, if any, and wait for its thread to end
+        unless this method is called from the stream thread itself.
+        """
+        stream, self._stream = self._stream, None
+        if stream:
+            stream.cancel()
+            if stream is not current_thread():
+                stream.join(timeout=1.0)
+
+    def _streamComplete(self, stream, voltage, stats):
+        """
+        Save and log the statistics of a completed or cancelled stream and
+        update/log the sensor value states for the last voltage written.  Log
+        a warning if the achieved sample rate is well below the target rate.
+        """
+        if self._stream is stream:
+            self._stream = None
+        self.streamStats = stats
+        LD.analog('"%s" stream %s: %s samples written, %s skipped in %.3f s; '
+                  'rate %.1f/s of %.1f/s; jitter mean %.2f ms, max %.2f ms',
+                  self._dev.name, stats['status'], stats['written'],
+                  stats['skipped'], stats['elapsed'], stats['rate'],
+                  stats['targetRate'], 1000 * stats['jitterMean'],
+                  1000 * stats['jitterMax'])
+        if stats['skipped'] or stats['rate'] < 0.9 * stats['targetRate']:
+            L.warning('"%s" stream rate %.1f/s is below the target rate '
+                      '%.1f/s; %s samples skipped', self._dev.name,
+                      stats['rate'], stats['targetRate'], stats['skipped'])
+        if voltage is not None:
+            self._updateSensorValueStates(voltage)
+
     def _read(self, logAll=True):
         """
         Perform common sensor value processing/logging using the current sensor
@@ -1445,38 +2686,210 @@ class DAC12(IoDevice):
         write it to the DAC.  Perform common sensor value processing, state
         updating, and logging.
         """
-        # Check the argument.
+        self._cancelStream()
+        word = self._dacWord(value)
+        if word is None:
+            return
+        data, voltage, inputCode = word
+        nBytes = self._send([data])[0]
+        LD.analog('"%s" xfer %s | %s | %s | %s', self._dev.name, voltage,
+                  inputCode, self._hexStr(data), nBytes)
+
+        # Update/log the sensor value states.
+
+        self._updateSensorValueStates(voltage)
 
+    def writeBoth(self, value, pairValue):
+        """
+        Write a sensor value to this device and a pair value to the device for
+        the other channel of the same DAC chip.  Send both words in one rgpio
+        batch and update/log the sensor value states of both devices.  Direct
+        any exceptions to the module-level standard error handling method.
+        """
         try:
-            sensorValue = float(value)
-        except ValueError:
-            L.warning('"%s" invalid output value %s; write ignored',
-                      self._dev.name, value)
-            return
+            partner = self._partner()
+            if partner is None:
+                L.warning('"%s" no running device for the other DAC '
+                          'channel; writeBoth ignored', self._dev.name)
+                return
+            word = self._dacWord(value)
+            pairWord = partner._dacWord(pairValue)
+            if word is None or pairWord is None:
+                return
+            self._cancelStream()
+            partner._cancelStream()
+
+            results = self._send([word[0], pairWord[0]])
+            for ioDev, (data, voltage, inputCode), nBytes in zip(
+                    (self, partner), (word, pairWord), results):
+                LD.analog('"%s" xfer %s | %s | %s | %s', ioDev._dev.name,
+                          voltage, inputCode, self._hexStr(data), nBytes)
+                ioDev._updateSensorValueStates(voltage)
+        except Exception as errorMessage:
+            _pigpioError(self._dev, 'write', errorMessage)
 
-        # Convert the sensorValue to a DAC input code and write to the DAC.
+    def ramp(self, target, slewRate, rate):
+        """
+        Ramp the sensor value from its current state to a target value at a
+        slew rate limit (sensor value units per second).  Write the ramp
+        samples at the requested sample rate.
+        """
+        try:
+            start = float(self._dev.states['sensorValue'])
+            target, slewRate = float(target), float(slewRate)
+            rate = float(rate)
+            if slewRate <= 0 or not 0 < rate <= self.MAX_STREAM_RATE:
+                L.warning('"%s" invalid slew rate %s or sample rate %s; ramp '
+                          'ignored', self._dev.name, slewRate, rate)
+                return
+            duration = abs(target - start) / slewRate
+            samples = max(1, ceil(duration * rate))
+            schedule = [(sample / rate,
+                         start + (target - start) * sample / samples)
+                        for sample in range(1, samples + 1)]
+            self._startStream(schedule, rate)
+        except Exception as errorMessage:
+            _pigpioError(self._dev, 'write', errorMessage)
 
-        scalingFactor = float(self._dev.pluginProps['scalingFactor'])
-        voltage = sensorValue / scalingFactor
-        referenceVoltage = 2.048  # Internal reference voltage (volts).
-        gain = int(self._dev.pluginProps['gain'])
-        inputCode = int(voltage * 4096 / (referenceVoltage * gain))
-
-        if 0 <= inputCode < 4096:
-            dacChannel = int(self._dev.pluginProps['dacChannel'])
-            data = (dacChannel << 7 | (gain & 1) << 5 | 0x10 | inputCode >> 8,
-                    inputCode & 0xff)
-            nBytes = self._c.spi_write(self._h, data)
-            LD.analog('"%s" xfer %s | %s | %s | %s', self._dev.name, voltage,
-                      inputCode, self._hexStr(data), nBytes)
-        else:
-            L.warning('"%s" converted input code %s is outside of DAC '
-                      'range; write ignored', self._dev.name, inputCode)
-            return
+    def steps(self, profile):
+        """
+        Write a stepped profile given as a list of (sensor value, hold time)
+        pairs.  Each value is written when the hold time of the previous step
+        expires.
+        """
+        try:
+            schedule = []
+            offset = 0.0
+            for value, holdTime in profile:
+                schedule.append((offset, value))
+                offset += float(holdTime)
+            self._startStream(schedule)
+        except Exception as errorMessage:
+            _pigpioError(self._dev, 'write', errorMessage)
 
-        # Update/log the sensor value states.
+    def stream(self, values, rate):
+        """
+        Write an arbitrary sequence of sensor values at a target sample rate.
+        """
+        try:
+            rate = float(rate)
+            if not 0 < rate <= self.MAX_STREAM_RATE:
+                L.warning('"%s" invalid sample rate %s; stream ignored',
+                          self._dev.name, rate)
+                return
+            self._startStream([(sample / rate, value)
+                               for sample, value in enumerate(values)], rate)
+        except Exception as errorMessage:
+            _pigpioError(self._dev, 'write', errorMessage)
 
-        self._updateSensorValueStates(voltage)
+    def stopStream(self):
+        """ Cancel the active stream, if any. """
+        self._cancelStream()
+
+    def stop(self):
+        """
+        Cancel any active stream and release the LDAC GPIO, if any.  Then stop
+        the io device using the common IoDevice stop method.
+        """
+        self._cancelStream()
+        if self._ldacId:
+            try:
+                self._releaseLdac()
+            except Exception as errorMessage:
+                L.warning('"%s" stop error: %s', self._dev.name, errorMessage)
+        IoDevice.stop(self)
+
+
+###############################################################################
+#                                                                             #
+#                               CLASS DacStream                               #
+#                                                                             #
+# def __init__(self, ioDev, frames, rate=None)                                #
+# def cancel(self)                                                            #
+# def run(self)                                                               #
+#                                                                             #
+###############################################################################
+
+class DacStream(Thread):
+    """
+    Write a precomputed sequence of DAC input words to a DAC12 device at
+    scheduled time offsets from the start of the stream.  Each write is a
+    single DAC12._send call (one rgpio batch including the LDAC pulse, if
+    any).  If the thread falls behind, all overdue samples are coalesced into
+    the latest one and the skipped samples are counted.  Measure the jitter
+    (delay from the scheduled time to the write) and the achieved sample rate
+    and report them to the DAC12 device when the stream ends.
+    """
+    def __init__(self, ioDev, frames, rate=None):
+        """
+        Initialize the stream with a DAC12 io device, a list of frames
+        (time offset, DAC input word, voltage), and the target sample rate
+        (None for stepped profiles).
+        """
+        Thread.__init__(self, name='DacStream-' + ioDev._dev.name,
+                        daemon=True)
+        self._ioDev = ioDev
+        self._frames = frames
+        self._rate = rate
+        self._cancelled = Event()
+
+    def cancel(self):
+        """ Stop the stream before its next write. """
+        self._cancelled.set()
+
+    def run(self):
+        """
+        Wait for each frame time offset and write the frame.  Compute the
+        stream statistics and call the DAC12 device's _streamComplete method
+        when the stream is done or cancelled.
+        """
+        frames = self._frames
+        written = skipped = 0
+        jitterSum = jitterMax = 0.0
+        firstWrite = lastWrite = 0.0
+        voltage = None
+        index = 0
+        start = time.monotonic()
+        try:
+            while index < len(frames):
+                delay = start + frames[index][0] - time.monotonic()
+                if delay > 0 and self._cancelled.wait(delay):
+                    break
+                if self._cancelled.is_set():
+                    break
+
+                # Coalesce all samples that are due now into the latest one.
+
+                now = time.monotonic()
+                last = index
+                while (last + 1 < len(frames)
+                       and start + frames[last + 1][0] <= now):
+                    last += 1
+                skipped += last - index
+                offset, data, voltage = frames[last]
+                self._ioDev._send([data])
+                lastWrite = time.monotonic()
+                firstWrite = firstWrite or lastWrite
+
+                jitter = now - start - offset
+                jitterSum += jitter
+                jitterMax = max(jitterMax, jitter)
+                written += 1
+                index = last + 1
+        except Exception as errorMessage:
+            _pigpioError(self._ioDev._dev, 'write', errorMessage)
+            return
+
+        span = lastWrite - firstWrite
+        stats = {'status': 'cancelled' if index < len(frames) else 'complete',
+                 'written': written,
+                 'skipped': skipped,
+                 'elapsed': time.monotonic() - start,
+                 'rate': (written - 1) / span if span else 0.0,
+                 'targetRate': self._rate or 0.0,
+                 'jitterMean': jitterSum / written if written else 0.0,
+                 'jitterMax': jitterMax}
+        self._ioDev._streamComplete(self, voltage, stats)
 
 
 ###############################################################################
@@ -1535,10 +2948,10 @@ class DockerPiRelay(IoDevice):
             self._c.i2c_write_byte_data(self._h, relayNumber, bit)
             LD.digital('"%s" write %s', self._dev.name, ON_OFF[bit])
             self._updateOnOffState(bit)
-            if bit:
-                if self._dev.pluginProps['momentary']:
-                    time.sleep(float(self._dev.pluginProps['turnOffDelay']))
-                    self._write(0)
+            if bit and self._dev.pluginProps['momentary']:
+                self._scheduleTurnOff()
+            else:
+                self._cancelTurnOff()
         else:
             L.warning('"%s" invalid output value %s; write ignored',
                       self._dev.name, value)
@@ -1554,7 +2967,9 @@ class DockerPiRelay(IoDevice):
 #                                                                             #
 #                          INTERNAL INSTANCE METHODS                          #
 #                                                                             #
-# def _readSPIByte(self, register, data)                                      #
+# def _getChip(self)                                                          #
+# def _releaseChip(self)                                                      #
+# def _readSPIBytes(self, register, control, reads=1)                        #
 # def _readRegister(self, register)                                           #
 # def _writeRegister(self, register, byte)                                    #
 # def _updateRegister(self, register, bit)                                    #
@@ -1567,7 +2982,10 @@ class DockerPiRelay(IoDevice):
 #                           PUBLIC INSTANCE METHODS                           #
 #                                                                             #
 # def interrupt(self):                                                        #
+# def captureInterrupt(self, intf, intcap)                                    #
 # def resetInterrupt(self)                                                    #
+# def verify(self)                                                            #
+# def stop(self)                                                              #
 #                                                                             #
 ###############################################################################
 
@@ -1609,10 +3027,13 @@ class IoExpander(IoDevice):
     #                compatibility between the MCP23X08 and MCP23X17 addresses
     #                (see REG_BASE_ADDR).
     SEQOP = 0x20   # Disable sequential register I/O operations.  Read/write a
-    #                single register at a time.
+    #                single register at a time.  SEQOP is not set so that
+    #                the configuration registers can be read/written in a
+    #                single sequential block operation.
     HAEN = 0x08    # Enables address pins on the MCP23S08 (2 bits) and the
     #                MCP23S217 (3 bits).
     INTPOL = 0x02  # Set the interrupt polarity to active high.
+    IOCON = BANK | HAEN | INTPOL  # Common IOCON configuration.
 
     # IODIR bit constants:
 
@@ -1624,6 +3045,11 @@ class IoExpander(IoDevice):
     READ = 0x01
     WRITE = 0x00
 
+    # Shared chip object and chip id (set in __init__ and released in stop):
+
+    _chip = None
+    _chipId = None
+
     def __init__(self, dev):
         """
         Initialize common instance attributes for IoExpander devices.  Get an
@@ -1645,47 +3071,30 @@ class IoExpander(IoDevice):
         self._offset = 0x10 if ioPort == 'b' else 0x00
         bitNumber = int(dev.pluginProps['bitNumber'])
         self._mask = 1 << bitNumber
-        """"
-        Configure the IOCON register with a common set of bits (BANK, SEQOP,
-        and HAEN) that apply to all io devices that use the same hardware chip.
-        Note that the IOCON register is written multiple times (once for each
-        io device object), but it doesn't matter because the same value is
-        written each time.
-
-        The IOCON configuration is complicated by the fact that the internal
-        register address mapping (BANK 0 or 1) is not known.  The following
-        sequence of 2 writes addresses this problem.  It works for all MCP23XXX
-        devices regardless of the initial configuration.  For details please
-        see the appropriate MCP23XXX data sheets. These may be downloaded from:
-        https://www.microchip.com/en-us/product/MCP230008
-        https://www.microchip.com/en-us/product/MCP230017
-        """
-        iocon = self.BANK | self.SEQOP | self.HAEN | self.INTPOL
 
-        self._writeRegister('IOCONB0', iocon)
-        self._writeRegister('IOCON', iocon)
+        # Get the shared chip object for the hardware chip.  Polled reads
+        # use the chip's cached port values if they were read less than half
+        # a polling interval ago.
 
+        self._chip, self._chipId = self._getChip()
+        self._maxAge = self._pollingInterval / 2 if self._polling else 0.0
         """
         Configure the IODIR, IPOL, GPPU, DEFVAL, INTCON, and GPINTEN registers
         by setting the specific bit for this device (self._bitNum) in each
         register.  Leave all other bits unchanged. These configuration changes
-        use the self._updateRegister method to read the register, change the
-        appropriate bit, and then write it back.
+        use the self._updateRegister method to change the appropriate bit in
+        the chip's shadow copy of the register and then write it to the chip.
+        The chip is configured for all of its devices when the chip object is
+        created (see _getChip), so the registers are normally written only if
+        the device pluginProps have changed since then.
         """
-        # Set registers by device type:
+        for register, bit in self._bitConfig(dev):
+            self._updateRegister(register, bit)
 
         if dev.deviceTypeId == 'digitalOutput':
-            self._updateRegister('IODIR', self.OUTPUT)
             self._updateRegister('GPINTEN', 0)  # No interrupt for output.
 
         elif dev.deviceTypeId == 'digitalInput':
-            self._updateRegister('IODIR', self.INPUT)
-            invert = self._dev.pluginProps['invert']
-            self._updateRegister('IPOL', invert)  # Set input polarity.
-            pullup = dev.pluginProps['pullup']
-            self._updateRegister('GPPU', pullup == 'up')  # Set pullup option.
-            self._updateRegister('DEFVAL', 0)  # Clear default bit.
-            self._updateRegister('INTCON', 0)  # Interrupt on change.
 
             # Update the interrupt devices lists in the prior and current
             # interrupt relay GPIO devices.
@@ -1733,16 +3142,139 @@ class IoExpander(IoDevice):
             hardwareInterrupt = dev.pluginProps['hardwareInterrupt']
             self._updateRegister('GPINTEN', hardwareInterrupt)
 
-    def _readSPIByte(self, register, control):
+    def _getChip(self):
+        """
+        Get the shared chip object for the io device and update the resources
+        dictionary:
+
+        Append '.chip' and, for spi devices, the spi device address to the
+        handle id to create a chip id for this hardware chip.  Get the
+        resource tuple (chip object, use count) for this id, if available,
+        from the resources dictionary.  If no chip object exists, create a new
+        one and configure the chip registers for all the Indigo devices that
+        use the chip.
+
+        Reserve the existing or new chip object by incrementing its use count
+        and updating/adding the resource tuple in the dictionary.  Return the
+        chip object and its id.
+        """
+        chipId = self._chipIdOf(self._dev.pluginProps)
+        spiDevAddress = 0
+        if not self._i2c:
+            spiDevAddress = int(self._dev.pluginProps['spiDevAddress'], 16)
+
+        chip, useCount = _resources.get(chipId, (None, 0))
+        if chip is None:  # No existing chip object; create a new one.
+            LD.resource('"%s" creating new chip id %s',
+                        self._dev.name, chipId)
+            ports = 2 if self._dev.pluginProps['ioDevType'].endswith('17') \
+                else 1
+            chip = ExpanderChip(chipId, self._c, self._h, self._i2c,
+                                spiDevAddress, ports)
+            chip.configure(self._chipConfig(chipId))
+
+        useCount += 1  # Reserve the chip object for this io device.
+        _resources[chipId] = chip, useCount
+        chip.attach(self)
+        LD.resource('"%s" using chip %s(%s)',
+                    self._dev.name, chipId, useCount)
+        return chip, chipId
+
+    @staticmethod
+    def _chipIdOf(pluginProps):
+        """
+        Return the chip id for an io expander device's pluginProps.  The chip
+        id is the i2c/spi handle id with '.chip' appended (and the spi device
+        address for spi devices).
+        """
+        connectionId = _connectionId(pluginProps)
+        if 'S' not in pluginProps['ioDevType']:  # i2c device.
+            return connectionId + '.i2c.' + pluginProps['i2cAddress'] + '.chip'
+        bitRate = int(500000 * float(pluginProps['bitRate']))
+        return (connectionId + '.spi.' + pluginProps['spiChannel'] + '.'
+                + str(bitRate) + '.chip.' + pluginProps['spiDevAddress'])
+
+    @classmethod
+    def _bitConfig(cls, dev):
+        """
+        Return a list of (register, bit) tuples that configure the chip
+        registers for a device's bit.  The GPINTEN register is not included
+        for digital inputs because the interrupt must not be enabled until the
+        device is in the interrupt devices list of its interrupt relay device.
+        """
+        if dev.deviceTypeId == 'digitalOutput':
+            return [('IODIR', cls.OUTPUT)]
+        if dev.deviceTypeId == 'digitalInput':
+            return [('IODIR', cls.INPUT),
+                    ('IPOL', dev.pluginProps['invert']),  # Input polarity.
+                    ('GPPU', dev.pluginProps['pullup'] == 'up'),  # Pullup.
+                    ('DEFVAL', 0),   # Clear default bit.
+                    ('INTCON', 0)]   # Interrupt on change.
+        return []
+
+    def _chipConfig(self, chipId):
+        """
+        Return a list of (register address, mask, bit) tuples that configure
+        the chip registers for all the configured and enabled Indigo devices
+        that use the chip.  Output devices are included with their interrupts
+        disabled.
+        """
+        chipConfig = []
+        for dev in indigo.devices.iter('self'):
+            pluginProps = dev.pluginProps
+            if (not (dev.configured and dev.enabled)
+                    or IO_DEV_CLASS.get(pluginProps.get('ioDevType'))
+                    != 'IoExpander'
+                    or self._chipIdOf(pluginProps) != chipId):
+                continue
+            offset = 0x10 if pluginProps['ioPort'] == 'b' else 0x00
+            mask = 1 << int(pluginProps['bitNumber'])
+            bitConfig = self._bitConfig(dev)
+            if dev.deviceTypeId == 'digitalOutput':
+                bitConfig.append(('GPINTEN', 0))
+            for register, bit in bitConfig:
+                chipConfig.append((self.REG_BASE_ADDR[register] + offset,
+                                   mask, bit))
+        LD.digital('"%s" chip config for %s bits',
+                   self._dev.name, len(chipConfig))
+        return chipConfig
+
+    def _releaseChip(self):
+        """
+        Release the shared chip object for the io device by decrementing its
+        use count in the resources dictionary.  Delete the chip object from
+        the dictionary when the use count is zero.
+        """
+        chip, useCount = _resources[self._chipId]
+        chip.detach(self)
+        useCount -= 1
+        LD.resource('"%s" releasing chip %s(%s)',
+                    self._dev.name, self._chipId, useCount)
+        _resources[self._chipId] = chip, useCount
+        if not useCount:
+            del _resources[self._chipId]
+
+    def _readSPIBytes(self, register, control, reads=1):
         """
-        Read and return a single byte of data over the spi bus as directed by
-        the spi control tuple.
+        Read a single byte of data over the spi bus as directed by the spi
+        control tuple.  Repeat the read the specified number of times in a
+        single rgpio batch and return a list of the bytes read.
         """
-        nBytes, bytes_ = self._c.spi_xfer(self._h, control)
-        LD.digital('"%s" readRegister %s %s | %s | %s', self._dev.name,
-                   register, self._hexStr(control), nBytes,
-                   self._hexStr(bytes_))
-        return bytes_[-1]
+        if reads == 1:
+            results = [self._c.spi_xfer(self._h, control)]
+        else:
+            with self._c.batch() as batch:
+                for read in range(reads):
+                    batch.spi_xfer(self._h, control)
+            results = batch.results
+
+        values = []
+        for nBytes, bytes_ in results:
+            LD.digital('"%s" readRegister %s %s | %s | %s', self._dev.name,
+                       register, self._hexStr(control), nBytes,
+                       self._hexStr(bytes_))
+            values.append(bytes_[-1])
+        return values
 
     def _readRegister(self, register):
         """
@@ -1760,10 +3292,11 @@ class IoExpander(IoDevice):
         else:  # MCP23SXX - spi interface
             spiDevAddress = int(self._dev.pluginProps['spiDevAddress'], 16)
             control = (spiDevAddress << 1 | self.READ, registerAddress, 0)
-            byte = self._readSPIByte(register, control)
 
-            if self._dev.pluginProps['checkSPI']:  # Check spi integrity.
-                byte_ = self._readSPIByte(register, control)
+            if not self._dev.pluginProps['checkSPI']:
+                byte, = self._readSPIBytes(register, control)
+            else:  # Check spi integrity with two consecutive reads.
+                byte, byte_ = self._readSPIBytes(register, control, reads=2)
                 if byte != byte_:
                     L.warning('"%s" readRegister %s spi check: unequal '
                               'consecutive reads %02x %02x',
@@ -1790,37 +3323,49 @@ class IoExpander(IoDevice):
             LD.digital('"%s" writeRegister %s %s | %s',
                        self._dev.name, register, self._hexStr(control), nBytes)
 
+        if register in ('GPIO', 'OLAT'):  # Discard cached port values.
+            self._chip.invalidate()
+
     def _updateRegister(self, register, bit):
         """
-        Read a device register, replace the bit specified by the device bit
-        number (from the pluginProps) with the bit argument, and then write the
-        register if it has changed.
+        Get the register value from the chip's shadow registers, replace the
+        bit specified by the device bit number (from the pluginProps) with the
+        bit argument, and then write the register if it has changed.  Read the
+        register from the chip only if it has not yet been shadowed.
         """
-        byte = self._readRegister(register)
-        updatedByte = byte | self._mask if bit else byte & ~self._mask
-        if updatedByte != byte:
-            LD.digital('"%s" updateRegister %s %02x | %s | %02x',
-                       self._dev.name, register, byte, bit, updatedByte)
-            self._writeRegister(register, updatedByte)
+        registerAddress = self.REG_BASE_ADDR[register] + self._offset
+        with self._chip.lock:
+            byte = self._chip.shadow.get(registerAddress)
+            if byte is None:  # Not yet shadowed; read it from the chip.
+                byte = self._readRegister(register)
+            updatedByte = byte | self._mask if bit else byte & ~self._mask
+            if updatedByte != byte:
+                LD.digital('"%s" updateRegister %s %02x | %s | %02x',
+                           self._dev.name, register, byte, bit, updatedByte)
+                self._writeRegister(register, updatedByte)
+            self._chip.shadow[registerAddress] = updatedByte
 
     def _read(self, logAll=True):
         """
-        Read the GPIO register, extract the bit specified by the device bit
-        number (from the pluginProps), and update/log the Indigo device
-        onOffState.
+        Read the GPIO register value for the device port from the shared chip
+        object, extract the bit specified by the device bit number (from the
+        pluginProps), and update/log the Indigo device onOffState.  Use the
+        chip's cached port values if they are less than self._maxAge seconds
+        old.
         """
-        byte = self._readRegister('GPIO')
+        byte = self._chip.readPort(self._offset >> 4, self._maxAge,
+                                   self._dev.pluginProps.get('checkSPI'))
+        LD.digital('"%s" readPort %02x', self._dev.name, byte)
         bit = 1 if byte & self._mask else 0
         self._updateOnOffState(bit, logAll=logAll)
 
     def _write(self, value):
         """
         Check the argument for a valid bit value, then use it to replace the
-        GPIO register bit specified by the device bit number (from the
+        OLAT register bit specified by the device bit number (from the
         pluginProps).  Update/log the Indigo device onOffState.  If the device
         is being turned on and momentary turn-on is requested in the
-        pluginProps, sleep for the turnOffDelay time and then recursively call
-        _write to turn it off.
+        pluginProps, schedule a turn-off after the turnOffDelay time.
         """
         bit = 99
         try:
@@ -1828,50 +3373,41 @@ class IoExpander(IoDevice):
         except ValueError:
             pass
         if bit in (0, 1):  # Value is a valid bit value.
-            self._updateRegister('GPIO', bit)
+            self._updateRegister('OLAT', bit)
             self._updateOnOffState(bit)
-            if bit:  # Device was turned on.
-                if self._dev.pluginProps['momentary']:
-                    time.sleep(float(self._dev.pluginProps['turnOffDelay']))
-                    self._write(0)  # Turn it off.
+            if bit and self._dev.pluginProps['momentary']:
+                self._scheduleTurnOff()
+            else:
+                self._cancelTurnOff()
         else:
             L.warning('"%s" invalid output value %s; write ignored',
                       self._dev.name, value)
 
     def interrupt(self):
         """
-        Read the interrupt flag register and check for an interrupt on this
-        device.  If the flag bit that matches the device bit is on, read the
-        interrupt capture register and update the device onOffState.  Check the
-        interrupt flag register for any simultaneous interrupts that may have
-        been lost.  Return True to indicate a successful interrupt.  If the
-        interrupt bit for this device is off, return False to indicate that
-        an interrupt did not occur on this device.
+        Service a hardware interrupt for the chip that this device uses.  The
+        chip reads the interrupt flag and capture registers once and updates
+        every flagged device on the chip (see ExpanderChip.service).  Return
+        True if any interrupt flag was set on the chip.  Return False (or None
+        after an error) if the chip did not interrupt.
         """
         try:
-            intf = self._readRegister('INTF')
-            if intf & self._mask:
-
-                # Interrupt flag bit matches device bit; read interrupt capture
-                # register and update the onOffState.
-
-                intcap = self._readRegister('INTCAP')
-                bit = 1 if intcap & self._mask else 0
-                LD.digital('"%s" interrupt %02x | %02x | %s',
-                           self._dev.name, intf, intcap, ON_OFF[bit])
-                self._updateOnOffState(bit)
-
-                # Check for lost interrupts.
-
-                lostInterrupts = intf ^ self._mask
-                if lostInterrupts:  # Any other bits set in interrupt flag reg?
-                    L.warning('"%s" lost interrupts %02x',
-                              self._dev.name, lostInterrupts)
-                return True  # Signal a successful interrupt.
-
+            return self._chip.service()
         except Exception as errorMessage:
             _pigpioError(self._dev, 'int', errorMessage)
 
+    def captureInterrupt(self, intf, intcap):
+        """
+        Update the device onOffState from the interrupt capture register
+        value for the device port.  This method is called by the chip's
+        service method for each running digital input device with its flag bit
+        set in the interrupt flag register.
+        """
+        bit = 1 if intcap & self._mask else 0
+        LD.digital('"%s" interrupt %02x | %02x | %s',
+                   self._dev.name, intf, intcap, ON_OFF[bit])
+        self._updateOnOffState(bit)
+
     def resetInterrupt(self):
         """
         Clear a pending interrupt from a digital input device by reading the
@@ -1885,6 +3421,446 @@ class IoExpander(IoDevice):
         except Exception as errorMessage:
             _pigpioError(self._dev, 'int', errorMessage)
 
+    def verify(self):
+        """
+        Verify the chip's shadow registers and restore the chip registers if
+        they do not match.  This method is called by plugin.py in response to
+        an Indigo Home window status request.
+        """
+        try:
+            if self._chip.verify():
+                LI.digital('"%s" chip registers verified', self._dev.name)
+        except Exception as errorMessage:
+            _pigpioError(self._dev, 'read', errorMessage)
+
+    def stop(self):
+        """
+        Complete any pending momentary turn-off and release the shared chip
+        object, if any.  Then stop the io device using the common IoDevice stop
+        method.
+        """
+        self._completeTurnOff()  # Turn off before releasing the chip.
+        if self._chipId:
+            try:
+                self._releaseChip()
+            except Exception as errorMessage:
+                L.warning('"%s" stop error: %s', self._dev.name, errorMessage)
+        IoDevice.stop(self)
+
+
+###############################################################################
+#                                                                             #
+#                             CLASS ExpanderChip                              #
+#                                                                             #
+#                             CONSTRUCTOR METHOD                              #
+#                                                                             #
+# def __init__(self, chipId, connection, handle, i2c, spiDevAddress,        #
+#              ports)                                                         #
+#                                                                             #
+#                          INTERNAL INSTANCE METHODS                          #
+#                                                                             #
+# def _zip(self, transfers)                                                   #
+# def _readBytes(self, addresses, reads=1)                                    #
+# def _writeBytes(self, writes)                                               #
+# def _readBlocks(self)                                                       #
+# def _writeBlocks(self)                                                      #
+# def _readPorts(self, checkSPI)                                              #
+#                                                                             #
+#                          PUBLIC INSTANCE METHODS                            #
+#                                                                             #
+# def configure(self, chipConfig)                                             #
+# def attach(self, ioDev)                                                     #
+# def detach(self, ioDev)                                                     #
+# def service(self)                                                           #
+# def readPort(self, port, maxAge=0.0, checkSPI=False)                        #
+# def writeOutputs(self, bits)                                                #
+# def invalidate(self)                                                        #
+# def verify(self)                                                            #
+#                                                                             #
+###############################################################################
+
+class ExpanderChip:
+    """
+    Read and cache the GPIO port registers and maintain shadow copies of the
+    configuration and output latch registers for a single MCP23XXX hardware
+    chip that is shared by multiple IoExpander devices.
+
+    Without the cache, each of the 16 bit devices on an MCP23017 reads the
+    same GPIO register on every poll.  With the cache, the first device polled
+    in a poll window reads all ports and the other devices use the cached
+    values.  The poll scheduler aligns the deadlines of devices with the same
+    polling interval so that they are polled together in the same window.
+
+    The shadow registers (IODIR, IPOL, GPINTEN, DEFVAL, INTCON, GPPU, and
+    OLAT for each port) are kept in the shadow dictionary keyed by register
+    address.  IoExpander devices update a register bit by changing the shadow
+    value and writing the register without reading it first.  A register is
+    read only once to initialize its shadow value.  The verify method reads
+    the shadowed registers and restores them if they do not match (e.g.,
+    after the chip has been power cycled).  It is called every
+    SHADOW_VERIFY_INTERVAL seconds by readPort and on demand by the
+    IoExpander verify method.  All shadow and cache access must hold the chip
+    lock.
+
+    ExpanderChip objects are shared resources that are saved in the resources
+    dictionary keyed by a chip id.  The chip id is the i2c/spi handle id with
+    '.chip' appended (and the spi device address for spi chips).
+
+    The configure method initializes the chip for all of its Indigo devices
+    when the chip object is created.  It configures the IOCON register for
+    the BANK 1 mapping with sequential operation enabled, reads the
+    configuration register block (IODIR through GPPU) for each port with a
+    single sequential read, updates the bits for all the devices, and writes
+    each block back with a single sequential write.  The individual
+    IoExpander devices then find their configuration bits already set in the
+    shadow registers and attach to the chip without additional io.
+
+    The service method services a hardware interrupt for all the devices on
+    the chip.  It reads the adjacent INTF and INTCAP registers for each port
+    with a single sequential read and updates every device whose interrupt
+    flag bit is set.
+
+    The GPIO registers for ports A and B are not adjacent in the BANK 1
+    mapping, so the port registers are read in a single rgpio batch (one
+    network round trip) rather than a single sequential read.
+
+    Multiple register transfers for an i2c chip are combined into a single
+    i2c_zip command.  The rgpio daemon executes the transfers as one i2c
+    transaction with repeated starts instead of one daemon command per
+    register.
+    """
+    CONFIG_BLOCK = 7  # Configuration block length (IODIR through GPPU).
+
+    def __init__(self, chipId, connection, handle, i2c, spiDevAddress, ports):
+        """ Initialize the chip interface, an empty cache, and shadow. """
+        self._chipId = chipId       # Chip id in the resources dictionary.
+        self._c = connection        # rgpiod connection object.
+        self._h = handle            # i2c or spi handle.
+        self._i2c = i2c             # i2c (True) or spi (False) interface.
+        self._spiDevAddress = spiDevAddress  # spi device address.
+        self._addresses = [IoExpander.REG_BASE_ADDR['GPIO'] + 0x10 * port
+                           for port in range(ports)]  # GPIO register addrs.
+        self.lock = RLock()         # Cache and shadow lock.
+        self._ports = None          # Cached GPIO port values.
+        self._readTime = 0.0        # Monotonic time of the cached read.
+        self.shadow = {}            # Shadow register values by address.
+        self._ioDevs = []           # Attached IoExpander devices.
+        self._verifyTime = time.monotonic()  # Time of the last verify.
+
+    def _zip(self, transfers):
+        """
+        Execute a list of i2c register transfers with i2c_zip commands.  Each
+        transfer is a tuple (register address, count) that reads count bytes
+        starting at the address, or (register address, data) that writes a
+        list of data bytes starting at the address.  Each transfer is a write
+        of the register address (followed by any data) and an optional read
+        with a repeated start.  The transfers are split into i2c_zip commands
+        of at most MAX_ZIP_SEGMENTS messages that are sent in a single rgpio
+        batch.  Return a bytearray of all the bytes read.
+        """
+        commands, data, segments = [], [], 0
+        for address, value in transfers:
+            read = isinstance(value, int)
+            if segments + 1 + read > MAX_ZIP_SEGMENTS:
+                commands.append(data + [ZIP_END])
+                data, segments = [], 0
+            if read:
+                data += [ZIP_WRITE, 1, address, ZIP_READ, value]
+            else:
+                data += [ZIP_WRITE, 1 + len(value), address] + list(value)
+            segments += 1 + read
+        commands.append(data + [ZIP_END])
+
+        if len(commands) == 1:
+            results = [self._c.i2c_zip(self._h, commands[0])]
+        else:
+            with self._c.batch() as batch:
+                for command in commands:
+                    batch.i2c_zip(self._h, command)
+            results = batch.results
+        bytes_ = bytearray()
+        for nBytes, data in results:
+            if nBytes > 0:  # rgpio returns an empty str if nothing is read.
+                bytes_ += data
+        return bytes_
+
+    def _readBytes(self, addresses, reads=1):
+        """
+        Read the registers in a list of addresses in a single i2c_zip command
+        (i2c) or rgpio batch (spi).  Read each register the specified number
+        of times in succession and return a list of all the bytes read.
+        """
+        if self._i2c:
+            return list(self._zip([(address, 1) for address in addresses
+                                   for read in range(reads)]))
+        with self._c.batch() as batch:
+            for address in addresses:
+                for read in range(reads):
+                    batch.spi_xfer(self._h, (self._spiDevAddress << 1
+                                             | IoExpander.READ, address, 0))
+        return [bytes_[-1] for nBytes, bytes_ in batch.results]
+
+    def _writeBytes(self, writes):
+        """
+        Write a list of (register address, byte) tuples to the chip in a
+        single i2c_zip command (i2c) or rgpio batch (spi).
+        """
+        if self._i2c:
+            self._zip([(address, [byte]) for address, byte in writes])
+            return
+        with self._c.batch() as batch:
+            for address, byte in writes:
+                batch.spi_write(self._h, (self._spiDevAddress << 1
+                                          | IoExpander.WRITE, address, byte))
+
+    def _readBlocks(self):
+        """
+        Read the configuration register block for each port with a single
+        sequential read per port in one i2c_zip command (i2c) or rgpio batch
+        (spi).  Return a dictionary of the register values keyed by register
+        address.
+        """
+        bases = [address - IoExpander.REG_BASE_ADDR['GPIO']
+                 for address in self._addresses]
+        block = self.CONFIG_BLOCK
+        if self._i2c:
+            bytes_ = self._zip([(base, block) for base in bases])
+            blocks = [bytes_[i * block: (i + 1) * block]
+                      for i in range(len(bases))]
+        else:
+            with self._c.batch() as batch:
+                for base in bases:
+                    batch.spi_xfer(self._h, [self._spiDevAddress << 1
+                                             | IoExpander.READ, base]
+                                   + [0] * block)
+            blocks = [bytes_[-block:] for nBytes, bytes_ in batch.results]
+        registers = {}
+        for base, blockBytes in zip(bases, blocks):
+            for index, byte in enumerate(blockBytes):
+                registers[base + index] = byte
+        return registers
+
+    def _writeBlocks(self):
+        """
+        Write the shadow configuration register block for each port with a
+        single sequential write per port in one i2c_zip command (i2c) or rgpio
+        batch (spi).
+        """
+        bases = [address - IoExpander.REG_BASE_ADDR['GPIO']
+                 for address in self._addresses]
+        blocks = [[self.shadow[base + index]
+                   for index in range(self.CONFIG_BLOCK)] for base in bases]
+        if self._i2c:
+            self._zip(list(zip(bases, blocks)))
+            return
+        with self._c.batch() as batch:
+            for base, block in zip(bases, blocks):
+                batch.spi_write(self._h, [self._spiDevAddress << 1
+                                          | IoExpander.WRITE, base] + block)
+
+    def _readPorts(self, checkSPI):
+        """
+        Read the GPIO registers for all ports in a single rgpio batch and
+        return a list of the port values.  For a spi chip, check the read
+        integrity with two consecutive reads of each register if requested.
+        """
+        if self._i2c or not checkSPI:
+            return self._readBytes(self._addresses)
+
+        values = self._readBytes(self._addresses, reads=2)
+        ports = []
+        for port, address in enumerate(self._addresses):
+            byte, byte_ = values[2 * port: 2 * port + 2]
+            if byte != byte_:
+                L.warning('chip %s GPIO register %02x spi check: unequal '
+                          'consecutive reads %02x %02x',
+                          self._chipId, address, byte, byte_)
+            ports.append(byte_)
+        return ports
+
+    def configure(self, chipConfig):
+        """
+        Initialize the chip registers for all the devices that use the chip.
+        The chipConfig argument is a list of (register address, mask, bit)
+        tuples that set the bit in the register specified by the mask.
+
+        Configure the IOCON register with a common set of bits (BANK, HAEN,
+        and INTPOL) that apply to all io devices that use the chip.  The IOCON
+        configuration is complicated by the fact that the internal register
+        address mapping (BANK 0 or 1) is not known.  A sequence of 2 writes
+        (IOCONB0 and then IOCON) addresses this problem.  It works for all
+        MCP23XXX devices regardless of the initial configuration.  For details
+        please see the appropriate MCP23XXX data sheets. These may be
+        downloaded from:
+        https://www.microchip.com/en-us/product/MCP230008
+        https://www.microchip.com/en-us/product/MCP230017
+
+        Then read the configuration register blocks into the shadow
+        registers, update the bits from the chipConfig, and write the blocks
+        back to the chip.  Bits that are not used by any device are left
+        unchanged.
+        """
+        with self.lock:
+            iocon = IoExpander.IOCON
+            self._writeBytes([(IoExpander.REG_BASE_ADDR['IOCONB0'], iocon),
+                              (IoExpander.REG_BASE_ADDR['IOCON'], iocon)])
+            self.shadow.update(self._readBlocks())
+            for address in self.shadow:  # Set IOCON shadows for all ports.
+                if address & 0x0f == IoExpander.REG_BASE_ADDR['IOCON']:
+                    self.shadow[address] = iocon
+            for address, mask, bit in chipConfig:
+                byte = self.shadow[address]
+                self.shadow[address] = byte | mask if bit else byte & ~mask
+            self._writeBlocks()
+            self._ports = None
+            LD.digital('chip %s configured %s', self._chipId,
+                       IoDevice._hexStr([self.shadow[address]
+                                         for address in sorted(self.shadow)]))
+
+    def attach(self, ioDev):
+        """ Attach an IoExpander device for interrupt service. """
+        with self.lock:
+            self._ioDevs.append(ioDev)
+
+    def detach(self, ioDev):
+        """ Detach an IoExpander device. """
+        with self.lock:
+            if ioDev in self._ioDevs:
+                self._ioDevs.remove(ioDev)
+
+    def service(self):
+        """
+        Service a hardware interrupt.  Read the INTF and INTCAP registers for
+        all ports in a single i2c_zip command (i2c) or rgpio batch (spi) with
+        one sequential read per port.
+        Reading INTCAP clears the interrupt.  Call the captureInterrupt method
+        for each running digital input device with its flag bit set.  Warn
+        of flag bits that do not match a device.  Return True if any flag bits
+        were set.
+        """
+        intfAddress = IoExpander.REG_BASE_ADDR['INTF']
+        gpioAddress = IoExpander.REG_BASE_ADDR['GPIO']
+        bases = [address - gpioAddress + intfAddress
+                 for address in self._addresses]
+        with self.lock:
+            if self._i2c:
+                bytes_ = self._zip([(base, 2) for base in bases])
+                captures = [bytes_[2 * i: 2 * i + 2]
+                            for i in range(len(bases))]
+            else:
+                with self._c.batch() as batch:
+                    for base in bases:
+                        batch.spi_xfer(self._h, (self._spiDevAddress << 1
+                                                 | IoExpander.READ,
+                                                 base, 0, 0))
+                captures = [bytes_[-2:] for nBytes, bytes_ in batch.results]
+            ioDevs = [ioDev for ioDev in self._ioDevs if ioDev.running()
+                      and ioDev._dev.deviceTypeId == 'digitalInput']
+            self._ports = None  # Inputs have changed.
+
+        interrupted = False
+        for port, (intf, intcap) in enumerate(captures):
+            if not intf:
+                continue
+            interrupted = True
+            LD.digital('chip %s port %s interrupt %02x | %02x',
+                       self._chipId, port, intf, intcap)
+            unmatched = intf
+            for ioDev in ioDevs:
+                if ioDev._offset >> 4 == port and intf & ioDev._mask:
+                    ioDev.captureInterrupt(intf, intcap)
+                    unmatched &= ~ioDev._mask
+            if unmatched:
+                L.warning('chip %s port %s interrupt flags %02x do not match '
+                          'a device', self._chipId, port, unmatched)
+        return interrupted
+
+    def readPort(self, port, maxAge=0.0, checkSPI=False):
+        """
+        Return the GPIO register value for a port (0 for port A or 1 for port
+        B).  Read all ports from the chip if the cached values are more than
+        maxAge seconds old.  Verify the shadow registers if the last verify
+        was more than SHADOW_VERIFY_INTERVAL seconds ago.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self._ports is None or now - self._readTime > maxAge:
+                self._ports = self._readPorts(checkSPI)
+                self._readTime = now
+                LD.digital('chip %s readPorts %s',
+                           self._chipId, IoDevice._hexStr(self._ports))
+                if now - self._verifyTime >= SHADOW_VERIFY_INTERVAL:
+                    self.verify()
+            return self._ports[port]
+
+    def writeOutputs(self, bits):
+        """
+        Update the shadow OLAT registers for a list of (port offset, bit mask,
+        bit) tuples and write the changed OLAT registers in a single i2c_zip
+        command (i2c) or rgpio batch (spi).  All the output bits on a port
+        change together.
+        """
+        with self.lock:
+            olat = IoExpander.REG_BASE_ADDR['OLAT']
+            addresses = sorted({olat + offset for offset, mask, bit in bits})
+            unshadowed = [address for address in addresses
+                          if address not in self.shadow]
+            if unshadowed:  # Read them from the chip in a single transfer.
+                self.shadow.update(zip(unshadowed,
+                                       self._readBytes(unshadowed)))
+
+            updates = {address: self.shadow[address] for address in addresses}
+            for offset, mask, bit in bits:
+                byte = updates[olat + offset]
+                updates[olat + offset] = byte | mask if bit else byte & ~mask
+            writes = [(address, byte) for address, byte in updates.items()
+                      if byte != self.shadow.get(address)]
+            if writes:
+                self._writeBytes(writes)
+                self._ports = None
+                LD.digital('chip %s writeOutputs %s', self._chipId,
+                           IoDevice._hexStr([byte for address, byte
+                                             in writes]))
+            self.shadow.update(updates)
+
+    def invalidate(self):
+        """ Discard the cached port values after a GPIO/OLAT write. """
+        with self.lock:
+            self._ports = None
+
+    def verify(self):
+        """
+        Read the shadowed registers from the chip in a single rgpio batch and
+        compare them with their shadow values.  If any of them differ, log a
+        warning, reconfigure the IOCON register, and write all the shadow
+        values back to the chip.  Return True if the chip matched its shadow
+        registers.
+        """
+        with self.lock:
+            self._verifyTime = time.monotonic()
+            addresses = sorted(self.shadow)
+            if not addresses:
+                return True
+            values = self._readBytes(addresses)
+            mismatches = ['%02x:%02x/%02x' % (address, value,
+                                              self.shadow[address])
+                          for address, value in zip(addresses, values)
+                          if value != self.shadow[address]]
+            LD.digital('chip %s verify %s mismatches', self._chipId,
+                       len(mismatches))
+            if not mismatches:
+                return True
+
+            L.warning('chip %s shadow register mismatch %s; restoring '
+                      'registers', self._chipId, ' '.join(mismatches))
+            iocon = IoExpander.IOCON
+            self._writeBytes([(IoExpander.REG_BASE_ADDR['IOCONB0'], iocon),
+                              (IoExpander.REG_BASE_ADDR['IOCON'], iocon)])
+            self._writeBytes([(address, self.shadow[address])
+                              for address in addresses])
+            self._ports = None
+            return False
+
 
 ###############################################################################
 #                                                                             #
@@ -1894,8 +3870,14 @@ class IoExpander(IoDevice):
 #                                                                             #
 # def __init__(self, dev)                                                     #
 #                                                                             #
-#                          INTERNAL INSTANCE METHOD                           #
+#                          INTERNAL INSTANCE METHODS                          #
 #                                                                             #
+# def _getGroup(self, key)                                                    #
+# def _releaseGroup(self)                                                     #
+# def _pulse(self)                                                            #
+# def _coalesceEdge(self, bit, edgeTime, logAll)                              #
+# def _publishEdges(self)                                                     #
+# def _chipDevices(self)                                                      #
 # def _callback(self, gpioNumber, pinBit, tic)                                #
 #                                                                             #
 #                     IMPLEMENTATION OF ABSTRACT METHODS                      #
@@ -1903,9 +3885,10 @@ class IoExpander(IoDevice):
 # def _read(self, logAll=True)                                                #
 # def _write(self, value)                                                     #
 #                                                                             #
-#                           PUBLIC INSTANCE METHOD                            #
+#                           PUBLIC INSTANCE METHODS                           #
 #                                                                             #
 # def updateInterruptDevices(self, intDevId, add=True)                        #
+# def stop(self)                                                              #
 #                                                                             #
 ###############################################################################
 
@@ -1917,10 +3900,34 @@ class PiGPIO(IoDevice):
     filtering and interrupt relay if requested.  For digital outputs, perform
     pulse width modulation (pwm) and momentary turn-on processing if requested.
     Manage an internal interrupt devices list for use interrupt relay.
+
+    Polled digital inputs (no callback) on the same gpio chip with the same
+    pullup are claimed as a gpio group in a shared GpioGroup object.  The
+    first device polled in a poll window reads the levels of all the group
+    members with a single group_read and the other devices use the cached
+    levels.  Digital outputs without pwm are claimed as an output group so
+    that scenes (see writeScene) can switch them with a single group_write.
+
+    Momentary outputs without pwm are pulsed by the rgpio daemon with a single
+    tx_pulse command.  The pulse width is timed on the pi to the microsecond
+    and does not depend on the network.  The turn-off scheduled on the poll
+    scheduler only updates the onOffState.  Momentary outputs are claimed
+    individually because tx_pulse operates on a single gpio.
+
+    Callback inputs with coalesceEdges enabled collect edges in memory and
+    publish the latest onOffState at no more than publishRate updates per
+    second.  Each publish also updates the edgeCount, firstEdge, and lastEdge
+    states for the edges it covers, so a chattering input does not flood the
+    Indigo server but no edges go uncounted.
     """
     PUD = {'off':  rgpio.SET_PULL_NONE,  # GPIO pullup parameter definitions.
            'up':   rgpio.SET_PULL_UP,
            'down': rgpio.SET_PULL_DOWN}
+    PULSE_OFF = 100  # Momentary pulse off time at the end of the pulse (us).
+
+    _group = None    # Shared GpioGroup object for polled inputs/outputs.
+    _groupId = None  # GpioGroup resource id.
+    _publishInterval = None  # Coalesced edge publishing interval (secs).
 
     def __init__(self, dev):
         """
@@ -1951,23 +3958,166 @@ class PiGPIO(IoDevice):
                 self._priorTimestamp = 0
                 if self._dev.pluginProps['relayInterrupts']:
                     self._interruptDevices = []  # Interrupt devices list.
+                if dev.pluginProps.get('coalesceEdges'):  # Publish at rate.
+                    self._publishInterval = 1.0 / float(
+                        dev.pluginProps['publishRate'])
+                    self._edges = None  # (bit, logAll, count, first, last)
+                    self._edgeLock = Lock()
+                    self._publishEntry = None  # Pending publish call.
+                    self._lastPublish = 0.0  # Monotonic time of last publish.
+                    if 'edgeCount' not in dev.states:  # Add edge states.
+                        dev.stateListOrDisplayStateIdChanged()
+            elif self._polling:  # Polled input device; read as a group.
+                self._group, self._groupId = self._getGroup(pullup)
+                self._maxAge = self._pollingInterval / 2
             else:  # non-alert/callback input device
                 self._c.gpio_claim_input(self._h, self._gpioNumber, pud)
 
         elif dev.deviceTypeId == 'digitalOutput':
-            self._c.gpio_claim_output(self._h, self._gpioNumber)
+            if dev.pluginProps['pwm'] or dev.pluginProps['momentary']:
+                self._c.gpio_claim_output(self._h, self._gpioNumber)
+            else:  # Output group member for group/scene writes.
+                self._group, self._groupId = self._getGroup('output')
+                self._maxAge = self._pollingInterval / 2 if self._polling \
+                    else 0.0
+
+    def _getGroup(self, key):
+        """
+        Get the shared GpioGroup object for the io device and update the
+        resources dictionary.  Append '.group.' and the key (the pullup for
+        input groups or 'output' for the output group) to the gpio handle id
+        to create a group id.  Get the resource tuple (group object,
+        use count) for this id, if available, from the resources dictionary or
+        create a new group object.  Attach the gpio to the group, reserve the
+        group object by incrementing its use count, and return the group
+        object and its id.  If the attach fails, the exception is raised
+        before the group is reserved, so the group and its other gpios are
+        unaffected.
+        """
+        groupId = self._hId + '.group.' + key
+        group, useCount = _resources.get(groupId, (None, 0))
+        if group is None:  # No existing group object; create a new one.
+            LD.resource('"%s" creating new group id %s',
+                        self._dev.name, groupId)
+            output = key == 'output'
+            group = GpioGroup(groupId, self._c, self._h,
+                              0 if output else self.PUD[key], output)
+
+        group.attach(self._gpioNumber)  # Raises if the gpio claim fails.
+        useCount += 1  # Reserve the group object for this io device.
+        _resources[groupId] = group, useCount
+        LD.resource('"%s" using group %s(%s)',
+                    self._dev.name, groupId, useCount)
+        return group, groupId
+
+    def _releaseGroup(self):
+        """
+        Release the shared group object for the io device by detaching the
+        gpio and decrementing the group use count in the resources dictionary.
+        Delete the group object from the dictionary when the use count is
+        zero.
+        """
+        group, useCount = _resources[self._groupId]
+        group.detach(self._gpioNumber)
+        useCount -= 1
+        LD.resource('"%s" releasing group %s(%s)',
+                    self._dev.name, self._groupId, useCount)
+        _resources[self._groupId] = group, useCount
+        if not useCount:
+            del _resources[self._groupId]
+
+    def _pulse(self):
+        """
+        Start a momentary pulse of turnOffDelay seconds timed by the rgpio
+        daemon with a single tx_pulse command.  If a pulse is already active
+        (the output was re-triggered), stop it and start a new full width
+        pulse in a single rgpio batch.  A turnOffDelay of 0 is replaced by
+        ZERO_TURN_OFF_DELAY so that the pulse is never zero width.
+        """
+        delay = float(self._dev.pluginProps['turnOffDelay']) \
+            or ZERO_TURN_OFF_DELAY
+        pulseOn = int(1000000 * delay)
+        if self._turnOffEntry:  # Re-triggered; restart the pulse.
+            with self._c.batch() as batch:
+                batch.tx_pulse(self._h, self._gpioNumber, 0, 0)
+                batch.tx_pulse(self._h, self._gpioNumber, pulseOn,
+                               self.PULSE_OFF, 0, 1)
+        else:
+            self._c.tx_pulse(self._h, self._gpioNumber, pulseOn,
+                             self.PULSE_OFF, 0, 1)
+        LD.digital('"%s" pulse %s us', self._dev.name, pulseOn)
+
+    def _coalesceEdge(self, bit, edgeTime, logAll):
+        """
+        Add a callback edge and its wall clock time (edgeTime) to the pending
+        coalesced edges.  If no publish is pending, schedule one on the poll
+        scheduler no sooner than one publish interval after the last publish.
+        The first edge after a quiet period is published immediately.
+        """
+        with self._edgeLock:
+            if self._edges:
+                count, first = self._edges[2:4]
+                self._edges = bit, logAll, count + 1, first, edgeTime
+            else:
+                self._edges = bit, logAll, 1, edgeTime, edgeTime
+            if self._publishEntry is None:
+                delay = max(0.0, self._lastPublish + self._publishInterval
+                            - time.monotonic())
+                self._publishEntry = _pollScheduler.callLater(
+                    delay, self._publishEdges, self._cId)
+
+    def _publishEdges(self):
+        """
+        Publish the pending coalesced edges.  Update the edgeCount, firstEdge,
+        and lastEdge states in a single server call and then update/log the
+        onOffState with the level after the last edge.
+        """
+        def _edgeTime(edgeTime):
+            """ Format an edge time (seconds since the epoch). """
+            return datetime.fromtimestamp(edgeTime).strftime(
+                '%Y-%m-%d %H:%M:%S.%f')
+
+        with self._edgeLock:
+            edges, self._edges = self._edges, None
+            self._publishEntry = None
+            self._lastPublish = time.monotonic()
+        if edges is None:
+            return
+        bit, logAll, count, first, last = edges
+        self._dev.updateStatesOnServer([
+            {'key': 'edgeCount', 'value': count},
+            {'key': 'firstEdge', 'value': _edgeTime(first)},
+            {'key': 'lastEdge', 'value': _edgeTime(last)}],
+            clearErrorState=False)
+        if count > 1:
+            LD.digital('"%s" %i edges coalesced', self._dev.name, count)
+        self._updateOnOffState(bit, logAll=logAll)
+
+    def _chipDevices(self):
+        """
+        Return one interrupt device for each distinct chip in the interrupt
+        devices list.  All devices on a chip share its interrupt registers, so
+        a single device can service or reset the chip's interrupt.
+        """
+        chips = {}  # Interrupt devices keyed by chip.
+        for intDevId in self._interruptDevices:
+            intDev = _ioDevices[intDevId]
+            chips.setdefault(intDev._chip, intDev)
+        return list(chips.values())
 
     def _callback(self, gpioChip, gpioNumber, pinBit, timestamp):
         """
         Respond to an input device callback.  Apply the contact bounce filter
         if requested for both rising and falling transitions.  Relay the
         interrupt if requested on a rising edge by invoking the interrupt
-        method for devices in the interrupt devices list until the first device
-        responds.  Cancel the watchdog timer on a falling edge to close out the
-        interrupt.  Update the Indigo device onOffState for both rising and
-        falling transitions.  If the interrupt watchdog timer expires, attempt
-        to clear the interrupt by calling the interruptReset method for all
-        devices in the interrupt devices list.
+        method for one device on each chip in the interrupt devices list.  The
+        chip services all of its flagged devices.  Cancel the watchdog timer
+        on a falling edge to close out the interrupt.  Update the Indigo
+        device onOffState for both rising and falling transitions, or coalesce
+        the edge for a later publish if requested.  If the interrupt watchdog
+        timer expires, attempt to clear the interrupt by calling the
+        resetInterrupt method for one device on each chip in the interrupt
+        devices list.
         """
         try:
             dt = timestamp - self._priorTimestamp  # nanoseconds since last cb.
@@ -1988,10 +4138,10 @@ class PiGPIO(IoDevice):
                     if bit:  # Rising edge; interrupt occurred.
                         self._c.gpio_set_watchdog_micros(self._h,
                             self._gpioNumber, 200000)  # Set watchdog to 200 ms
-                        for intDevId in self._interruptDevices:
-                            if _ioDevices[intDevId].interrupt():  # Interrupt.
-                                break  # Only one match per interrupt.
-                        else:  # No match.
+                        interrupted = False
+                        for intDev in self._chipDevices():  # Each chip.
+                            interrupted |= bool(intDev.interrupt())
+                        if not interrupted:  # No match.
                             L.warning('"%s" no device match for hardware '
                                       'interrupt', self._dev.name)
                     else:  # Falling edge; interrupt reset.
@@ -2004,12 +4154,15 @@ class PiGPIO(IoDevice):
                 # Update the GPIO device onOffState for both normal and
                 # interrupt relay callbacks.
 
-                self._updateOnOffState(bit, logAll=logAll)
+                if self._publishInterval:  # Coalesce and publish at rate.
+                    self._coalesceEdge(bit, time.time(), logAll)
+                else:
+                    self._updateOnOffState(bit, logAll=logAll)
 
             elif pinBit == rgpio.TIMEOUT:  # Timeout; try to force a reset.
                 L.warning('"%s" interrupt reset timeout', self._dev.name)
-                for intDevId in self._interruptDevices:
-                    _ioDevices[intDevId].resetInterrupt()  # Force int reset.
+                for intDev in self._chipDevices():  # Once per chip.
+                    intDev.resetInterrupt()  # Force int reset.
                 self._c.gpio_set_watchdog_micros(self._h,
                     self._gpioNumber, 0)  # Reset the watchdog timer.
 
@@ -2029,7 +4182,11 @@ class PiGPIO(IoDevice):
         and log the Indigo device onOffState.
         """
         invert = self._dev.pluginProps.get('invert', False)
-        bit = self._c.gpio_read(self._h, self._gpioNumber) ^ invert
+        if self._group:  # Polled group member.
+            pinBit = self._group.read(self._gpioNumber, self._maxAge)
+        else:
+            pinBit = self._c.gpio_read(self._h, self._gpioNumber)
+        bit = pinBit ^ invert
         LD.digital('"%s" read %s', self._dev.name, ON_OFF[bit])
         self._updateOnOffState(bit, logAll=logAll)
 
@@ -2038,8 +4195,9 @@ class PiGPIO(IoDevice):
         Check the argument for a valid bit value, write it to the gpio pin, and
         update/log the Indigo device onOffState.  If the device is being turned
         on and pwm is requested, start the pwm output by setting the pwm duty
-        cycle.  If momentary turn-on is requested, sleep for the turnOffDelay
-        time and then recursively call _write to turn it off.
+        cycle.  If momentary turn-on is requested, pulse the output with a
+        daemon timed pulse (no pwm) or write it on and schedule a turn-off
+        after the turnOffDelay time (pwm).
         """
         bit = 99
         try:
@@ -2047,7 +4205,18 @@ class PiGPIO(IoDevice):
         except ValueError:
             pass
         if bit in (0, 1):
-            self._c.gpio_write(self._h, self._gpioNumber, bit)
+            momentary = self._dev.pluginProps['momentary']
+            pulsed = momentary and not self._dev.pluginProps['pwm']
+            if bit and pulsed:  # Daemon timed momentary pulse.
+                self._pulse()
+            elif pulsed and self._turnOffEntry:  # Stop the active pulse.
+                with self._c.batch() as batch:
+                    batch.tx_pulse(self._h, self._gpioNumber, 0, 0)
+                    batch.gpio_write(self._h, self._gpioNumber, 0)
+            elif self._group:  # Output group member.
+                self._group.write({self._gpioNumber: bit})
+            else:
+                self._c.gpio_write(self._h, self._gpioNumber, bit)
             LD.digital('"%s" write %s', self._dev.name, ON_OFF[bit])
             self._updateOnOffState(bit)
             if bit:
@@ -2056,9 +4225,10 @@ class PiGPIO(IoDevice):
                     dutyCycle = int(self._dev.pluginProps['dutyCycle'])
                     self._c.tx_pwm(self._h, self._gpioNumber, frequency,
                                    dutyCycle)
-                if self._dev.pluginProps['momentary']:
-                    time.sleep(float(self._dev.pluginProps['turnOffDelay']))
-                    self._write(0)
+            if bit and momentary:
+                self._scheduleTurnOff(write=not pulsed)
+            else:
+                self._cancelTurnOff()
         else:
             L.warning('"%s" invalid output value %s; write ignored',
                       self._dev.name, value)
@@ -2092,3 +4262,175 @@ class PiGPIO(IoDevice):
             LD.digital('"%s" interrupt devices list updated %s%s',
                        self._dev.name, ('-', '+')[add], intDevId)
             LD.digital(self._interruptDevices)
+
+    def stop(self):
+        """
+        Cancel the callback and publish any pending coalesced edges.  Complete
+        any pending momentary turn-off and release the shared group object, if
+        any.  Then stop the io device using the common IoDevice stop method.
+        """
+        if self._publishInterval:
+            try:
+                if self._callbackId:
+                    self._callbackId.cancel()
+                    self._callbackId = None
+                with self._edgeLock:
+                    entry, self._publishEntry = self._publishEntry, None
+                if entry:
+                    _pollScheduler.cancel(entry)
+                self._publishEdges()
+            except Exception as errorMessage:
+                L.warning('"%s" stop error: %s', self._dev.name, errorMessage)
+        self._completeTurnOff()  # Turn off before releasing the group.
+        if self._groupId:
+            try:
+                self._releaseGroup()
+            except Exception as errorMessage:
+                L.warning('"%s" stop error: %s', self._dev.name, errorMessage)
+        IoDevice.stop(self)
+
+
+###############################################################################
+#                                                                             #
+#                              CLASS GpioGroup                                #
+#                                                                             #
+#                             CONSTRUCTOR METHOD                              #
+#                                                                             #
+# def __init__(self, groupId, connection, handle, lFlags, output=False)       #
+#                                                                             #
+#                          INTERNAL INSTANCE METHOD                           #
+#                                                                             #
+# def _claim(self)                                                            #
+#                                                                             #
+#                          PUBLIC INSTANCE METHODS                            #
+#                                                                             #
+# def attach(self, gpio)                                                      #
+# def detach(self, gpio)                                                      #
+# def read(self, gpio, maxAge=0.0)                                            #
+# def write(self, bits)                                                       #
+#                                                                             #
+###############################################################################
+
+class GpioGroup:
+    """
+    Read and cache the levels of a group of built-in gpio inputs that are
+    polled by multiple PiGPIO devices.  The gpio inputs are claimed as a
+    single rgpio group (up to 64 gpios) with common line flags (pullup).  The
+    group is re-claimed whenever a gpio is attached or detached.  The first
+    device polled in a poll window reads all of the group levels with a
+    single group_read and the other devices use the cached levels.
+
+    An output group holds the PiGPIO digital outputs of a gpio chip.  The
+    write method sets any subset of the outputs with a single group_write.
+    Before an output group is freed for a re-claim, the current output levels
+    are read with a single group_read so that the re-claim restores them
+    (including levels that were not written through the group).
+
+    GpioGroup objects are shared resources that are saved in the resources
+    dictionary keyed by a group id.  The group id is the gpio handle id with
+    '.group.' and the pullup appended.
+    """
+    def __init__(self, groupId, connection, handle, lFlags, output=False):
+        """ Initialize the group attributes and the levels cache. """
+        self._groupId = groupId
+        self._c = connection
+        self._h = handle
+        self._lFlags = lFlags
+        self._output = output   # Output group (True) or input group (False).
+        self._outputs = {}      # Output levels keyed by gpio.
+        self._gpios = []        # Group gpios; the first is the group leader.
+        self._claimed = []      # Claimed group gpios (bit x for claimed[x]).
+        self._leader = None     # Claimed group leader.
+        self._levels = None     # Cached group levels (bit x for gpios[x]).
+        self._readTime = 0.0    # Monotonic time of the cached levels.
+        self._lock = RLock()    # Group and cache lock.
+
+    def _claim(self):
+        """
+        Free the claimed group, if any, and claim the current gpios as a new
+        input or output group.  For an output group, read the current output
+        levels before freeing the group and restore them in the new claim.
+        Discard the cached levels.
+        """
+        if self._leader is not None:
+            if self._output:  # Save the current output levels.
+                size, levels = self._c.group_read(self._h, self._leader)
+                for index, gpio in enumerate(self._claimed):
+                    if gpio in self._gpios:
+                        self._outputs[gpio] = levels >> index & 1
+            self._c.group_free(self._h, self._leader)
+            self._leader = None
+            self._claimed = []
+        if self._gpios:
+            if self._output:
+                levels = [self._outputs.get(gpio, 0) for gpio in self._gpios]
+                self._c.group_claim_output(self._h, self._gpios, levels,
+                                           self._lFlags)
+            else:
+                self._c.group_claim_input(self._h, self._gpios, self._lFlags)
+            self._leader = self._gpios[0]
+            self._claimed = list(self._gpios)
+        self._levels = None
+        LD.digital('group %s claimed %s', self._groupId, self._gpios)
+
+    def attach(self, gpio):
+        """
+        Add a gpio to the group and re-claim the group.  If the claim fails
+        (e.g., the gpio is in use by the kernel), remove the gpio, re-claim the
+        previous gpios, and raise the claim exception.
+        """
+        with self._lock:
+            if gpio not in self._gpios:
+                self._gpios.append(gpio)
+                try:
+                    self._claim()
+                except Exception:
+                    self._gpios.remove(gpio)
+                    self._outputs.pop(gpio, None)
+                    try:
+                        self._claim()  # Restore the previous group.
+                    except Exception as errorMessage:
+                        L.warning('group %s restore error: %s',
+                                  self._groupId, errorMessage)
+                    raise
+
+    def detach(self, gpio):
+        """ Remove a gpio from the group and re-claim (or free) the group. """
+        with self._lock:
+            if gpio in self._gpios:
+                self._gpios.remove(gpio)
+                self._outputs.pop(gpio, None)
+                self._claim()
+
+    def read(self, gpio, maxAge=0.0):
+        """
+        Return the level of a gpio in the group.  Read all of the group levels
+        if the cached levels are more than maxAge seconds old.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._levels is None or now - self._readTime > maxAge:
+                size, levels = self._c.group_read(self._h, self._leader)
+                self._levels = levels
+                self._readTime = now
+                LD.digital('group %s read %s', self._groupId,
+                           format(levels, '0%sb' % len(self._gpios)))
+            return self._levels >> self._gpios.index(gpio) & 1
+
+    def write(self, bits):
+        """
+        Write a dictionary of output bits keyed by gpio to an output group
+        with a single group_write.  The outputs change together.
+        """
+        with self._lock:
+            groupBits = groupMask = 0
+            for gpio, bit in bits.items():
+                index = self._gpios.index(gpio)
+                groupBits |= bit << index
+                groupMask |= 1 << index
+                self._outputs[gpio] = bit
+            self._c.group_write(self._h, self._leader, groupBits, groupMask)
+            self._levels = None
+            LD.digital('group %s write %s mask %s', self._groupId,
+                       format(groupBits, '0%sb' % len(self._gpios)),
+                       format(groupMask, '0%sb' % len(self._gpios)))
@@ -16,8 +16,8 @@ FUNCTION:  plugin.py defines the Plugin class, with standard methods that
    USAGE:  plugin.py is included in the Pi GPIO.indigoPlugin bundle and its
            methods are called by the Indigo server.
   AUTHOR:  papamac
- VERSION:  0.10.3
-    DATE:  February 19, 2025
+ VERSION:  0.11.0
+    DATE:  October 18, 2026
 
 UNLICENSE:
 
@@ -73,10 +73,11 @@ The Pi GPIO plugin bundle has two primary Python modules: plugin.py
 encapsulates the plugin device behavior in the Plugin class, and this module,
 ioDevices.py, encapsulates detailed io device behavior in the IoDevice
 class and its six subclasses.  An IoDevice subclass instance is created for
-each plugin device started by plugin.py.  The plugin bundle contains two
-supporting Python modules: rgpio.pi with classes/methods to access the rgpio
-daemon and conditionalLogging.py to provide flexible Indigo logging by message
-type and logging level.  It also includes several xml files that define plugin
+each plugin device started by plugin.py.  The plugin bundle contains three
+supporting Python modules: rgpio.py with classes/methods to access the rgpio
+daemon, conditionalLogging.py to provide flexible Indigo logging by message
+type and logging level, and pollScheduler.py to schedule io device polling.
+It also includes several xml files that define plugin
 devices, actions, and events.
 
 MODULE plugin.py DESCRIPTION:
@@ -172,6 +173,24 @@ v0.10.1  3/25/2024  Refactor a key filename to be consistent with the change
 v0.10.3  2/19/2025  Remove bounceFilter and bounceTime checks from method
                     validateDeviceConfigUi.  The bounce filter was replaced by
                     the glitchFilter in v0.5.9.
+v0.11.0 10/18/2026  (1) Replace the runConcurrentThread device search loop
+                    with the ioDevices poll scheduler.  Add a
+                    stopConcurrentThread method to stop the scheduler.  The
+                    runLoopSleepTime is now the minimum polling interval for
+                    all devices.
+                    (2) Verify io expander chip registers on Indigo Home
+                    window status requests.
+                    (3) Add a writeBoth action to write both channels of a
+                    dual channel DAC together.  Check the ldacGpio field in
+                    the analogOutput ConfigUI.
+                    (4) Add streamOutput and stopStream actions to write
+                    ramps, stepped profiles, and sample sequences to DACs.
+                    (5) Add a writeScene action to switch sets of digital
+                    outputs together.
+                    (6) Check the publishRate field in the digitalInput
+                    ConfigUI.
+                    (7) Add validateActionConfigUi to reject writeScene
+                    actions that turn the same device on and off.
 """
 ###############################################################################
 #                                                                             #
@@ -180,8 +199,8 @@ v0.10.3  2/19/2025  Remove bounceFilter and bounceTime checks from method
 ###############################################################################
 
 __author__ = 'papamac'
-__version__ = '0.10.3'
-__date__ = '2/19/2025'
+__version__ = '0.11.0'
+__date__ = '10/18/2026'
 
 import indigo
 
@@ -191,6 +210,8 @@ from conditionalLogging import LD, LI
 import rgpio
 from ioDevices import getIoDev, getRpiModel, GPIO_CHIP
 from ioDevices import logStartupSummary, logShutdownSummary
+from ioDevices import runPolling, setMinPollingInterval, stopPolling
+from ioDevices import writeScene
 
 L = getLogger('Plugin')  # Standard Plugin logger.
 ON, OFF = (1, 0)         # on/off states.
@@ -234,6 +255,7 @@ class Plugin(indigo.PluginBase):
     # def deviceStartComm(dev)                                                #
     # def deviceStopComm(dev)                                                 #
     # def runConcurrentThread(self)                                           #
+    # def stopConcurrentThread(self)                                          #
     # def shutdown(self)                                                      #
     #                                                                         #
     ###########################################################################
@@ -292,21 +314,24 @@ class Plugin(indigo.PluginBase):
 
     def runConcurrentThread(self):
         """
-        Call pigpioDevices logStartupSummary on entry to provide io device
-        startup status.  Then enter a continuous run loop that is repeated
-        every runLoopSleepTime seconds.  On each pass through the loop, search
-        the Indigo device database for Pi GPIO plugin devices with valid io
-        device objects.  Call the poll method for each valid io device.
+        Call ioDevices logStartupSummary on entry to provide io device startup
+        status.  Then run the ioDevices poll scheduler until
+        stopConcurrentThread is called.  The poll scheduler polls each running
+        io device at its own polling interval in deadline order.  The
+        runLoopSleepTime is the minimum polling interval for all devices.
         """
         L.threaddebug('runConcurrentThread called')
         logStartupSummary()
-        while True:
-            for dev in indigo.devices.iter('self'):
-                if dev.configured and dev.enabled:
-                    ioDev = getIoDev(dev)
-                    if ioDev:
-                        ioDev.poll()
-            self.sleep(float(self.pluginPrefs['runLoopSleepTime']))
+        runPolling(float(self.pluginPrefs.get('runLoopSleepTime', 1.0)))
+
+    def stopConcurrentThread(self):
+        """
+        Call the superclass stopConcurrentThread and then stop the ioDevices
+        poll scheduler so that runConcurrentThread can return.
+        """
+        L.threaddebug('stopConcurrentThread called')
+        indigo.PluginBase.stopConcurrentThread(self)
+        stopPolling()
 
     @staticmethod
     def shutdown():
@@ -333,6 +358,7 @@ class Plugin(indigo.PluginBase):
     #                                                                         #
     # def validatePrefsConfigUi(self, valuesDict)                             #
     # def validateDeviceConfigUi(self, valuesDict, typeId, devId)             #
+    # def validateActionConfigUi(self, valuesDict, typeId, devId)             #
     #                                                                         #
     ###########################################################################
 
@@ -360,6 +386,8 @@ class Plugin(indigo.PluginBase):
             if runLoopSleepTime < 0.0:
                 errors['runLoopSleepTime'] = ('Run loop sleep time must be '
                                               'non-negative.')
+            else:
+                setMinPollingInterval(runLoopSleepTime)
 
         # Return with or without errors.
 
@@ -521,12 +549,33 @@ class Plugin(indigo.PluginBase):
                     errors['turnOffValue'] = ('Turn off value must be a '
                                               'number or None.')
 
+            textField = valuesDict.get('ldacGpio', '').strip()  # ldacGpio.
+            if textField:
+                try:
+                    ldacGpio = int(textField)
+                except ValueError:
+                    errors['ldacGpio'] = ('LDAC GPIO must be a BCM GPIO '
+                                          'number or blank.')
+                else:
+                    if not 0 <= ldacGpio <= 27:
+                        errors['ldacGpio'] = 'LDAC GPIO must be in range.'
+
         elif typeId == 'digitalInput':
 
             pullup1 = valuesDict['pullup1']
             pullup2 = valuesDict['pullup2']
             valuesDict['pullup'] = pullup1 if pullup1 != 'off' else pullup2
 
+            if valuesDict.get('coalesceEdges'):  # Check publishRate.
+                try:
+                    publishRate = float(valuesDict['publishRate'])
+                except ValueError:
+                    errors['publishRate'] = 'Publish rate must be a number.'
+                else:
+                    if not 0.1 <= publishRate <= 100.0:
+                        errors['publishRate'] = ('Publish rate must be in '
+                                                 'range.')
+
         elif typeId == 'digitalOutput':
 
             try:  # Check turnOffDelay.
@@ -665,6 +714,25 @@ class Plugin(indigo.PluginBase):
             L.debug(valuesDict)
             return True, valuesDict
 
+    @staticmethod
+    def validateActionConfigUi(valuesDict, typeId, devId):
+        """
+        Validate the ConfigUi settings for Pi GPIO actions.  Reject a
+        writeScene action that lists the same device in both the Turn On and
+        Turn Off lists.
+        """
+        L.threaddebug('validateActionConfigUi called "%s"', typeId)
+        errors = indigo.Dict()
+
+        if typeId == 'writeScene':
+            onDevices = set(valuesDict.get('onDevices', []))
+            offDevices = set(valuesDict.get('offDevices', []))
+            if onDevices & offDevices:
+                error = 'A device cannot be both turned on and turned off.'
+                errors['onDevices'] = errors['offDevices'] = error
+
+        return not bool(errors), valuesDict, errors
+
     ###########################################################################
     #                                                                         #
     #                              CLASS Plugin                               #
@@ -723,6 +791,10 @@ class Plugin(indigo.PluginBase):
     #                                                                         #
     # def read(pluginAction)                                                  #
     # def write(pluginAction)                                                 #
+    # def writeBoth(pluginAction)                                             #
+    # def streamOutput(pluginAction)                                          #
+    # def stopStream(pluginAction)                                            #
+    # def writeScene(pluginAction)                                            #
     # def turnOn(pluginAction)                                                #
     # def turnOff(pluginAction)                                               #
     # def toggle(self, pluginAction)                                          #
@@ -817,6 +889,88 @@ class Plugin(indigo.PluginBase):
             L.warning('"%s" attempt to write to an input device; action '
                       'ignored', dev.name)
 
+    def writeBoth(self, pluginAction):
+        """
+        Write to both channels of a dual channel DAC as a result of a Pi GPIO
+        writeBoth action request.  The value is written to the action device
+        and the pair value is written to the device for the other channel.
+        """
+        dev = indigo.devices[pluginAction.deviceId]
+        L.threaddebug('writeBoth called "%s"', dev.name)
+        ioDev = getIoDev(dev)
+        if ioDev and hasattr(ioDev, 'writeBoth'):  # DAC device.
+            ioDev.writeBoth(pluginAction.props['value'],
+                            pluginAction.props['pairValue'])
+        else:
+            L.warning('"%s" dual channel DAC not available; writeBoth action '
+                      'ignored', dev.name)
+
+    def streamOutput(self, pluginAction):
+        """
+        Start a DAC output stream as a result of a Pi GPIO streamOutput action
+        request.  Parse the action props for a ramp (target, slewRate, rate),
+        a stepped profile ("value:seconds, ..."), or a sample sequence
+        ("value, ..." and rate).
+        """
+        dev = indigo.devices[pluginAction.deviceId]
+        L.threaddebug('streamOutput called "%s"', dev.name)
+        ioDev = getIoDev(dev)
+        if not (ioDev and hasattr(ioDev, 'stream')):  # Not a DAC device.
+            L.warning('"%s" DAC not available; streamOutput action ignored',
+                      dev.name)
+            return
+
+        props = pluginAction.props
+        streamType = props.get('streamType', 'ramp')
+        try:
+            if streamType == 'ramp':
+                ioDev.ramp(float(props['target']), float(props['slewRate']),
+                           float(props['rate']))
+            elif streamType == 'steps':
+                profile = []
+                for step in props['profile'].split(','):
+                    value, holdTime = step.split(':')
+                    profile.append((float(value), float(holdTime)))
+                ioDev.steps(profile)
+            else:  # streamType == 'samples'
+                values = [float(value)
+                          for value in props['values'].split(',')]
+                ioDev.stream(values, float(props['rate']))
+        except ValueError:
+            L.warning('"%s" invalid %s stream parameters; streamOutput '
+                      'action ignored', dev.name, streamType)
+
+    def stopStream(self, pluginAction):
+        """
+        Stop the active DAC output stream as a result of a Pi GPIO stopStream
+        action request.
+        """
+        dev = indigo.devices[pluginAction.deviceId]
+        L.threaddebug('stopStream called "%s"', dev.name)
+        ioDev = getIoDev(dev)
+        if ioDev and hasattr(ioDev, 'stopStream'):  # DAC device.
+            ioDev.stopStream()
+
+    @staticmethod
+    def writeScene(pluginAction):
+        """
+        Turn on and turn off sets of digital output devices together as a
+        result of a Pi GPIO writeScene action request.  The outputs on each
+        gpio chip or io expander are switched with a single write.  Ignore
+        devices that have been deleted since the action was saved.
+        """
+        L.threaddebug('writeScene called')
+        scene = []
+        for bit, key in ((OFF, 'offDevices'), (ON, 'onDevices')):
+            for devId in pluginAction.props.get(key, []):
+                dev = indigo.devices.get(int(devId))
+                if dev:
+                    scene.append((dev, bit))
+                else:
+                    L.warning('writeScene device id %s not found; device '
+                              'ignored', devId)
+        writeScene(scene)
+
     def turnOn(self, pluginAction):
         """
         Turn on the device as a result of a Pi GPIO turnOn action request.
@@ -857,7 +1011,11 @@ class Plugin(indigo.PluginBase):
     def actionControlUniversal(self, action, dev):
         """
         Read the device as a result of an Indigo Home window status request.
+        For io expander devices, verify the chip registers before reading.
         """
         L.threaddebug('actionControlUniversal called "%s"', dev.name)
         if action.deviceAction == indigo.kUniversalAction.RequestStatus:
+            ioDev = getIoDev(dev)
+            if ioDev and hasattr(ioDev, 'verify'):  # io expander device.
+                ioDev.verify()
             self._read(dev)
@@ -0,0 +1,523 @@
+# coding=utf-8
+"""
+###############################################################################
+#                                                                             #
+#                            Pi GPIO Indigo Plugin                            #
+#                           MODULE pollScheduler.py                           #
+#                                                                             #
+###############################################################################
+
+  BUNDLE:  Raspberry Pi General Purpose Input/Output for Indigo
+           (Pi GPIO.indigoPlugin)
+  MODULE:  pollScheduler.py
+   TITLE:  Deadline scheduling for io device polling
+FUNCTION:  pollScheduler.py provides classes that schedule periodic polling
+           of running io devices in order of their next poll deadline and
+           execute the polls on one worker thread per Raspberry Pi host.
+   USAGE:  pollScheduler.py is included by the ioDevices.py module.  Its
+           methods are called by IoDevice start/stop methods and by the
+           plugin.py runConcurrentThread method.
+  AUTHOR:  papamac
+ VERSION:  0.11.0
+    DATE:  October 18, 2026
+
+UNLICENSE:
+
+This is free and unencumbered software released into the public domain.
+
+Anyone is free to copy, modify, publish, use, compile, sell, or
+distribute this software, either in source code form or as a compiled
+binary, for any purpose, commercial or non-commercial, and by any
+means.
+
+In jurisdictions that recognize copyright laws, the author or authors
+of this software dedicate any and all copyright interest in the
+software to the public domain. We make this dedication for the benefit
+of the public at large and to the detriment of our heirs and
+successors. We intend this dedication to be an overt act of
+relinquishment in perpetuity of all present and future rights to this
+software under copyright law.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+OTHER DEALINGS IN THE SOFTWARE.
+
+For more information, please refer to <https://unlicense.org/>
+
+Pi GPIO PLUGIN BUNDLE DESCRIPTION:
+
+The Pi GPIO plugin bundle has two primary Python modules: plugin.py
+encapsulates the plugin device behavior in the Plugin class, and
+ioDevices.py encapsulates detailed io device behavior in the IoDevice
+class and its six subclasses.  An IoDevice subclass instance is created for
+each plugin device started by plugin.py.  The plugin bundle contains three
+supporting Python modules: rgpio.py with classes/methods to access the rgpio
+daemon, conditionalLogging.py to provide flexible Indigo logging by message
+type and logging level, and this module, pollScheduler.py, to schedule io
+device polling.  It also includes several xml files that define plugin
+devices, actions, and events.
+
+MODULE pollScheduler.py DESCRIPTION:
+
+Prior to v0.11.0, the plugin.py runConcurrentThread method searched the Indigo
+device database for every Pi GPIO device on each pass through its run loop and
+called the poll method for each one.  Each poll method then read its
+pluginProps and the Indigo server time just to decide that the device was not
+yet due to be polled.  With a few hundred devices this overhead exceeded the
+cost of the actual io operations.
+
+The PollScheduler class replaces the device search with a min-heap (priority
+queue) of poll deadlines for the running io devices that have polling enabled.
+Deadlines are measured on the monotonic clock so that they are not affected by
+changes to the system time.  The run method sleeps until the earliest deadline,
+dispatches a poll for the device at the top of the heap, and reschedules it
+one polling interval after its prior deadline (not after the time it was
+actually polled).
+This keeps the average polling rate exact without drift.  If a device falls
+more than a full interval behind (e.g., after a long io timeout), the missed
+polls are skipped rather than executed in a burst.
+
+The first deadline for a new device is aligned to the next multiple of its
+polling interval on the monotonic clock.  Devices with the same polling
+interval are therefore polled together in the same poll window, regardless of
+when they were started.  This allows devices that share a hardware chip (e.g.,
+the bit devices on an MCP23017 io expander) to share a single chip read in
+each window.
+
+IoDevice.start adds a device to the heap and IoDevice.stop removes it.  These
+are called from the Indigo deviceStartComm/deviceStopComm threads while the
+run method is executing in the runConcurrentThread, so all heap access is
+serialized by a condition variable.  Adding a device with a deadline earlier
+than the current one wakes the run method so that it can recompute its sleep
+time.  Removed devices are marked invalid in place and discarded when they
+reach the top of the heap.
+
+The run method does not poll devices itself.  It dispatches each due poll to a
+HostWorker thread for the device's rgpiod connection id (the same key used for
+connection resources in ioDevices.py).  Each worker polls its devices serially,
+so a stalled socket or a slow conversion on one Pi delays only the devices on
+that Pi.  Polls for different Pis overlap.  A poll is dropped (not queued) if
+the previous poll for the same device is still pending or if QUEUE_SIZE polls
+are already queued for the worker.  The run method collects the due entries
+with the heap locked and queues them after releasing the lock.  Queueing never
+blocks, so a stalled host cannot hold up the scheduler or the other hosts.
+
+Each worker measures the lag between a poll's deadline and the time it
+actually starts.  If a host drops polls or its lag exceeds a device's polling
+interval, the worker logs a warning with its recent lag statistics no more
+often than once every LAG_WARNING_INTERVAL seconds.  Cumulative statistics for
+each host are logged by the logSummary method at shutdown.
+
+The callLater method schedules a one-shot function call on a host worker after
+a delay.  An io device can use it to start an operation in one poll (e.g., an
+ADC conversion) and complete it later without blocking the worker while the
+operation is in progress.  It is also used to turn off momentary outputs
+without blocking the Indigo action thread.  One-shot calls are never dropped;
+they are queued in order with the polls without counting against QUEUE_SIZE.
+The workers measure the lateness of one-shot calls and include it in their
+shutdown summaries.
+
+CHANGE LOG:
+
+Major changes to the Pi GPIO plugin are described in the CHANGES.md file in the
+top level bundle directory.  Changes of lesser importance may be described in
+individual module docstrings if appropriate.
+
+v0.11.0 10/18/2026  (1) Initial version with a deadline heap poll scheduler.
+                    (2) Poll devices on per-host worker threads with bounded
+                    queues and lag metrics.
+                    (3) Align first poll deadlines to a grid of polling
+                    interval multiples.
+                    (4) Add one-shot calls on the host workers with the
+                    callLater and cancel methods.
+                    (5) Measure the lateness of one-shot calls and include it
+                    in the shutdown summary.
+"""
+###############################################################################
+#                                                                             #
+#                          MODULE pollScheduler.py                            #
+#                   DUNDERS, IMPORTS, and GLOBAL Constants                    #
+#                                                                             #
+###############################################################################
+
+__author__ = 'papamac'
+__version__ = '0.11.0'
+__date__ = '10/18/2026'
+
+from collections import deque
+from heapq import heappop, heappush
+from logging import getLogger
+from threading import Condition, Lock, Thread
+from time import monotonic
+
+L = getLogger("Plugin")      # Use the Indigo Plugin logger.
+MIN_INTERVAL = 0.01          # Minimum effective polling interval (seconds).
+QUEUE_SIZE = 64              # Maximum pending polls per host worker.
+LAG_WARNING_INTERVAL = 60.0  # Minimum time between lag warnings (seconds).
+STOP_TIMEOUT = 5.0           # Maximum wait for a worker to stop (seconds).
+
+
+###############################################################################
+#                                                                             #
+#                          MODULE pollScheduler.py                            #
+#                              CLASS HostWorker                               #
+#                                                                             #
+###############################################################################
+
+class HostWorker(Thread):
+    """
+    Poll the io devices for a single rgpiod host (connection id) serially in
+    the order that they are dispatched by the PollScheduler.  Measure the lag
+    between each poll deadline and its actual start time, and log a warning
+    when the host falls behind.
+    """
+    def __init__(self, hostId):
+        """ Initialize the worker queue and lag statistics. """
+        Thread.__init__(self, name='PollWorker-' + hostId, daemon=True)
+        self._hostId = hostId
+        self._queue = deque()            # Queued (deadline, ioDev, interval).
+        self._queuedPolls = 0            # Number of polls in the queue.
+        self._pending = set()            # io devices with a pending poll.
+        self._lock = Lock()              # Queue, pending set, and statistics.
+        self._condition = Condition(self._lock)  # Queue wakeup.
+        self._stopping = False           # Stop requested.
+
+        # Lag statistics since the last warning:
+
+        self._polls = 0          # Number of polls.
+        self._lagSum = 0.0       # Sum of poll lags (seconds).
+        self._lagMax = 0.0       # Maximum poll lag (seconds).
+        self._dropped = 0        # Number of dropped polls.
+        self._behind = False     # Lag exceeded a polling interval.
+        self._lastWarning = monotonic() - LAG_WARNING_INTERVAL
+
+        # Cumulative lag statistics for the shutdown summary:
+
+        self._totalPolls = 0
+        self._totalLagSum = 0.0
+        self._totalLagMax = 0.0
+        self._totalDropped = 0
+
+        # Cumulative lateness statistics for one-shot calls:
+
+        self._totalCalls = 0
+        self._totalCallLagSum = 0.0
+        self._totalCallLagMax = 0.0
+
+    def call(self, deadline, function):
+        """
+        Queue a one-shot function call without blocking.  Calls are not
+        dropped or limited by QUEUE_SIZE because they usually complete an
+        operation started by a poll.
+        """
+        with self._condition:
+            self._queue.append((deadline, function, None))
+            self._condition.notify()
+
+    def dispatch(self, deadline, ioDev, interval):
+        """
+        Queue a poll for an io device without blocking.  Drop the poll if the
+        device already has a pending poll or if QUEUE_SIZE polls are queued.
+        """
+        with self._condition:
+            if ioDev in self._pending or self._queuedPolls >= QUEUE_SIZE:
+                self._drop()
+                return
+            self._queue.append((deadline, ioDev, interval))
+            self._queuedPolls += 1
+            self._pending.add(ioDev)
+            self._condition.notify()
+
+    def _drop(self):
+        """ Count a dropped poll.  Called with the lock held. """
+        self._dropped += 1
+        self._totalDropped += 1
+        self._checkLag()
+
+    def _checkLag(self):
+        """
+        Log a warning with the lag statistics since the last warning if the
+        host has dropped polls or fallen a full polling interval behind and if
+        the last warning was at least LAG_WARNING_INTERVAL seconds ago.  Called
+        with the lock held.
+        """
+        now = monotonic()
+        if ((self._dropped or self._behind)
+                and now - self._lastWarning >= LAG_WARNING_INTERVAL):
+            meanLag = self._lagSum / self._polls if self._polls else 0.0
+            L.warning('host "%s" is falling behind its polling schedule: '
+                      '%s polls, mean lag %4.3f secs, max lag %4.3f secs, '
+                      '%s dropped', self._hostId, self._polls, meanLag,
+                      self._lagMax, self._dropped)
+            self._polls = self._dropped = 0
+            self._lagSum = self._lagMax = 0.0
+            self._behind = False
+            self._lastWarning = now
+
+    def run(self):
+        """
+        Poll queued io devices and make queued one-shot calls in order until
+        the stop method is called.
+        """
+        while True:
+            with self._condition:
+                while not (self._queue or self._stopping):
+                    self._condition.wait()
+                if self._stopping:
+                    break
+                deadline, ioDev, interval = self._queue.popleft()
+                if interval is not None:
+                    self._queuedPolls -= 1
+            if interval is None:  # One-shot function call.
+                lag = monotonic() - deadline
+                with self._lock:
+                    self._totalCalls += 1
+                    self._totalCallLagSum += lag
+                    self._totalCallLagMax = max(self._totalCallLagMax, lag)
+                try:
+                    ioDev()
+                except Exception as errorMessage:
+                    L.error('poll worker "%s" call error: %s', self._hostId,
+                            errorMessage)
+                continue
+            lag = monotonic() - deadline
+            try:
+                ioDev.poll()
+            except Exception as errorMessage:
+                L.error('poll worker "%s" error: %s', self._hostId,
+                        errorMessage)
+            finally:
+                with self._lock:
+                    self._pending.discard(ioDev)
+                    self._polls += 1
+                    self._lagSum += lag
+                    self._lagMax = max(self._lagMax, lag)
+                    self._totalPolls += 1
+                    self._totalLagSum += lag
+                    self._totalLagMax = max(self._totalLagMax, lag)
+                    if lag > interval:
+                        self._behind = True
+                    self._checkLag()
+
+    def stop(self):
+        """
+        Request a stop and wait up to STOP_TIMEOUT seconds for the worker to
+        finish its current poll or call.  Queued polls and calls are
+        discarded.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self.join(STOP_TIMEOUT)
+
+    def logSummary(self):
+        """ Log the cumulative lag statistics for the host. """
+        with self._lock:
+            meanLag = (self._totalLagSum / self._totalPolls
+                       if self._totalPolls else 0.0)
+            L.info('host "%s" polling summary: %s polls, mean lag %4.3f secs, '
+                   'max lag %4.3f secs, %s dropped', self._hostId,
+                   self._totalPolls, meanLag, self._totalLagMax,
+                   self._totalDropped)
+            if self._totalCalls:
+                L.info('host "%s" one-shot call summary: %s calls, mean '
+                       'lateness %4.3f secs, max lateness %4.3f secs',
+                       self._hostId, self._totalCalls,
+                       self._totalCallLagSum / self._totalCalls,
+                       self._totalCallLagMax)
+
+
+###############################################################################
+#                                                                             #
+#                          MODULE pollScheduler.py                            #
+#                             CLASS PollScheduler                             #
+#                                                                             #
+###############################################################################
+
+class PollScheduler:
+    """
+    Poll running io devices in deadline order using a min-heap of heap
+    entries.  Each entry is a list [deadline, sequence, ioDev, interval,
+    hostId] where deadline is the monotonic time of the next poll, sequence is
+    a unique tie breaker for equal deadlines, interval is the device polling
+    interval in seconds, and hostId is the rgpiod connection id for the
+    device.  The ioDev element is set to None when the device is removed.
+    Due polls are dispatched to a HostWorker thread for each hostId.
+
+    One-shot function calls scheduled by the callLater method use the same
+    heap.  Their entries have a function in place of the ioDev and an interval
+    of None.  They are dispatched to the host worker once and are not
+    rescheduled.
+    """
+    def __init__(self):
+        """ Initialize an empty heap and the scheduler synchronization. """
+        self._heap = []                 # Heap of poll entries.
+        self._entries = {}              # Heap entries keyed by io device.
+        self._sequence = 0              # Sequence number for next entry.
+        self._condition = Condition()   # Heap lock and run loop wakeup.
+        self._stopped = False           # Run loop stop requested.
+        self._minInterval = 0.0         # Minimum interval from pluginPrefs.
+        self._workers = {}              # Host workers keyed by hostId.
+
+    def _interval(self, entry):
+        """
+        Return the effective polling interval for a heap entry.  The run loop
+        sleep time in the pluginPrefs defines the minimum polling interval for
+        all devices.
+        """
+        return max(entry[3], self._minInterval, MIN_INTERVAL)
+
+    def _push(self, deadline, ioDev, interval, hostId):
+        """ Create a new heap entry and push it onto the heap. """
+        entry = [deadline, self._sequence, ioDev, interval, hostId]
+        self._sequence += 1
+        self._entries[ioDev] = entry
+        heappush(self._heap, entry)
+        return entry
+
+    def setMinInterval(self, minInterval):
+        """
+        Set the minimum polling interval for all devices.  The new value is
+        applied as each device is rescheduled.
+        """
+        with self._condition:
+            self._minInterval = minInterval
+
+    def add(self, ioDev, interval, hostId):
+        """
+        Add an io device to the heap with its first poll deadline at the next
+        multiple of its polling interval on the monotonic clock.  Wake the run
+        loop if this is the new earliest deadline.
+        """
+        with self._condition:
+            self.remove(ioDev)
+            entry = [0.0, 0, ioDev, interval, hostId]
+            step = self._interval(entry)
+            deadline = (monotonic() // step + 1) * step
+            entry = self._push(deadline, ioDev, interval, hostId)
+            if self._heap[0] is entry:
+                self._condition.notify()
+
+    def callLater(self, delay, function, hostId):
+        """
+        Schedule a one-shot call of a function on the worker thread for a host
+        after a delay in seconds.  Wake the run loop if this is the new
+        earliest deadline.  Return the heap entry for use by the cancel
+        method.
+        """
+        with self._condition:
+            entry = [monotonic() + delay, self._sequence, function, None,
+                     hostId]
+            self._sequence += 1
+            heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                self._condition.notify()
+            return entry
+
+    def cancel(self, entry):
+        """
+        Cancel a call scheduled by the callLater method by invalidating its
+        entry.
+        """
+        with self._condition:
+            entry[2] = None
+
+    def remove(self, ioDev):
+        """
+        Remove an io device from the heap by invalidating its entry.  Invalid
+        entries are discarded by the run loop.
+        """
+        with self._condition:
+            entry = self._entries.pop(ioDev, None)
+            if entry:
+                entry[2] = None
+
+    def _worker(self, hostId):
+        """
+        Return the worker for a host.  Create and start the worker if it does
+        not exist.
+        """
+        worker = self._workers.get(hostId)
+        if not worker:
+            worker = self._workers[hostId] = HostWorker(hostId)
+            worker.start()
+        return worker
+
+    def _popDue(self):
+        """
+        Pop all due entries from the heap, reschedule the polled devices, and
+        return a list of (worker, deadline, ioDev, interval) tuples to be
+        queued after the lock is released.  If nothing is due, wait until the
+        earliest deadline, an add, or a stop and return an empty list.  Called
+        with the lock held.
+        """
+        heap = self._heap
+        due = []
+        now = monotonic()
+        while heap:
+            if heap[0][2] is None:  # Discard invalid entries.
+                heappop(heap)
+                continue
+            deadline = heap[0][0]
+            if deadline > now:
+                break
+
+            # Reschedule the device at the next multiple of its interval after
+            # the current deadline.  Skip any missed polls.
+
+            entry = heappop(heap)
+            ioDev, interval, hostId = entry[2:]
+            worker = self._worker(hostId)
+            if interval is None:  # One-shot call; do not reschedule.
+                due.append((worker, deadline, ioDev, None))
+                continue
+            step = self._interval(entry)
+            nextDeadline = deadline + step
+            if nextDeadline <= now:
+                nextDeadline += step * ((now - nextDeadline) // step + 1)
+            self._push(nextDeadline, ioDev, interval, hostId)
+            due.append((worker, deadline, ioDev, step))
+
+        if not due:  # Sleep until the earliest deadline, an add, or a stop.
+            self._condition.wait(heap[0][0] - now if heap else None)
+        return due
+
+    def run(self):
+        """
+        Dispatch io device polls and one-shot calls in deadline order until the
+        stop method is called.  Sleep until the earliest deadline or until a
+        device is added with an earlier one.  Pop and reschedule the due
+        entries with the lock held, then queue them on the host workers after
+        releasing it.  Stop all host workers on exit.
+        """
+        while True:
+            with self._condition:
+                if self._stopped:
+                    workers = list(self._workers.values())
+                    break
+                due = self._popDue()
+            for worker, deadline, ioDev, interval in due:
+                if interval is None:  # One-shot call.
+                    worker.call(deadline, ioDev)
+                else:
+                    worker.dispatch(deadline, ioDev, interval)
+
+        for worker in workers:
+            worker.stop()
+
+    def stop(self):
+        """ Signal the run loop to stop and wake it up. """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def logSummary(self):
+        """ Log the cumulative polling lag statistics for each host. """
+        with self._condition:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.logSummary()
@@ -49,6 +49,23 @@ OTHER DEALINGS IN THE SOFTWARE.
 
 For more information, please refer to <https://unlicense.org/>
 
+CHANGE LOG:
+
+The following changes to joan2937's original module were made by papamac for
+the Pi GPIO plugin.  They add new features without changing the behavior of
+the existing API.
+
+v0.11.0 10/18/2026  (1) Add a batch class and an sbc.batch method to queue
+                    several commands, send them to the rgpiod daemon in a
+                    single sendall, and then read the replies in order.
+                    (2) Receive command replies and notifications into
+                    preallocated buffers using recv_into and memoryview.
+                    Decode notifications with a precompiled struct.Struct.
+                    (3) Encode command headers with a precompiled
+                    struct.Struct.  Add precompiled encoders that pack the
+                    hot commands (GR, GW, GGR, I2CRB, I2CWB, I2CRI, and SPIX)
+                    into a reusable per-connection transmit buffer.
+
 DESCRIPTION:
 
 <https://abyz.me.uk/lg/py_rgpio.html>
@@ -147,6 +164,10 @@ ESSENTIAL
 rgpio.sbc                 Initialise sbc connection
 stop                      Stop a sbc connection
 
+BATCH
+
+batch                     Queues commands for a single pipelined send
+
 FILES
 
 file_open                 Opens a file
@@ -365,6 +386,28 @@ SPI_MODE_3 = 3
 
 _SOCK_CMD_LEN = 16
 
+# Precompiled structures for command headers, command replies, and
+# notification records:
+
+_HEADER_STRUCT = struct.Struct('IIHHHH')
+_REPLY_STRUCT = struct.Struct('I12s')
+_NOTIFY_STRUCT = struct.Struct('QBBBBI')  # 4 bytes of padding in each record.
+
+# Notification receive buffer size (a multiple of the record size):
+
+_NOTIFY_BUF_SIZ = 256 * _NOTIFY_STRUCT.size
+
+# Reusable command transmit buffer size.  Larger commands use a temporary
+# buffer.
+
+_TX_BUF_SIZ = 256
+
+# Maximum number of commands sent in one batch transmission.  Larger batches
+# are split so that the rgpiod daemon never blocks on a full reply buffer
+# while the client is still sending.
+
+_BATCH_MAX = 64
+
 # rgpiod command numbers
 
 _CMD_FO = 1
@@ -708,6 +751,9 @@ class _socklock:
     def __init__(self):
         self.s = None
         self.l = threading.Lock()
+        self.rx = memoryview(bytearray(_SOCK_CMD_LEN))  # Reply buffer.
+        self.tx = bytearray(_TX_BUF_SIZ)  # Command buffer.
+        self.txv = memoryview(self.tx)
 
 
 class error(Exception):
@@ -808,13 +854,36 @@ def _u2i_list(lst):
     return lst
 
 
+def _recv_into(sock, view):
+    """
+    Fills the memoryview from the socket.  Raises an error if the
+    connection is closed before the view is full.
+    """
+    received = 0
+    count = len(view)
+    while received < count:
+        n = sock.recv_into(view[received:])
+        if not n:
+            raise error(error_text(CMD_INTERRUPTED))
+        received += n
+
+
+def _recv_status(sl):
+    """
+    Receives a command reply into the socklock reply buffer and returns
+    the unsigned status.  The caller must hold the lock.
+    """
+    _recv_into(sl.s, sl.rx)
+    return _REPLY_STRUCT.unpack_from(sl.rx)[0]
+
+
 def _lg_command(sl, cmd, Q=0, L=0, H=0):
     """
     """
     status = CMD_INTERRUPTED
     with sl.l:
-        sl.s.send(struct.pack('IIHHHH', MAGIC, 0, cmd, Q, L, H))
-        status, dummy = struct.unpack('I12s', sl.s.recv(_SOCK_CMD_LEN))
+        sl.s.send(_HEADER_STRUCT.pack(MAGIC, 0, cmd, Q, L, H))
+        status = _recv_status(sl)
     return status
 
 
@@ -822,15 +891,15 @@ def _lg_command_nolock(sl, cmd, Q=0, L=0, H=0):
     """
     """
     status = CMD_INTERRUPTED
-    sl.s.send(struct.pack('IIHHHH', MAGIC, 0, cmd, Q, L, H))
-    status, dummy = struct.unpack('I12s', sl.s.recv(_SOCK_CMD_LEN))
+    sl.s.send(_HEADER_STRUCT.pack(MAGIC, 0, cmd, Q, L, H))
+    status = _recv_status(sl)
     return status
 
 
 def _lg_command_ext(sl, cmd, p3, extents, Q=0, L=0, H=0):
     """
     """
-    ext = bytearray(struct.pack('IIHHHH', MAGIC, p3, cmd, Q, L, H))
+    ext = bytearray(_HEADER_STRUCT.pack(MAGIC, p3, cmd, Q, L, H))
     for x in extents:
         if type(x) == type(""):
             ext.extend(_b(x))
@@ -839,22 +908,105 @@ def _lg_command_ext(sl, cmd, p3, extents, Q=0, L=0, H=0):
     status = CMD_INTERRUPTED
     with sl.l:
         sl.s.sendall(ext)
-        status, dummy = struct.unpack('I12s', sl.s.recv(_SOCK_CMD_LEN))
+        status = _recv_status(sl)
     return status
 
 
+def _lg_encode(cmd, p3, extents, Q=0, L=0, H=0):
+    """
+    Returns the encoded bytes for a command with extents.
+    """
+    ext = bytearray(_HEADER_STRUCT.pack(MAGIC, p3, cmd, Q, L, H))
+    for x in extents:
+        if type(x) == type(""):
+            ext.extend(_b(x))
+        else:
+            ext.extend(x)
+    return ext
+
+
+class _encoder:
+    """
+    A precompiled encoder for a command with two or three 32-bit
+    parameters.  The header and parameters are packed by a single cached
+    struct.Struct.  The constant header fields are bound in closures so that
+    each call passes only the parameter values.
+
+    pack_into(buf, *params) packs the command at the start of buf and
+    returns its size.  pack(*params) returns the command bytes.
+    """
+
+    def __init__(self, cmd, fmt, Q=0, L=0, H=0):
+        st = struct.Struct('IIHHHH' + fmt)
+        st_pack_into = st.pack_into
+        st_pack = st.pack
+        size = st.size
+        ext_len = size - _SOCK_CMD_LEN
+        self.size = size
+
+        if len(fmt) == 2:
+            def pack_into(buf, p1, p2):
+                st_pack_into(buf, 0, MAGIC, ext_len, cmd, Q, L, H, p1, p2)
+                return size
+
+            def pack(p1, p2):
+                return st_pack(MAGIC, ext_len, cmd, Q, L, H, p1, p2)
+        else:
+            def pack_into(buf, p1, p2, p3):
+                st_pack_into(buf, 0, MAGIC, ext_len, cmd, Q, L, H, p1, p2, p3)
+                return size
+
+            def pack(p1, p2, p3):
+                return st_pack(MAGIC, ext_len, cmd, Q, L, H, p1, p2, p3)
+
+        self.pack_into = pack_into
+        self.pack = pack
+
+
+_ENC_GR = _encoder(_CMD_GR, 'II', L=2)
+_ENC_GW = _encoder(_CMD_GW, 'III', L=3)
+_ENC_GGR = _encoder(_CMD_GGR, 'II', L=2)
+_ENC_I2CRB = _encoder(_CMD_I2CRB, 'II', L=2)
+_ENC_I2CWB = _encoder(_CMD_I2CWB, 'III', L=3)
+_ENC_I2CRI = _encoder(_CMD_I2CRI, 'III', L=3)
+
+_SPIX_STRUCT = struct.Struct('IIHHHHI')  # SPIX header and handle.
+
+
+def _encode_spix_into(buf, handle, data):
+    """
+    Packs a SPIX command with its data at the start of buf and returns
+    its size.  The caller must ensure that buf is large enough.
+    """
+    n = _SPIX_STRUCT.size
+    size = n + len(data)
+    _SPIX_STRUCT.pack_into(buf, 0, MAGIC, 4 + len(data), _CMD_SPIX, 0, 1, 0,
+                           handle)
+    buf[n:size] = data
+    return size
+
+
+def _lg_tx_nolock(sl, size):
+    """
+    Sends the first size bytes of the socklock transmit buffer and returns
+    the unsigned status.  The caller must hold the lock.
+    """
+    sl.s.sendall(sl.txv[:size])
+    return _recv_status(sl)
+
+
 def _lg_command_ext_nolock(sl, cmd, p3, extents, Q=0, L=0, H=0):
     """
     """
     status = CMD_INTERRUPTED
-    ext = bytearray(struct.pack('IIHHHH', MAGIC, p3, cmd, Q, L, H))
+    ext = bytearray(_HEADER_STRUCT.pack(MAGIC, p3, cmd, Q, L, H))
     for x in extents:
         if type(x) == type(""):
             ext.extend(_b(x))
         else:
             ext.extend(x)
     sl.s.sendall(ext)
-    status, dummy = struct.unpack('I12s', sl.s.recv(_SOCK_CMD_LEN))
+    status = _recv_status(sl)
     return status
 
 
@@ -928,22 +1080,26 @@ class _callback_thread(threading.Thread):
         Runs the notification thread.
         """
 
-        lastLevel = self.lastLevel
-        RECV_SIZ = 4096
-        MSG_SIZ = 16  # 4 bytes of padding in each message
+        MSG_SIZ = _NOTIFY_STRUCT.size
+        iter_unpack = _NOTIFY_STRUCT.iter_unpack
 
-        buf = bytes()
-        while self.go:
+        # Receive records directly into a preallocated buffer.  Decode all
+        # complete records in place and move any partial record to the
+        # start of the buffer for completion by the next receive.
 
-            buf += self.sl.s.recv(RECV_SIZ)
-            offset = 0
+        buf = memoryview(bytearray(_NOTIFY_BUF_SIZ))
+        count = 0
+        while self.go:
 
-            while self.go and (len(buf) - offset) >= MSG_SIZ:
-                msgbuf = buf[offset:offset + MSG_SIZ]
-                offset += MSG_SIZ
-                tick, chip, gpio, level, flags, pad = (
-                    struct.unpack('QBBBBI', msgbuf))
+            n = self.sl.s.recv_into(buf[count:])
+            if not n:  # Connection closed.
+                break
+            count += n
+            end = count - count % MSG_SIZ
 
+            for tick, chip, gpio, level, flags, pad in iter_unpack(buf[:end]):
+                if not self.go:
+                    break
                 if flags == 0:
                     for cb in self.callbacks:
                         if cb.gpio == gpio:
@@ -951,7 +1107,9 @@ class _callback_thread(threading.Thread):
                 else:  # no flags currently defined, ignore.
                     pass
 
-            buf = buf[offset:]
+            count -= end
+            if count:
+                buf[:count] = buf[end:end + count]
 
         self.sl.s.close()
 
@@ -1040,15 +1198,274 @@ def get_module_version():
         (RGPIO_PY_VERSION >> 8) & 0xff, RGPIO_PY_VERSION & 0xff)
 
 
+# Batch reply types:
+
+_REPLY_STATUS = 0  # Status only, returned as _u2i(status).
+_REPLY_DATA = 1    # Byte count + data, returned as [count, bytearray].
+_REPLY_GROUP = 2   # Group levels, returned as [status, levels].
+
+
+class batch:
+    """
+    A class to queue several commands for an sbc connection, send them to
+    the rgpiod daemon in a single transmission, and then read the replies in
+    order.  This turns N network round trips into one.
+
+    A batch is normally used as a context manager.  The queued commands are
+    executed when the with block exits without an exception, and the results
+    are available in the results attribute in the order that the commands
+    were queued.  Each result has the same form as the value returned by the
+    corresponding sbc method.
+
+    ...
+    with sbc.batch() as b:
+        b.gpio_read(h, 5)
+        b.spi_xfer(spi_h, [1, 128, 0])
+    level, (count, rx_data) = b.results
+    ...
+
+    All replies are read before any error is raised so that the command
+    socket is left in a consistent state.  If exceptions is True and one or
+    more commands fail, an error is raised for the first failure.
+    """
+
+    def __init__(self, sbc):
+        """
+        Initialises an empty batch for an sbc connection.
+        """
+        self._sbc = sbc
+        self._commands = []
+        self.results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+        else:
+            self._commands = []
+        return False
+
+    def __len__(self):
+        return len(self._commands)
+
+    def _queue(self, reply, cmd, p3, extents, Q=0, L=0, H=0):
+        """
+        Encodes a command and adds it to the batch.
+        """
+        self._commands.append(
+            (_lg_encode(cmd, p3, extents, Q, L, H), reply))
+        return self
+
+    def _queue_encoded(self, reply, command):
+        """
+        Adds a command encoded by a precompiled encoder to the batch.
+        """
+        self._commands.append((command, reply))
+        return self
+
+    def _read_reply(self, reply):
+        """
+        Reads and decodes the reply for a single command.  Returns the
+        result and the signed status.
+        """
+        status = u2i(_recv_status(self._sbc.sl))
+        if reply == _REPLY_STATUS:
+            return status, status
+        if reply == _REPLY_GROUP:
+            levels = 0
+            if status > 0:
+                levels, status = struct.unpack(
+                    'QI', _str(self._sbc._rxbuf(status)))
+                status = u2i(status)
+            return [status, levels], status
+        rdata = ""
+        if status > 0:
+            rdata = self._sbc._rxbuf(status)
+        return [status, rdata], status
+
+    def execute(self):
+        """
+        Sends the queued commands and reads the replies.  Returns the list
+        of results and clears the batch.
+
+        Batches larger than an internal limit are sent in several
+        transmissions.
+        """
+        commands, self._commands = self._commands, []
+        results = []
+        first_error = 0
+        sl = self._sbc.sl
+        with sl.l:
+            for start in range(0, len(commands), _BATCH_MAX):
+                chunk = commands[start:start + _BATCH_MAX]
+                sl.s.sendall(b''.join(c[0] for c in chunk))
+                for dummy, reply in chunk:
+                    result, status = self._read_reply(reply)
+                    if status < 0 and not first_error:
+                        first_error = status
+                    results.append(result)
+        self.results = results
+        if first_error and exceptions:
+            raise error(error_text(first_error))
+        return results
+
+    # GPIO
+
+    def gpio_read(self, handle, gpio):
+        """
+        Queues a [*gpio_read*].
+        """
+        return self._queue_encoded(
+            _REPLY_STATUS, _ENC_GR.pack(handle & 0xffff, gpio))
+
+    def gpio_write(self, handle, gpio, level):
+        """
+        Queues a [*gpio_write*].
+        """
+        return self._queue_encoded(
+            _REPLY_STATUS, _ENC_GW.pack(handle & 0xffff, gpio, level))
+
+    def group_read(self, handle, gpio):
+        """
+        Queues a [*group_read*].
+        """
+        return self._queue_encoded(
+            _REPLY_GROUP, _ENC_GGR.pack(handle & 0xffff, gpio))
+
+    def group_write(self, handle, gpio, group_bits, group_mask=GROUP_ALL):
+        """
+        Queues a [*group_write*].
+        """
+        ext = [struct.pack(
+            "QQII", group_bits, group_mask, handle & 0xffff, gpio)]
+        return self._queue(_REPLY_STATUS, _CMD_GGWX, 24, ext, Q=2, L=2)
+
+    def tx_pulse(self, handle, gpio,
+                 pulse_on, pulse_off, pulse_offset=0, pulse_cycles=0):
+        """
+        Queues a [*tx_pulse*].
+        """
+        ext = [struct.pack("IIIIII", handle & 0xffff, gpio,
+                           pulse_on, pulse_off, pulse_offset, pulse_cycles)]
+        return self._queue(_REPLY_STATUS, _CMD_GPX, 24, ext, L=6)
+
+    def tx_pwm(self, handle, gpio,
+               pwm_frequency, pwm_duty_cycle, pulse_offset=0, pulse_cycles=0):
+        """
+        Queues a [*tx_pwm*].
+        """
+        ext = [struct.pack("IIIIII", handle & 0xffff, gpio,
+                           int(pwm_frequency * 1000),
+                           int(pwm_duty_cycle * 1000),
+                           pulse_offset, pulse_cycles)]
+        return self._queue(_REPLY_STATUS, _CMD_PX, 24, ext, L=6)
+
+    def gpio_set_watchdog_micros(self, handle, gpio, watchdog_micros):
+        """
+        Queues a [*gpio_set_watchdog_micros*].
+        """
+        ext = [struct.pack("III", handle & 0xffff, gpio, watchdog_micros)]
+        return self._queue(_REPLY_STATUS, _CMD_GWDOG, 12, ext, L=3)
+
+    # I2C
+
+    def i2c_write_byte(self, handle, byte_val):
+        """
+        Queues an [*i2c_write_byte*].
+        """
+        ext = [struct.pack("II", handle, byte_val)]
+        return self._queue(_REPLY_STATUS, _CMD_I2CWS, 8, ext, L=2)
+
+    def i2c_read_byte(self, handle):
+        """
+        Queues an [*i2c_read_byte*].
+        """
+        ext = [struct.pack("I", handle)]
+        return self._queue(_REPLY_STATUS, _CMD_I2CRS, 4, ext, L=1)
+
+    def i2c_write_byte_data(self, handle, reg, byte_val):
+        """
+        Queues an [*i2c_write_byte_data*].
+        """
+        return self._queue_encoded(
+            _REPLY_STATUS, _ENC_I2CWB.pack(handle, reg, byte_val))
+
+    def i2c_read_byte_data(self, handle, reg):
+        """
+        Queues an [*i2c_read_byte_data*].
+        """
+        return self._queue_encoded(
+            _REPLY_STATUS, _ENC_I2CRB.pack(handle, reg))
+
+    def i2c_write_i2c_block_data(self, handle, reg, data):
+        """
+        Queues an [*i2c_write_i2c_block_data*].
+        """
+        ext = [struct.pack("II", handle, reg)] + [data]
+        return self._queue(_REPLY_STATUS, _CMD_I2CWI, 8 + len(data), ext, L=2)
+
+    def i2c_read_i2c_block_data(self, handle, reg, count):
+        """
+        Queues an [*i2c_read_i2c_block_data*].
+        """
+        return self._queue_encoded(
+            _REPLY_DATA, _ENC_I2CRI.pack(handle, reg, count))
+
+    def i2c_read_device(self, handle, count):
+        """
+        Queues an [*i2c_read_device*].
+        """
+        ext = [struct.pack("II", handle, count)]
+        return self._queue(_REPLY_DATA, _CMD_I2CRD, 8, ext, L=2)
+
+    def i2c_write_device(self, handle, data):
+        """
+        Queues an [*i2c_write_device*].
+        """
+        ext = [struct.pack("I", handle)] + [data]
+        return self._queue(_REPLY_STATUS, _CMD_I2CWD, 4 + len(data), ext, L=1)
+
+    def i2c_zip(self, handle, data):
+        """
+        Queues an [*i2c_zip*].
+        """
+        ext = [struct.pack("I", handle)] + [data]
+        return self._queue(_REPLY_DATA, _CMD_I2CZ, 4 + len(data), ext, L=1)
+
+    # SPI
+
+    def spi_read(self, handle, count):
+        """
+        Queues a [*spi_read*].
+        """
+        ext = [struct.pack("II", handle, count)]
+        return self._queue(_REPLY_DATA, _CMD_SPIR, 8, ext, L=2)
+
+    def spi_write(self, handle, data):
+        """
+        Queues a [*spi_write*].
+        """
+        ext = [struct.pack("I", handle)] + [data]
+        return self._queue(_REPLY_STATUS, _CMD_SPIW, 4 + len(data), ext, L=1)
+
+    def spi_xfer(self, handle, data):
+        """
+        Queues a [*spi_xfer*].
+        """
+        ext = [struct.pack("I", handle)] + [data]
+        return self._queue(_REPLY_DATA, _CMD_SPIX, 4 + len(data), ext, L=1)
+
+
 class sbc():
 
     def _rxbuf(self, count):
         """
         Returns count bytes from the command socket.
         """
-        ext = bytearray(self.sl.s.recv(count))
-        while len(ext) < count:
-            ext.extend(self.sl.s.recv(count - len(ext)))
+        ext = bytearray(count)
+        _recv_into(self.sl.s, memoryview(ext))
         return ext
 
     def __repr__(self):
@@ -1178,6 +1595,23 @@ class sbc():
             self.sl.s.close()
             self.sl.s = None
 
+    # BATCH
+
+    def batch(self):
+        """
+        Returns a new [*batch*] of commands for this connection.  The
+        queued commands are sent in a single transmission and their replies
+        are read in order.
+
+        ...
+        with sbc.batch() as b:
+            for reg in range(8):
+                b.i2c_read_byte_data(h, reg)
+        values = b.results
+        ...
+        """
+        return batch(self)
+
     # FILES
 
     def file_open(self, file_name, file_mode):
@@ -1695,8 +2129,11 @@ class sbc():
         will be that last written to the GPIO.
 
         """
-        ext = [struct.pack("II", handle & 0xffff, gpio)]
-        return _u2i(_lg_command_ext(self.sl, _CMD_GR, 8, ext, L=2))
+        sl = self.sl
+        with sl.l:
+            status = _lg_tx_nolock(
+                sl, _ENC_GR.pack_into(sl.tx, handle & 0xffff, gpio))
+        return _u2i(status)
 
     def gpio_write(self, handle, gpio, level):
         """
@@ -1717,8 +2154,11 @@ class sbc():
         If any other value is used the GPIO will be set high (1).
 
         """
-        ext = [struct.pack("III", handle & 0xffff, gpio, level)]
-        return _u2i(_lg_command_ext(self.sl, _CMD_GW, 12, ext, L=3))
+        sl = self.sl
+        with sl.l:
+            status = _lg_tx_nolock(
+                sl, _ENC_GW.pack_into(sl.tx, handle & 0xffff, gpio, level))
+        return _u2i(status)
 
     def group_read(self, handle, gpio):
         """
@@ -1745,12 +2185,12 @@ class sbc():
         Bit x is the level of GPIO x+1 of the group.
 
         """
-        ext = [struct.pack("II", handle & 0xffff, gpio)]
         status = CMD_INTERRUPTED
         levels = 0
         with self.sl.l:
             bytes = u2i(
-                _lg_command_ext_nolock(self.sl, _CMD_GGR, 8, ext, L=2))
+                _lg_tx_nolock(self.sl, _ENC_GGR.pack_into(
+                    self.sl.tx, handle & 0xffff, gpio)))
             if bytes > 0:
                 data = self._rxbuf(bytes)
                 levels, status = struct.unpack('QI', _str(data))
@@ -2321,8 +2761,11 @@ class sbc():
         sbc.i2c_write_byte_data(2, 4, 9)
         ...
         """
-        ext = [struct.pack("III", handle, reg, byte_val)]
-        return _u2i(_lg_command_ext(self.sl, _CMD_I2CWB, 12, ext, L=3))
+        sl = self.sl
+        with sl.l:
+            status = _lg_tx_nolock(
+                sl, _ENC_I2CWB.pack_into(sl.tx, handle, reg, byte_val))
+        return _u2i(status)
 
     def i2c_write_word_data(self, handle, reg, word_val):
         """
@@ -2377,8 +2820,11 @@ class sbc():
         b = sbc.i2c_read_byte_data(0, 1)
         ...
         """
-        ext = [struct.pack("II", handle, reg)]
-        return _u2i(_lg_command_ext(self.sl, _CMD_I2CRB, 8, ext, L=2))
+        sl = self.sl
+        with sl.l:
+            status = _lg_tx_nolock(
+                sl, _ENC_I2CRB.pack_into(sl.tx, handle, reg))
+        return _u2i(status)
 
     def i2c_read_word_data(self, handle, reg):
         """
@@ -2614,10 +3060,10 @@ class sbc():
         """
         bytes = CMD_INTERRUPTED
         rdata = ""
-        ext = [struct.pack("III", handle, reg, count)]
         with self.sl.l:
             bytes = u2i(
-                _lg_command_ext_nolock(self.sl, _CMD_I2CRI, 12, ext, L=3))
+                _lg_tx_nolock(self.sl, _ENC_I2CRI.pack_into(
+                    self.sl.tx, handle, reg, count)))
             if bytes > 0:
                 rdata = self._rxbuf(bytes)
         return _u2i_list([bytes, rdata])
@@ -3405,10 +3851,16 @@ class sbc():
 
         bytes = CMD_INTERRUPTED
         rdata = ""
-        ext = [struct.pack("I", handle)] + [data]
+        if type(data) == type(""):
+            data = _b(data)
         with self.sl.l:
-            bytes = u2i(_lg_command_ext_nolock(
-                self.sl, _CMD_SPIX, 4 + len(data), ext, L=1))
+            if _SPIX_STRUCT.size + len(data) <= _TX_BUF_SIZ:
+                bytes = u2i(_lg_tx_nolock(
+                    self.sl, _encode_spix_into(self.sl.tx, handle, data)))
+            else:
+                ext = [struct.pack("I", handle)] + [data]
+                bytes = u2i(_lg_command_ext_nolock(
+                    self.sl, _CMD_SPIX, 4 + len(data), ext, L=1))
             if bytes > 0:
                 rdata = self._rxbuf(bytes)
         return _u2i_list([bytes, rdata])
@@ -0,0 +1,854 @@
+# coding=utf-8
+"""
+###############################################################################
+#                                                                             #
+#                            Pi GPIO Indigo Plugin                            #
+#                            MODULE rgpioAsync.py                             #
+#                                                                             #
+###############################################################################
+
+  BUNDLE:  Raspberry Pi General Purpose Input/Output for Indigo
+           (Pi GPIO.indigoPlugin)
+  MODULE:  rgpioAsync.py
+   TITLE:  asyncio client for the rgpio daemon
+FUNCTION:  rgpioAsync.py provides an asyncio-native sbc class that implements
+           the rgpio.py command set over asyncio streams.
+   USAGE:  rgpioAsync.py is a stand-alone client.  The plugin modules do not
+           currently import it; it is provided for scripts and future modules
+           that run an asyncio event loop.  It uses the protocol constants,
+           encoders, and status conversion functions in rgpio.py.
+  AUTHOR:  papamac
+ VERSION:  0.11.0
+    DATE:  October 18, 2026
+
+UNLICENSE:
+
+This is free and unencumbered software released into the public domain.
+
+Anyone is free to copy, modify, publish, use, compile, sell, or
+distribute this software, either in source code form or as a compiled
+binary, for any purpose, commercial or non-commercial, and by any
+means.
+
+In jurisdictions that recognize copyright laws, the author or authors
+of this software dedicate any and all copyright interest in the
+software to the public domain. We make this dedication for the benefit
+of the public at large and to the detriment of our heirs and
+successors. We intend this dedication to be an overt act of
+relinquishment in perpetuity of all present and future rights to this
+software under copyright law.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+OTHER DEALINGS IN THE SOFTWARE.
+
+For more information, please refer to <https://unlicense.org/>
+
+Pi GPIO PLUGIN BUNDLE DESCRIPTION:
+
+The Pi GPIO plugin bundle has two primary Python modules: plugin.py
+encapsulates the plugin device behavior in the Plugin class, and
+ioDevices.py encapsulates detailed io device behavior in the IoDevice
+class and its six subclasses.  An IoDevice subclass instance is created for
+each plugin device started by plugin.py.  The plugin bundle contains several
+supporting Python modules: rgpio.py with classes/methods to access the rgpio
+daemon, this module, rgpioAsync.py, with an asyncio version of the rgpio.py
+sbc class, conditionalLogging.py to provide flexible Indigo logging by message
+type and logging level, and pollScheduler.py to schedule io device polling.
+It also includes several xml files that define plugin devices, actions, and
+events.
+
+MODULE rgpioAsync.py DESCRIPTION:
+
+The rgpio.py sbc class is fully blocking.  Each command holds the connection
+lock for a complete network round trip, and each connection starts its own
+notification thread.  The sbc class in this module implements the same
+command set (with the same method names, arguments, and return conventions)
+as coroutines that share a single asyncio event loop.  One event loop can
+then drive many Raspberry Pi's and hundreds of devices without a thread per
+connection.
+
+Each sbc instance opens two asyncio streams to the rgpio daemon: a command
+stream and a notification stream.
+
+Commands are multiplexed on the command stream.  A command coroutine encodes
+the command, writes it to the stream, and appends a future for its reply to
+a FIFO queue of pending replies.  The write and the append are done without
+an intervening await so that the queue order always matches the stream
+order.  A single reply reader task reads the replies in order and resolves
+the futures.  Concurrent commands are therefore pipelined automatically:
+
+    levels = await asyncio.gather(*(pi.gpio_read(h, gpio) for gpio in gpios))
+
+sends all the reads before the first reply is received.  If a caller is
+cancelled, its reply is still read and discarded so that the stream remains
+in sync.
+
+The notification stream is opened with the NOIB command.  A notification
+reader task decodes the 16-byte alert records and calls the callbacks
+registered by the callback method, exactly as the rgpio.py notification
+thread does.  Callback functions may be ordinary functions or coroutine
+functions.  Coroutines are scheduled as tasks on the event loop.
+
+Status checking uses the rgpio.py conversion functions, so the rgpio.exceptions
+setting applies to both the blocking and asyncio classes.
+
+This module is a stand-alone client.  No module in the plugin bundle imports
+it, and the io devices continue to use the blocking rgpio.py sbc class.  The
+blocking rgpio.py sbc class is not implemented as a wrapper over this
+class.  Plugin device threads call it directly from the Indigo plugin host
+threads, and a wrapper would need a private event loop thread and a
+cross-thread future for every command.  That would add latency to every call
+and change the threading behavior of the vendored library.
+
+CHANGE LOG:
+
+Major changes to the Pi GPIO plugin are described in the CHANGES.md file in the
+top level bundle directory.  Changes of lesser importance may be described in
+individual module docstrings if appropriate.
+
+v0.11.0 10/18/2026  (1) Initial version of the asyncio client.
+                    (2) Treat a reply with no pending command as a protocol
+                    error.  Log it and close the connection.
+"""
+###############################################################################
+#                                                                             #
+#                            MODULE rgpioAsync.py                             #
+#                   DUNDERS, IMPORTS, and GLOBAL Constants                    #
+#                                                                             #
+###############################################################################
+
+__author__ = 'papamac'
+__version__ = '0.11.0'
+__date__ = '10/18/2026'
+
+import asyncio
+from collections import deque
+import hashlib
+from logging import getLogger
+import os
+import socket
+import struct
+import time
+
+from rgpio import (CMD_INTERRUPTED, GROUP_ALL, OKAY, RISING_EDGE,
+                   error, error_text, u2i, _u2i, _u2i_list, _str,
+                   _callback, _lg_encode, _ENC_GR, _ENC_GW, _ENC_GGR,
+                   _ENC_I2CRB, _ENC_I2CWB, _ENC_I2CRI, _NOTIFY_STRUCT,
+                   _NOTIFY_BUF_SIZ, _REPLY_STRUCT, _SOCK_CMD_LEN)
+from rgpio import (_CMD_FO, _CMD_FC, _CMD_FR, _CMD_FW, _CMD_FS, _CMD_FL,
+                   _CMD_GO, _CMD_GC, _CMD_GSIX, _CMD_GSOX, _CMD_GSAX,
+                   _CMD_GSF, _CMD_GSGIX, _CMD_GSGOX, _CMD_GSGF, _CMD_GGWX,
+                   _CMD_GPX, _CMD_PX, _CMD_SX, _CMD_GWAVE, _CMD_GBUSY,
+                   _CMD_GROOM, _CMD_GDEB, _CMD_GWDOG, _CMD_GIC, _CMD_GIL,
+                   _CMD_GMODE, _CMD_I2CO, _CMD_I2CC, _CMD_I2CRD, _CMD_I2CWD,
+                   _CMD_I2CWQ, _CMD_I2CRS, _CMD_I2CWS, _CMD_I2CRW,
+                   _CMD_I2CWW, _CMD_I2CRK, _CMD_I2CWK, _CMD_I2CWI,
+                   _CMD_I2CPC, _CMD_I2CPK, _CMD_I2CZ, _CMD_NO, _CMD_NC,
+                   _CMD_NR, _CMD_NP, _CMD_PROC, _CMD_PROCD, _CMD_PROCP,
+                   _CMD_PROCR, _CMD_PROCS, _CMD_PROCU, _CMD_SERO, _CMD_SERC,
+                   _CMD_SERRB, _CMD_SERWB, _CMD_SERR, _CMD_SERW, _CMD_SERDA,
+                   _CMD_SPIO, _CMD_SPIC, _CMD_SPIR, _CMD_SPIW, _CMD_SPIX,
+                   _CMD_CGI, _CMD_CSI, _CMD_NOIB, _CMD_SHELL, _CMD_SBC,
+                   _CMD_FREE, _CMD_USER, _CMD_PASSW, _CMD_SHRU, _CMD_SHRS)
+
+LOG = getLogger('Plugin')  # Plugin logger (L is an rgpio argument name).
+
+# Reply types for the pending reply queue:
+
+_STATUS = False  # Status only.
+_DATA = True     # Status followed by status bytes of data if status > 0.
+
+
+###############################################################################
+#                                                                             #
+#                            MODULE rgpioAsync.py                             #
+#                         CLASS _NotificationStream                           #
+#                                                                             #
+###############################################################################
+
+class _NotificationStream:
+    """
+    Receive rgpio daemon alert notifications on an asyncio stream and call
+    the registered callbacks.  This is the asyncio equivalent of the rgpio.py
+    _callback_thread class.  It provides the append/remove interface used by
+    the rgpio.py _callback class.
+    """
+    def __init__(self, reader, writer, handle):
+        """ Save the stream and the notification handle. """
+        self._reader = reader
+        self._writer = writer
+        self.handle = handle
+        self.callbacks = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def append(self, callb):
+        """ Add a callback to the notification stream. """
+        self.callbacks.append(callb)
+
+    def remove(self, callb):
+        """ Remove a callback from the notification stream. """
+        if callb in self.callbacks:
+            self.callbacks.remove(callb)
+
+    async def _run(self):
+        """
+        Read alert records and call the callbacks for matching gpio's.  Keep
+        any partial record for completion by the next read.
+        """
+        loop = asyncio.get_running_loop()
+        msgSize = _NOTIFY_STRUCT.size
+        iterUnpack = _NOTIFY_STRUCT.iter_unpack
+        partial = b''
+        while True:
+            data = await self._reader.read(_NOTIFY_BUF_SIZ)
+            if not data:  # Connection closed.
+                break
+            if partial:
+                data = partial + data
+            end = len(data) - len(data) % msgSize
+            partial = data[end:]
+            records = memoryview(data)[:end]
+            for tick, chip, gpio, level, flags, pad in iterUnpack(records):
+                if flags == 0:
+                    for cb in self.callbacks:
+                        if cb.gpio == gpio:
+                            result = cb.func(chip, gpio, level, tick)
+                            if asyncio.iscoroutine(result):
+                                loop.create_task(result)
+                else:  # no flags currently defined, ignore.
+                    pass
+
+    async def stop(self):
+        """ Cancel the reader task and close the stream. """
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._writer.close()
+
+
+###############################################################################
+#                                                                             #
+#                            MODULE rgpioAsync.py                             #
+#                                  CLASS sbc                                  #
+#                                                                             #
+###############################################################################
+
+class sbc:
+    """
+    asyncio client for the rgpio daemon on a single-board computer.  The
+    command coroutines have the same names, arguments, and return values as
+    the rgpio.py sbc methods.  Create an instance and then await its connect
+    method (or use it as an async context manager):
+
+    async with rgpioAsync.sbc('mypi') as pi:
+        h = await pi.gpiochip_open(0)
+        level = await pi.gpio_read(h, 17)
+    """
+    def __init__(self, host=os.getenv("LG_ADDR", 'localhost'),
+                 port=os.getenv("LG_PORT", 8889)):
+        """ Save the connection parameters.  Connect with connect(). """
+        self._host = host or 'localhost'
+        self._port = int(port)
+        self._reader = None
+        self._writer = None
+        self._pending = deque()  # FIFO of (future, reply type).
+        self._replyTask = None
+        self._notify = None
+        self.connected = False
+
+    def __repr__(self):
+        return "<rgpioAsync.sbc host={} port={}>".format(self._host,
+                                                         self._port)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+        return False
+
+    # ESSENTIAL
+
+    async def connect(self):
+        """
+        Open the command and notification streams and start the reader
+        tasks.  Log in as LG_USER if it is set in the environment.  Raise an
+        OSError if the daemon is not available.
+        """
+        self._reader, self._writer = await asyncio.open_connection(
+            self._host, self._port)
+        sock = self._writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._replyTask = asyncio.get_running_loop().create_task(
+            self._readReplies())
+
+        # Open the notification stream and request a notification handle.
+
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        writer.write(_lg_encode(_CMD_NOIB, 0, ()))
+        status = u2i(_REPLY_STRUCT.unpack(
+            await reader.readexactly(_SOCK_CMD_LEN))[0])
+        if status < 0:
+            writer.close()
+            raise error(error_text(status))
+        self._notify = _NotificationStream(reader, writer, status)
+        self.connected = True
+
+        user = os.getenv("LG_USER", '')
+        if user:
+            await self.set_user(user)
+        return self
+
+    async def stop(self):
+        """
+        Close the notification handle, free the connection resources, and
+        close both streams.
+        """
+        if not self.connected:
+            return
+        self.connected = False
+        try:
+            await self._status(_CMD_NC, 4,
+                               [struct.pack("I", self._notify.handle)], L=1)
+            await self._status(_CMD_FREE)
+        finally:
+            await self._notify.stop()
+            self._replyTask.cancel()
+            try:
+                await self._replyTask
+            except asyncio.CancelledError:
+                pass
+            self._writer.close()
+
+    # COMMAND MULTIPLEXING
+
+    async def _readReplies(self):
+        """
+        Read command replies in order and resolve the pending futures.  Read
+        the data bytes for data commands.  A reply with no pending command
+        means that the stream is out of sync; log a protocol error and close
+        the connection.  On a connection failure or protocol error, fail all
+        pending commands.
+        """
+        reader = self._reader
+        pending = self._pending
+        try:
+            while True:
+                header = await reader.readexactly(_SOCK_CMD_LEN)
+                status = u2i(_REPLY_STRUCT.unpack(header)[0])
+                if not pending:  # Unexpected reply; stream is out of sync.
+                    LOG.error('%s protocol error: reply with no pending '
+                              'command; closing connection', self)
+                    self.connected = False
+                    self._writer.close()
+                    if self._notify:
+                        asyncio.get_running_loop().create_task(
+                            self._notify.stop())
+                    break
+                future, reply = pending.popleft()
+                data = ""
+                if reply and status > 0:
+                    data = bytearray(await reader.readexactly(status))
+                if not future.done():
+                    future.set_result((status, data))
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            while pending:
+                future, reply = pending.popleft()
+                if not future.done():
+                    future.set_result((CMD_INTERRUPTED, ""))
+
+    def _send(self, command, reply):
+        """
+        Write an encoded command and queue a future for its reply.  This
+        method must not await so that the pending queue order always matches
+        the command stream order.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if self._writer is None or self._replyTask.done():
+            future.set_result((CMD_INTERRUPTED, ""))
+            return future
+        self._pending.append((future, reply))
+        self._writer.write(command)
+        return future
+
+    async def _command(self, command, reply=_STATUS):
+        """
+        Send an encoded command and return the signed status and data from
+        its reply.  Apply stream flow control before waiting for the reply
+        unless the command was not sent because the connection is closed.
+        """
+        future = self._send(command, reply)
+        if not future.done():
+            await self._writer.drain()
+        return await asyncio.shield(future)
+
+    async def _status(self, cmd, p3=0, extents=(), Q=0, L=0, H=0):
+        """ Send a status only command and return the checked status. """
+        status, data = await self._command(
+            _lg_encode(cmd, p3, extents, Q, L, H))
+        return _u2i(status)
+
+    async def _data(self, cmd, p3, extents, Q=0, L=0, H=0):
+        """
+        Send a data command and return a checked list of the number of
+        bytes read and a bytearray containing the bytes.
+        """
+        status, data = await self._command(
+            _lg_encode(cmd, p3, extents, Q, L, H), _DATA)
+        return _u2i_list([status, data])
+
+    # FILES
+
+    async def file_open(self, file_name, file_mode):
+        ext = [struct.pack("I", file_mode)] + [file_name]
+        return await self._status(_CMD_FO, 4 + len(file_name), ext, L=1)
+
+    async def file_close(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_FC, 4, ext, L=1)
+
+    async def file_read(self, handle, count):
+        ext = [struct.pack("II", handle, count)]
+        return await self._data(_CMD_FR, 8, ext, L=2)
+
+    async def file_write(self, handle, data):
+        ext = [struct.pack("I", handle)] + [data]
+        return await self._status(_CMD_FW, 4 + len(data), ext, L=1)
+
+    async def file_seek(self, handle, seek_offset, seek_from):
+        ext = [struct.pack("IiI", handle, seek_offset, seek_from)]
+        return await self._status(_CMD_FS, 12, ext, L=3)
+
+    async def file_list(self, fpattern):
+        ext = [struct.pack("I", 60000)] + [fpattern]
+        return await self._data(_CMD_FL, 4 + len(fpattern), ext, L=1)
+
+    # GPIO
+
+    async def gpiochip_open(self, gpiochip):
+        ext = [struct.pack("I", gpiochip)]
+        status, data = await self._command(_lg_encode(_CMD_GO, 4, ext, L=1))
+        if status >= 0:
+            status = status | gpiochip << 16
+        return _u2i(status)
+
+    async def gpiochip_close(self, handle):
+        ext = [struct.pack("I", handle & 0xffff)]
+        return await self._status(_CMD_GC, 4, ext, L=1)
+
+    async def gpio_get_chip_info(self, handle):
+        ext = [struct.pack("I", handle & 0xffff)]
+        status, data = await self._command(
+            _lg_encode(_CMD_GIC, 4, ext, L=1), _DATA)
+        if status > 0:
+            lines, name, label = struct.unpack('I32s32s', data)
+            status = OKAY
+        else:
+            lines, name, label = 0, b'', b''
+        return _u2i_list([status, lines, name.decode().rstrip('\0'),
+                          label.decode().rstrip('\0')])
+
+    async def gpio_get_line_info(self, handle, gpio):
+        ext = [struct.pack("II", handle & 0xffff, gpio)]
+        status, data = await self._command(
+            _lg_encode(_CMD_GIL, 8, ext, L=2), _DATA)
+        if status > 0:
+            offset, flags, name, user = struct.unpack('II32s32s', data)
+            status = OKAY
+        else:
+            offset, flags, name, user = 0, 0, b'', b''
+        return _u2i_list([status, offset, flags, name.decode().rstrip('\0'),
+                          user.decode().rstrip('\0')])
+
+    async def gpio_get_mode(self, handle, gpio):
+        ext = [struct.pack("II", handle & 0xffff, gpio)]
+        return await self._status(_CMD_GMODE, 8, ext, L=2)
+
+    async def gpio_claim_input(self, handle, gpio, lFlags=0):
+        ext = [struct.pack("III", handle & 0xffff, lFlags, gpio)]
+        return await self._status(_CMD_GSIX, 12, ext, L=3)
+
+    async def gpio_claim_output(self, handle, gpio, level=0, lFlags=0):
+        ext = [struct.pack("IIII", handle & 0xffff, lFlags, gpio, level)]
+        return await self._status(_CMD_GSOX, 16, ext, L=4)
+
+    async def gpio_free(self, handle, gpio):
+        ext = [struct.pack("II", handle & 0xffff, gpio)]
+        return await self._status(_CMD_GSF, 8, ext, L=2)
+
+    async def group_claim_input(self, handle, gpio, lFlags=0):
+        if not len(gpio):
+            return 0
+        ext = bytearray(struct.pack("II", handle & 0xffff, lFlags))
+        for g in gpio:
+            ext.extend(struct.pack("I", g))
+        return await self._status(_CMD_GSGIX, (len(gpio) + 2) * 4, [ext],
+                                  L=len(gpio) + 2)
+
+    async def group_claim_output(self, handle, gpio, levels=[0], lFlags=0):
+        if not len(gpio):
+            return 0
+        diff = len(gpio) - len(levels)
+        if diff > 0:
+            levels = levels + [0] * diff
+        ext = bytearray(struct.pack("II", handle & 0xffff, lFlags))
+        for g in gpio:
+            ext.extend(struct.pack("I", g))
+        for v in range(len(gpio)):
+            ext.extend(struct.pack("I", levels[v]))
+        return await self._status(_CMD_GSGOX, (2 + len(gpio) * 2) * 4,
+                                  [ext], L=2 + len(gpio) * 2)
+
+    async def group_free(self, handle, gpio):
+        ext = [struct.pack("II", handle & 0xffff, gpio)]
+        return await self._status(_CMD_GSGF, 8, ext, L=2)
+
+    async def gpio_read(self, handle, gpio):
+        status, data = await self._command(
+            _ENC_GR.pack(handle & 0xffff, gpio))
+        return _u2i(status)
+
+    async def gpio_write(self, handle, gpio, level):
+        status, data = await self._command(
+            _ENC_GW.pack(handle & 0xffff, gpio, level))
+        return _u2i(status)
+
+    async def group_read(self, handle, gpio):
+        status, data = await self._command(
+            _ENC_GGR.pack(handle & 0xffff, gpio), _DATA)
+        levels = 0
+        if status > 0:
+            levels, status = struct.unpack('QI', _str(data))
+        return _u2i_list([status, levels])
+
+    async def group_write(self, handle, gpio, group_bits,
+                          group_mask=GROUP_ALL):
+        ext = [struct.pack(
+            "QQII", group_bits, group_mask, handle & 0xffff, gpio)]
+        return await self._status(_CMD_GGWX, 24, ext, Q=2, L=2)
+
+    async def tx_pulse(self, handle, gpio,
+                       pulse_on, pulse_off, pulse_offset=0, pulse_cycles=0):
+        ext = [struct.pack("IIIIII", handle & 0xffff, gpio,
+                           pulse_on, pulse_off, pulse_offset, pulse_cycles)]
+        return await self._status(_CMD_GPX, 24, ext, L=6)
+
+    async def tx_pwm(self, handle, gpio, pwm_frequency, pwm_duty_cycle,
+                     pulse_offset=0, pulse_cycles=0):
+        ext = [struct.pack("IIIIII", handle & 0xffff, gpio,
+                           int(pwm_frequency * 1000),
+                           int(pwm_duty_cycle * 1000),
+                           pulse_offset, pulse_cycles)]
+        return await self._status(_CMD_PX, 24, ext, L=6)
+
+    async def tx_servo(self, handle, gpio, pulse_width, servo_frequency=50,
+                       pulse_offset=0, pulse_cycles=0):
+        ext = [struct.pack("IIIIII", handle & 0xffff, gpio, pulse_width,
+                           servo_frequency, pulse_offset, pulse_cycles)]
+        return await self._status(_CMD_SX, 24, ext, L=6)
+
+    async def tx_wave(self, handle, gpio, pulses):
+        if not len(pulses):
+            return 0
+        q = 3 * len(pulses)
+        size = q * 8 + 2 * 4
+        ext1 = bytearray()
+        for p in pulses:
+            ext1.extend(struct.pack(
+                "QQQ", p.group_bits, p.group_mask, p.pulse_delay))
+        ext2 = struct.pack("II", handle & 0xffff, gpio)
+        return await self._status(_CMD_GWAVE, size, [ext1, ext2], Q=q, L=2)
+
+    async def tx_busy(self, handle, gpio, kind):
+        ext = [struct.pack("III", handle & 0xffff, gpio, kind)]
+        return await self._status(_CMD_GBUSY, 12, ext, L=3)
+
+    async def tx_room(self, handle, gpio, kind):
+        ext = [struct.pack("III", handle & 0xffff, gpio, kind)]
+        return await self._status(_CMD_GROOM, 12, ext, L=3)
+
+    async def gpio_set_debounce_micros(self, handle, gpio, debounce_micros):
+        ext = [struct.pack("III", handle & 0xffff, gpio, debounce_micros)]
+        return await self._status(_CMD_GDEB, 12, ext, L=3)
+
+    async def gpio_set_watchdog_micros(self, handle, gpio, watchdog_micros):
+        ext = [struct.pack("III", handle & 0xffff, gpio, watchdog_micros)]
+        return await self._status(_CMD_GWDOG, 12, ext, L=3)
+
+    async def gpio_claim_alert(self, handle, gpio, eFlags, lFlags=0,
+                               notify_handle=None):
+        if notify_handle is None:
+            notify_handle = self._notify.handle
+        ext = [struct.pack("IIIII", handle & 0xffff, lFlags, eFlags, gpio,
+                           notify_handle)]
+        return await self._status(_CMD_GSAX, 20, ext, L=5)
+
+    def callback(self, handle, gpio, edge=RISING_EDGE, func=None):
+        """
+        Return an rgpio.py _callback instance that calls func (an ordinary
+        function or a coroutine function) for alerts on the gpio.  This is
+        not a coroutine because it does not communicate with the daemon.
+        """
+        return _callback(self._notify, handle >> 16, gpio, edge, func)
+
+    # I2C
+
+    async def i2c_open(self, i2c_bus, i2c_address, i2c_flags=0):
+        ext = [struct.pack("III", i2c_bus, i2c_address, i2c_flags)]
+        return await self._status(_CMD_I2CO, 12, ext, L=3)
+
+    async def i2c_close(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_I2CC, 4, ext, L=1)
+
+    async def i2c_write_quick(self, handle, bit):
+        ext = [struct.pack("II", handle, bit)]
+        return await self._status(_CMD_I2CWQ, 8, ext, L=2)
+
+    async def i2c_write_byte(self, handle, byte_val):
+        ext = [struct.pack("II", handle, byte_val)]
+        return await self._status(_CMD_I2CWS, 8, ext, L=2)
+
+    async def i2c_read_byte(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_I2CRS, 4, ext, L=1)
+
+    async def i2c_write_byte_data(self, handle, reg, byte_val):
+        status, data = await self._command(
+            _ENC_I2CWB.pack(handle, reg, byte_val))
+        return _u2i(status)
+
+    async def i2c_write_word_data(self, handle, reg, word_val):
+        ext = [struct.pack("III", handle, reg, word_val)]
+        return await self._status(_CMD_I2CWW, 12, ext, L=3)
+
+    async def i2c_read_byte_data(self, handle, reg):
+        status, data = await self._command(_ENC_I2CRB.pack(handle, reg))
+        return _u2i(status)
+
+    async def i2c_read_word_data(self, handle, reg):
+        ext = [struct.pack("II", handle, reg)]
+        return await self._status(_CMD_I2CRW, 8, ext, L=2)
+
+    async def i2c_process_call(self, handle, reg, word_val):
+        ext = [struct.pack("III", handle, reg, word_val)]
+        return await self._status(_CMD_I2CPC, 12, ext, L=3)
+
+    async def i2c_write_block_data(self, handle, reg, data):
+        ext = [struct.pack("II", handle, reg)] + [data]
+        return await self._status(_CMD_I2CWK, 8 + len(data), ext, L=2)
+
+    async def i2c_read_block_data(self, handle, reg):
+        ext = [struct.pack("II", handle, reg)]
+        return await self._data(_CMD_I2CRK, 8, ext, L=2)
+
+    async def i2c_block_process_call(self, handle, reg, data):
+        ext = [struct.pack("II", handle, reg)] + [data]
+        return await self._data(_CMD_I2CPK, 8 + len(data), ext, L=2)
+
+    async def i2c_write_i2c_block_data(self, handle, reg, data):
+        ext = [struct.pack("II", handle, reg)] + [data]
+        return await self._status(_CMD_I2CWI, 8 + len(data), ext, L=2)
+
+    async def i2c_read_i2c_block_data(self, handle, reg, count):
+        status, data = await self._command(
+            _ENC_I2CRI.pack(handle, reg, count), _DATA)
+        return _u2i_list([status, data])
+
+    async def i2c_read_device(self, handle, count):
+        ext = [struct.pack("II", handle, count)]
+        return await self._data(_CMD_I2CRD, 8, ext, L=2)
+
+    async def i2c_write_device(self, handle, data):
+        ext = [struct.pack("I", handle)] + [data]
+        return await self._status(_CMD_I2CWD, 4 + len(data), ext, L=1)
+
+    async def i2c_zip(self, handle, data):
+        ext = [struct.pack("I", handle)] + [data]
+        return await self._data(_CMD_I2CZ, 4 + len(data), ext, L=1)
+
+    # NOTIFICATIONS
+
+    async def notify_open(self):
+        return await self._status(_CMD_NO)
+
+    async def notify_pause(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_NP, 4, ext, L=1)
+
+    async def notify_resume(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_NR, 4, ext, L=1)
+
+    async def notify_close(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_NC, 4, ext, L=1)
+
+    # SCRIPTS
+
+    async def script_store(self, script):
+        if not len(script):
+            return 0
+        return await self._status(_CMD_PROC, len(script) + 1,
+                                  [script + '\0'])
+
+    async def script_run(self, handle, params=None):
+        ext = struct.pack("I", handle)
+        nump = 1
+        if params is not None:
+            for p in params:
+                ext += struct.pack("I", p)
+            nump = 1 + len(params)
+        return await self._status(_CMD_PROCR, nump * 4, [ext], L=nump)
+
+    async def script_update(self, handle, params=None):
+        ext = struct.pack("I", handle)
+        nump = 1
+        if params is not None:
+            for p in params:
+                ext += struct.pack("I", p)
+            nump = 1 + len(params)
+        return await self._status(_CMD_PROCU, nump * 4, [ext], L=nump)
+
+    async def script_status(self, handle):
+        ext = [struct.pack("I", handle)]
+        status, data = await self._command(
+            _lg_encode(_CMD_PROCP, 4, ext, L=1), _DATA)
+        params = ()
+        if status > 0:
+            pars = struct.unpack('11i', _str(data))
+            status = pars[0]
+            params = pars[1:]
+        return _u2i_list([status, params])
+
+    async def script_stop(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_PROCS, 4, ext, L=1)
+
+    async def script_delete(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_PROCD, 4, ext, L=1)
+
+    # SERIAL
+
+    async def serial_open(self, tty, baud, ser_flags=0):
+        ext = [struct.pack("II", baud, ser_flags)] + [tty]
+        return await self._status(_CMD_SERO, 8 + len(tty), ext, L=2)
+
+    async def serial_close(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_SERC, 4, ext, L=1)
+
+    async def serial_read_byte(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_SERRB, 4, ext, L=1)
+
+    async def serial_write_byte(self, handle, byte_val):
+        ext = [struct.pack("II", handle, byte_val)]
+        return await self._status(_CMD_SERWB, 8, ext, L=2)
+
+    async def serial_read(self, handle, count=1000):
+        ext = [struct.pack("II", handle, count)]
+        return await self._data(_CMD_SERR, 8, ext, L=2)
+
+    async def serial_write(self, handle, data):
+        ext = [struct.pack("I", handle)] + [data]
+        return await self._status(_CMD_SERW, 4 + len(data), ext, L=1)
+
+    async def serial_data_available(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_SERDA, 4, ext, L=1)
+
+    # SHELL
+
+    async def shell(self, shellscr, pstring=""):
+        ls = len(shellscr) + 1
+        lp = len(pstring) + 1
+        ext = [struct.pack("I", ls)] + [shellscr + '\0' + pstring + '\0']
+        return await self._status(_CMD_SHELL, 4 + ls + lp, ext, L=1)
+
+    # SPI
+
+    async def spi_open(self, spi_device, spi_channel, baud, spi_flags=0):
+        ext = [struct.pack("IIII", spi_device, spi_channel, baud, spi_flags)]
+        return await self._status(_CMD_SPIO, 16, ext, L=4)
+
+    async def spi_close(self, handle):
+        ext = [struct.pack("I", handle)]
+        return await self._status(_CMD_SPIC, 4, ext, L=1)
+
+    async def spi_read(self, handle, count):
+        ext = [struct.pack("II", handle, count)]
+        return await self._data(_CMD_SPIR, 8, ext, L=2)
+
+    async def spi_write(self, handle, data):
+        ext = [struct.pack("I", handle)] + [data]
+        return await self._status(_CMD_SPIW, 4 + len(data), ext, L=1)
+
+    async def spi_xfer(self, handle, data):
+        ext = [struct.pack("I", handle)] + [data]
+        return await self._data(_CMD_SPIX, 4 + len(data), ext, L=1)
+
+    # UTILITIES
+
+    async def get_sbc_name(self):
+        status, data = await self._command(_lg_encode(_CMD_SBC, 0, ()),
+                                           _DATA)
+        return data if status > 0 else ""
+
+    async def set_user(self, user="default",
+                       secretsFile=os.path.expanduser("~/.lg_secret")):
+        user = user.strip() or "default"
+        secret = bytearray()
+        with open(secretsFile) as f:
+            for line in f:
+                fields = line.split("=")
+                if len(fields) == 2 and fields[0].strip() == user:
+                    secret = bytearray(fields[1].strip().encode('utf-8'))
+                    break
+
+        salt1 = '{:015x}'.format(int(time.time() * 1e7) & 0xfffffffffffffff)
+        ext = salt1 + '.' + user
+        status, data = await self._command(
+            _lg_encode(_CMD_USER, len(ext), [ext]), _DATA)
+        if status < 0:
+            return status
+        h = hashlib.md5()
+        h.update(bytearray(salt1.encode('utf-8')) + secret + data[:15])
+        pwd = h.hexdigest()
+        status, data = await self._command(
+            _lg_encode(_CMD_PASSW, len(pwd), [pwd]))
+        return status
+
+    async def set_share_id(self, handle, share_id):
+        ext = [struct.pack("II", handle, share_id)]
+        return await self._status(_CMD_SHRS, 8, ext, L=2)
+
+    async def use_share_id(self, share_id):
+        ext = [struct.pack("I", share_id)]
+        return await self._status(_CMD_SHRU, 4, ext, L=1)
+
+    async def get_internal(self, config_id):
+        ext = [struct.pack("I", config_id)]
+        status, data = await self._command(
+            _lg_encode(_CMD_CGI, 4, ext, L=1), _DATA)
+        config_value = None
+        if status > 0:
+            config_value = struct.unpack('Q', _str(data))[0]
+            status = OKAY
+        return _u2i_list([status, config_value])
+
+    async def set_internal(self, config_id, config_value):
+        ext = [struct.pack("QI", config_value, config_id)]
+        return await self._status(_CMD_CSI, 12, ext, Q=1, L=1)
@@ -0,0 +1,670 @@
+# coding=utf-8
+"""
+###############################################################################
+#                                                                             #
+#                            Pi GPIO Indigo Plugin                            #
+#                            MODULE chipModels.py                             #
+#                                                                             #
+###############################################################################
+
+  BUNDLE:  Raspberry Pi General Purpose Input/Output for Indigo
+           (Pi GPIO.indigoPlugin)
+  MODULE:  chipModels.py
+   TITLE:  Simulated io chip models for the rgpio daemon emulator
+FUNCTION:  chipModels.py provides register-accurate behavioral models of the
+           io chips supported by ioDevices.py.  The models attach to an
+           rgpiodEmulator.RgpiodEmulator instance at i2c addresses and spi
+           channels.
+   USAGE:  chipModels.py is imported by the benchmark programs in this folder.
+           Use the addChip function to create a model by its ioDevType name
+           and attach it to an emulator.
+  AUTHOR:  papamac
+ VERSION:  0.11.0
+    DATE:  October 18, 2026
+
+UNLICENSE:
+
+This is free and unencumbered software released into the public domain.
+
+Anyone is free to copy, modify, publish, use, compile, sell, or
+distribute this software, either in source code form or as a compiled
+binary, for any purpose, commercial or non-commercial, and by any
+means.
+
+In jurisdictions that recognize copyright laws, the author or authors
+of this software dedicate any and all copyright interest in the
+software to the public domain. We make this dedication for the benefit
+of the public at large and to the detriment of our heirs and
+successors. We intend this dedication to be an overt act of
+relinquishment in perpetuity of all present and future rights to this
+software under copyright law.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+OTHER DEALINGS IN THE SOFTWARE.
+
+For more information, please refer to <https://unlicense.org/>
+
+MODULE chipModels.py DESCRIPTION:
+
+Each model implements the emulator device interface: write(data) and
+read(count) for i2c chips and xfer(data) for spi chips.  The models follow
+the hardware references cited in the corresponding ioDevices.py classes.
+
+MCP23008, MCP23017   i2c io expanders with the complete MCP23XXX register
+MCP23S08, MCP23S17   set.  The models implement the IOCON BANK 0/1 address
+                     mappings, the SEQOP sequential address pointer, the HAEN
+                     spi hardware address enable, IPOL input polarity, GPPU
+                     pullups, interrupt-on-change and compare-to-DEFVAL
+                     interrupts with INTF/INTCAP capture and clearing, and the
+                     INTA/INTB outputs with INTPOL and MIRROR.  The INT output
+                     may be connected to an emulated Raspberry Pi gpio input.
+MCP3202, MCP3204,    12-bit spi ADC's with bit-accurate start bit, single/
+MCP3208              pseudo-differential channel selection, and output code
+                     framing.  Optional gaussian noise may be added.
+MCP3422, MCP3423,    18-bit i2c delta-sigma ADC's with one-shot and continuous
+MCP3424              conversion modes, programmable gain, 12-18 bit
+                     resolution, the RDY bit, and resolution-dependent
+                     conversion times (4.17 ms to 267 ms).
+MCP4801/11/21,       8/10/12-bit single/dual spi DAC's with gain and shutdown
+MCP4802/12/22        bits and LDAC latching.
+dkrPiRly             DockerPi 4 channel relay board (i2c registers 1-4).
+
+SpiChipSelect is a spi device that shares a single chip select line among
+several MCP23S08/MCP23S17 chips that are distinguished by their hardware
+addresses.
+
+External inputs (io expander pins and ADC voltages) are set with model
+methods that hold the emulator lock so that they can be called safely from
+benchmark threads.
+"""
+###############################################################################
+#                                                                             #
+#                            MODULE chipModels.py                             #
+#                   DUNDERS, IMPORTS, and GLOBAL Constants                    #
+#                                                                             #
+###############################################################################
+
+__author__ = 'papamac'
+__version__ = '0.11.0'
+__date__ = '10/18/2026'
+
+from random import gauss
+import time
+
+from rgpiodEmulator import I2cDevice, SpiDevice
+
+# MCP23XXX register names in register index order.  The index is the
+# register address for the MCP23X08 and for port A in the MCP23X17 BANK 1
+# mapping.
+
+MCP23XXX_REGISTERS = ('IODIR', 'IPOL', 'GPINTEN', 'DEFVAL', 'INTCON', 'IOCON',
+                      'GPPU', 'INTF', 'INTCAP', 'GPIO', 'OLAT')
+IODIR, IPOL, GPINTEN, DEFVAL, INTCON, IOCON, GPPU, INTF, INTCAP, GPIO, OLAT \
+    = range(len(MCP23XXX_REGISTERS))
+
+# IOCON register bits.
+
+BANK = 0x80
+MIRROR = 0x40
+SEQOP = 0x20
+HAEN = 0x08
+INTPOL = 0x02
+
+# MCP342X sample rates (samples per second) by resolution index.
+
+MCP342X_SPS = (240.0, 60.0, 15.0, 3.75)
+
+
+###############################################################################
+#                                                                             #
+#                            MODULE chipModels.py                             #
+#                               CLASS MCP23XXX                                #
+#                                                                             #
+###############################################################################
+
+class MCP23XXX:
+    """
+    Register model common to the MCP23008, MCP23S08, MCP23017, and MCP23S17
+    io expanders.  Subclasses provide the i2c or spi bus interface.
+    """
+    def __init__(self, ports):
+        self.ports = ports
+        self.registers = [[0xff if r == IODIR else 0 for r in range(11)]
+                          for port in range(ports)]
+        self.inputs = [0] * ports   # External pin levels.
+        self.intOutput = [False] * ports  # INTA/INTB active states.
+        self.onInterrupt = None     # Function(port, level) for INT changes.
+        self.pointer = 0
+
+    # Address mapping.
+
+    def _decode(self, address):
+        """ Return the (port, register index) for an address or None. """
+        if self.ports == 1:
+            return (0, address) if address < 11 else None
+        if self.registers[0][IOCON] & BANK:
+            port, index = address >> 4, address & 0x0f
+            return (port, index) if port < 2 and index < 11 else None
+        return (address & 1, address >> 1) if address < 22 else None
+
+    def _nextAddress(self, address):
+        """ Advance the address pointer unless SEQOP is set. """
+        if self.registers[0][IOCON] & SEQOP:
+            return address
+        if self.ports == 1:
+            return (address + 1) % 11
+        if self.registers[0][IOCON] & BANK:
+            return (address & 0x10) | ((address & 0x0f) + 1) % 11
+        return (address + 1) % 22
+
+    # Register access.
+
+    def _port(self, port):
+        """ Return the GPIO port value seen by the chip. """
+        regs = self.registers[port]
+        pins = (self.inputs[port] ^ regs[IPOL]) & regs[IODIR]
+        return pins | regs[OLAT] & ~regs[IODIR] & 0xff
+
+    def readRegister(self, address):
+        """ Read a register and apply the read side effects. """
+        decoded = self._decode(address)
+        if decoded is None:
+            return 0
+        port, index = decoded
+        regs = self.registers[port]
+        if index == GPIO:
+            value = self._port(port)
+            self._clearInterrupt(port)
+        elif index == INTCAP:
+            value = regs[INTCAP]
+            self._clearInterrupt(port)
+        else:
+            value = regs[index]
+        return value
+
+    def writeRegister(self, address, value):
+        """ Write a register and apply the write side effects. """
+        decoded = self._decode(address)
+        if decoded is None:
+            return
+        port, index = decoded
+        if index == IOCON:
+            for regs in self.registers:
+                regs[IOCON] = value & 0xfe
+        elif index in (INTF, INTCAP):
+            pass  # Read only.
+        elif index == GPIO:
+            self.registers[port][OLAT] = value
+        else:
+            self.registers[port][index] = value
+            if index in (GPINTEN, DEFVAL, INTCON):
+                self._checkInterrupt(port, self._port(port))
+
+    # Interrupts.
+
+    def _checkInterrupt(self, port, previous):
+        """
+        Set INTF and capture INTCAP for enabled inputs that changed (INTCON
+        bit 0) or differ from DEFVAL (INTCON bit 1).  Do not capture while an
+        interrupt is pending.
+        """
+        regs = self.registers[port]
+        if regs[INTF]:
+            return
+        value = self._port(port)
+        changed = (value ^ previous) & ~regs[INTCON]
+        compared = (value ^ regs[DEFVAL]) & regs[INTCON]
+        flags = (changed | compared) & regs[GPINTEN] & regs[IODIR] & 0xff
+        if flags:
+            regs[INTF] = flags
+            regs[INTCAP] = value
+            self._updateIntOutput()
+
+    def _clearInterrupt(self, port):
+        """
+        Clear a pending interrupt.  Compare-to-DEFVAL interrupts are set again
+        immediately if the condition persists.
+        """
+        regs = self.registers[port]
+        if regs[INTF]:
+            regs[INTF] = 0
+            self._updateIntOutput()
+            self._checkInterrupt(port, self._port(port))
+
+    def _updateIntOutput(self):
+        """ Update the INT outputs and call onInterrupt for any changes. """
+        iocon = self.registers[0][IOCON]
+        active = [bool(regs[INTF]) for regs in self.registers]
+        if iocon & MIRROR:
+            active = [any(active)] * self.ports
+        for port in range(self.ports):
+            if active[port] != self.intOutput[port]:
+                self.intOutput[port] = active[port]
+                if self.onInterrupt:
+                    level = active[port] == bool(iocon & INTPOL)
+                    self.onInterrupt(port, int(level))
+
+    # External interface.
+
+    def setInput(self, pin, level):
+        """
+        Set the external level of an io pin (0-7 for port A, 8-15 for port B)
+        and generate any resulting interrupt.
+        """
+        with self.lock:
+            port, mask = pin >> 3, 1 << (pin & 7)
+            previous = self._port(port)
+            if level:
+                self.inputs[port] |= mask
+            else:
+                self.inputs[port] &= ~mask
+            self._checkInterrupt(port, previous)
+
+    def connectInterrupt(self, emulator, gpio, port=0):
+        """
+        Connect the INTA (port 0) or INTB (port 1) output to an emulated
+        Raspberry Pi gpio input.
+        """
+        callback = self.onInterrupt
+        iocon = self.registers[0][IOCON]
+
+        def onInterrupt(port_, level):
+            if port_ == port:
+                emulator.setLevel(gpio, level)
+            elif callback:
+                callback(port_, level)
+
+        self.onInterrupt = onInterrupt
+        emulator.setLevel(gpio, int(self.intOutput[port] ==
+                                    bool(iocon & INTPOL)))
+
+    def outputs(self, port=0):
+        """ Return the output latch bits that drive output pins. """
+        regs = self.registers[port]
+        return regs[OLAT] & ~regs[IODIR] & 0xff
+
+
+class MCP23008(MCP23XXX, I2cDevice):
+    """ MCP23008 8-bit i2c io expander. """
+    PORTS = 1
+
+    def __init__(self):
+        MCP23XXX.__init__(self, self.PORTS)
+
+    def write(self, data):
+        """ Set the address pointer and write sequential registers. """
+        if data:
+            self.pointer = data[0]
+            for byte in data[1:]:
+                self.writeRegister(self.pointer, byte)
+                self.pointer = self._nextAddress(self.pointer)
+
+    def read(self, count):
+        """ Read sequential registers starting at the address pointer. """
+        data = bytearray()
+        for i in range(count):
+            data.append(self.readRegister(self.pointer))
+            self.pointer = self._nextAddress(self.pointer)
+        return bytes(data)
+
+
+class MCP23017(MCP23008):
+    """ MCP23017 16-bit i2c io expander. """
+    PORTS = 2
+
+
+class MCP23S08(MCP23XXX, SpiDevice):
+    """
+    MCP23S08 8-bit spi io expander.  The opcode is 0100 A1 A0 R/W.  The
+    hardware address is compared only if IOCON HAEN is set; otherwise the
+    chip responds only to hardware address 0.
+    """
+    PORTS = 1
+    ADDRESS_BITS = 0x03
+
+    def __init__(self, hwAddress=0):
+        MCP23XXX.__init__(self, self.PORTS)
+        self.hwAddress = hwAddress
+
+    def xfer(self, data):
+        """ Execute a spi read or write frame and return the output bytes. """
+        result = bytearray(len(data))
+        if len(data) < 2 or data[0] >> 4 != 0x4:
+            return bytes(result)
+        address = data[0] >> 1 & self.ADDRESS_BITS
+        hwAddress = self.hwAddress if self.registers[0][IOCON] & HAEN else 0
+        if address != hwAddress:
+            return bytes(result)
+        self.pointer = data[1]
+        for i in range(2, len(data)):
+            if data[0] & 0x01:
+                result[i] = self.readRegister(self.pointer)
+            else:
+                self.writeRegister(self.pointer, data[i])
+            self.pointer = self._nextAddress(self.pointer)
+        return bytes(result)
+
+
+class MCP23S17(MCP23S08):
+    """ MCP23S17 16-bit spi io expander.  The opcode is 0100 A2 A1 A0 R/W. """
+    PORTS = 2
+    ADDRESS_BITS = 0x07
+
+
+class SpiChipSelect(SpiDevice):
+    """
+    Several spi io expanders sharing a single chip select line.  The output
+    bytes of all chips are combined because only the addressed chip drives
+    the MISO line.
+    """
+    def __init__(self, *chips):
+        self._lock = SpiDevice.lock
+        self.chips = []
+        for chip in chips:
+            self.add(chip)
+
+    @property
+    def lock(self):
+        return self._lock
+
+    @lock.setter
+    def lock(self, lock):
+        self._lock = lock
+        for chip in self.chips:
+            chip.lock = lock
+
+    def add(self, chip):
+        """ Add a chip to the chip select line. """
+        chip.lock = self.lock
+        self.chips.append(chip)
+        return chip
+
+    def xfer(self, data):
+        result = bytearray(len(data))
+        for chip in self.chips:
+            for i, byte in enumerate(chip.xfer(data)):
+                result[i] |= byte
+        return bytes(result)
+
+
+###############################################################################
+#                                                                             #
+#                            MODULE chipModels.py                             #
+#                                CLASS MCP320X                                #
+#                                                                             #
+###############################################################################
+
+class MCP320X(SpiDevice):
+    """
+    MCP3202, MCP3204, and MCP3208 12-bit spi ADC's.  A frame starts with the
+    first 1 bit (the start bit) followed by the configuration bits: SGL/DIFF,
+    ODD/SIGN, and MSBF for the MCP3202 or SGL/DIFF, D2, D1, and D0 for the
+    MCP3204/8.  The MCP3204/8 then sample for one clock.  The null bit and
+    the 12-bit output code (msb first) follow.
+    """
+    def __init__(self, channels=8, referenceVoltage=3.3, noise=0.0):
+        self.channels = channels
+        self.referenceVoltage = referenceVoltage
+        self.noise = noise  # Standard deviation of the noise (counts).
+        self.voltages = [0.0] * channels
+        self.conversions = 0
+
+    def setVoltage(self, channel, voltage):
+        """ Set the input voltage for a channel. """
+        with self.lock:
+            self.voltages[channel] = voltage
+
+    def _code(self, single, select):
+        """ Convert the selected input to a 12-bit output code. """
+        if single:
+            voltage = self.voltages[select]
+        else:
+            pair = select & ~1
+            plus, minus = (pair, pair + 1) if not select & 1 \
+                else (pair + 1, pair)
+            voltage = self.voltages[plus] - self.voltages[minus]
+        code = voltage / self.referenceVoltage * 4096
+        if self.noise:
+            code += gauss(0.0, self.noise)
+        return min(max(int(code), 0), 4095)
+
+    def xfer(self, data):
+        nBits = 8 * len(data)
+        frame = int.from_bytes(data, 'big')
+        if not frame:
+            return bytes(len(data))
+        start = frame.bit_length() - 1  # Bit position of the start bit.
+        if self.channels == 2:
+            configBits, sampleBits = 3, 1
+            config = frame >> (start - 3) & 0x7
+            single, select = config >> 2, config >> 1 & 1
+        else:
+            configBits, sampleBits = 4, 2
+            config = frame >> (start - 4) & 0xf
+            single, select = config >> 3, config & 0x7
+            select &= self.channels - 1
+        shift = start - configBits - sampleBits - 12
+        if shift < 0:  # Frame is too short for a complete conversion.
+            return bytes(len(data))
+        self.conversions += 1
+        output = self._code(single, select) << shift
+        return (output & ((1 << nBits) - 1)).to_bytes(len(data), 'big')
+
+
+###############################################################################
+#                                                                             #
+#                            MODULE chipModels.py                             #
+#                                CLASS MCP342X                                #
+#                                                                             #
+###############################################################################
+
+class MCP342X(I2cDevice):
+    """
+    MCP3422, MCP3423, and MCP3424 18-bit i2c delta-sigma ADC's.  The
+    configuration byte is RDY C1 C0 O/C S1 S0 G1 G0.  Writing it with RDY set
+    in one-shot mode (O/C = 0) starts a conversion.  Writing it in
+    continuous mode (O/C = 1) restarts continuous conversions.  A read
+    returns the output code (3 bytes for 18-bit resolution, otherwise 2)
+    followed by the configuration byte (repeated for any additional bytes).
+    The RDY bit is 0 when the output register contains a new conversion
+    result that has not yet been read.  The conversion time is 1/SPS for the
+    selected resolution.  timeScale scales the conversion times.
+    """
+    def __init__(self, channels=4, timeScale=1.0):
+        self.channels = channels
+        self.timeScale = timeScale
+        self.voltages = [0.0] * channels
+        self.config = 0x90  # Power-on default: continuous, 12-bit, gain 1.
+        self.output = 0
+        self.ready = False    # Output contains a new unread result.
+        self.startTime = None  # Start time of the current conversion.
+        self.conversions = 0
+        self._start()
+
+    def setVoltage(self, channel, voltage):
+        """ Set the differential input voltage for a channel. """
+        with self.lock:
+            self.voltages[channel] = voltage
+
+    def conversionTime(self, config=None):
+        """ Return the conversion time (seconds) for a configuration. """
+        config = self.config if config is None else config
+        return self.timeScale / MCP342X_SPS[config >> 2 & 0x3]
+
+    def _start(self):
+        self.startTime = time.monotonic()
+
+    def _update(self):
+        """ Complete any conversions that have finished. """
+        if self.startTime is None:
+            return
+        elapsed = time.monotonic() - self.startTime
+        period = self.conversionTime()
+        if elapsed < period:
+            return
+        resolutionIndex = self.config >> 2 & 0x3
+        resolution = 12 + 2 * resolutionIndex
+        maxCode = 1 << (resolution - 1)
+        gain = 1 << (self.config & 0x3)
+        channel = (self.config >> 5 & 0x3) % self.channels
+        code = int(self.voltages[channel] * gain * maxCode / 2.048)
+        self.output = min(max(code, -maxCode), maxCode - 1)
+        self.ready = True
+        if self.config & 0x10:  # Continuous mode.
+            completed = int(elapsed / period)
+            self.conversions += completed
+            self.startTime += completed * period
+        else:
+            self.conversions += 1
+            self.startTime = None
+
+    def write(self, data):
+        if not data:
+            return
+        self._update()
+        config = data[-1]
+        self.config = config & 0x7f
+        if config & 0x10:  # Continuous mode: restart conversions.
+            self.ready = False
+            self._start()
+        elif config & 0x80:  # Start a one-shot conversion.
+            self.ready = False
+            self._start()
+
+    def read(self, count):
+        self._update()
+        nBytes = 3 if self.config >> 2 & 0x3 == 3 else 2
+        output = self.output & ((1 << 8 * nBytes) - 1)
+        config = self.config | (0 if self.ready else 0x80)
+        data = output.to_bytes(nBytes, 'big') + bytes((config,)) * count
+        self.ready = False
+        return data[:count]
+
+
+###############################################################################
+#                                                                             #
+#                            MODULE chipModels.py                             #
+#                                CLASS MCP48XX                                #
+#                                                                             #
+###############################################################################
+
+class MCP48XX(SpiDevice):
+    """
+    MCP4801/11/21 (single) and MCP4802/12/22 (dual) 8/10/12-bit spi DAC's.
+    A 16-bit write command is A/B x GA SHDN D11-D0.  The data bits are left
+    justified for 8 and 10-bit DAC's.  The output is 2.048 * D / 4096 times 2
+    if GA is 0.  If LDAC is held low (ldacLow, the default) the outputs are
+    updated at the end of each write.  Otherwise, the input registers are
+    transferred to the outputs by the latch method (an LDAC pulse).
+    """
+    def __init__(self, channels=2, bits=12, ldacLow=True):
+        self.channels = channels
+        self.bits = bits
+        self.ldacLow = ldacLow
+        self.inputs = [(0, 1, 0)] * channels  # (code, gain, active).
+        self.outputs = [(0, 1, 0)] * channels
+        self.writes = 0
+
+    def xfer(self, data):
+        for i in range(0, len(data) - 1, 2):
+            command = data[i] << 8 | data[i + 1]
+            channel = command >> 15 if self.channels == 2 else 0
+            gain = 1 if command & 0x2000 else 2
+            active = command >> 12 & 1
+            code = (command & 0x0fff) >> (12 - self.bits)
+            self.inputs[channel] = code, gain, active
+            self.writes += 1
+            if self.ldacLow:
+                self.outputs[channel] = self.inputs[channel]
+        return bytes(len(data))
+
+    def latch(self):
+        """ Transfer the input registers to the outputs (LDAC pulse). """
+        with self.lock:
+            self.outputs = list(self.inputs)
+
+    def voltage(self, channel=0):
+        """ Return the output voltage for a channel. """
+        code, gain, active = self.outputs[channel]
+        return 2.048 * code / (1 << self.bits) * gain if active else 0.0
+
+
+###############################################################################
+#                                                                             #
+#                            MODULE chipModels.py                             #
+#                             CLASS DockerPiRelay                             #
+#                                                                             #
+###############################################################################
+
+class DockerPiRelay(I2cDevice):
+    """
+    DockerPi 4 channel relay board.  Registers 1-4 control relays 1-4; any
+    nonzero value turns the relay on.
+    """
+    def __init__(self):
+        I2cDevice.__init__(self)
+        self.writes = 0
+
+    def write(self, data):
+        I2cDevice.write(self, data)
+        if len(data) > 1:
+            self.writes += 1
+
+    def relay(self, number):
+        """ Return the state (0 or 1) of a relay (1-4). """
+        return 1 if self.registers[number] else 0
+
+
+###############################################################################
+#                                                                             #
+#                            MODULE chipModels.py                             #
+#                                  FUNCTIONS                                  #
+#                                                                             #
+###############################################################################
+
+# Chip model constructors by ioDevType.
+
+CHIP_MODELS = {
+    'MCP23008': lambda **kw: MCP23008(),
+    'MCP23017': lambda **kw: MCP23017(),
+    'MCP23S08': lambda **kw: MCP23S08(**kw),
+    'MCP23S17': lambda **kw: MCP23S17(**kw),
+    'MCP3202':  lambda **kw: MCP320X(channels=2, **kw),
+    'MCP3204':  lambda **kw: MCP320X(channels=4, **kw),
+    'MCP3208':  lambda **kw: MCP320X(channels=8, **kw),
+    'MCP3422':  lambda **kw: MCP342X(channels=2, **kw),
+    'MCP3423':  lambda **kw: MCP342X(channels=2, **kw),
+    'MCP3424':  lambda **kw: MCP342X(channels=4, **kw),
+    'MCP4801':  lambda **kw: MCP48XX(channels=1, bits=8, **kw),
+    'MCP4802':  lambda **kw: MCP48XX(channels=2, bits=8, **kw),
+    'MCP4811':  lambda **kw: MCP48XX(channels=1, bits=10, **kw),
+    'MCP4812':  lambda **kw: MCP48XX(channels=2, bits=10, **kw),
+    'MCP4821':  lambda **kw: MCP48XX(channels=1, bits=12, **kw),
+    'MCP4822':  lambda **kw: MCP48XX(channels=2, bits=12, **kw),
+    'dkrPiRly': lambda **kw: DockerPiRelay()}
+
+
+def addChip(emulator, ioDevType, location, **kwargs):
+    """
+    Create a chip model by its ioDevType and attach it to an emulator.  The
+    location is the i2c address for i2c chips or the spi channel for spi
+    chips.  MCP23S08/MCP23S17 chips on the same channel share a
+    SpiChipSelect.  Keyword arguments are passed to the model constructor.
+    Return the chip model.
+    """
+    chip = CHIP_MODELS[ioDevType](**kwargs)
+    if isinstance(chip, I2cDevice):
+        emulator.addI2cDevice(location, chip)
+    elif isinstance(chip, MCP23S08):
+        cs = emulator.spiDevices.get((0, location))
+        if not isinstance(cs, SpiChipSelect):
+            cs = emulator.addSpiDevice(location, SpiChipSelect())
+        cs.add(chip)
+    else:
+        emulator.addSpiDevice(location, chip)
+    return chip
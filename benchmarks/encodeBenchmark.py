@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+###############################################################################
+#                                                                             #
+#                            Pi GPIO Indigo Plugin                            #
+#                          MODULE encodeBenchmark.py                          #
+#                                                                             #
+###############################################################################
+
+  BUNDLE:  Raspberry Pi General Purpose Input/Output for Indigo
+           (Pi GPIO.indigoPlugin)
+  MODULE:  encodeBenchmark.py
+   TITLE:  rgpio command encoding micro-benchmark
+FUNCTION:  encodeBenchmark.py measures the per-call cost of encoding rgpio
+           commands using the original generic method (_lg_command_ext) and
+           the precompiled encoders in rgpio.py.
+   USAGE:  python3 benchmarks/encodeBenchmark.py [-n NUMBER]
+           Run from the top level PiGPIO folder on any computer with Python 3.
+           No Raspberry Pi or rgpio daemon is needed.
+  AUTHOR:  papamac
+ VERSION:  0.11.0
+    DATE:  October 18, 2026
+
+UNLICENSE:
+
+This is free and unencumbered software released into the public domain.
+
+Anyone is free to copy, modify, publish, use, compile, sell, or
+distribute this software, either in source code form or as a compiled
+binary, for any purpose, commercial or non-commercial, and by any
+means.
+
+In jurisdictions that recognize copyright laws, the author or authors
+of this software dedicate any and all copyright interest in the
+software to the public domain. We make this dedication for the benefit
+of the public at large and to the detriment of our heirs and
+successors. We intend this dedication to be an overt act of
+relinquishment in perpetuity of all present and future rights to this
+software under copyright law.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+OTHER DEALINGS IN THE SOFTWARE.
+
+For more information, please refer to <https://unlicense.org/>
+
+MODULE encodeBenchmark.py DESCRIPTION:
+
+For each hot command (GR, GW, GGR, I2CRB, I2CWB, I2CRI, and SPIX) the
+benchmark times two encoding paths:
+
+generic  The original rgpio.py encoding: pack the parameters with a format
+         string, build a new bytearray from the packed header, and type
+         check/extend each extent.
+fast     The precompiled encoder: pack the header and parameters with a
+         single cached struct.Struct (with the constant header fields bound
+         in a closure) into the reusable socklock transmit buffer.
+
+It also times complete command calls through a null socket that returns a
+canned reply: the generic _lg_command_ext path and the corresponding sbc
+method that now uses the fast path.  These include locking, reply decoding,
+and status checking so that the encode savings can be seen in context.  The
+benchmark first verifies that both encoding paths produce identical bytes.
+"""
+###############################################################################
+#                                                                             #
+#                          MODULE encodeBenchmark.py                          #
+#                   DUNDERS, IMPORTS, and GLOBAL Constants                    #
+#                                                                             #
+###############################################################################
+
+__author__ = 'papamac'
+__version__ = '0.11.0'
+__date__ = '10/18/2026'
+
+from argparse import ArgumentParser
+from pathlib import Path
+import struct
+import sys
+from timeit import timeit
+
+# Import rgpio.py from the plugin bundle.
+
+BUNDLE_DIR = (Path(__file__).resolve().parent.parent / 'Pi GPIO.indigoPlugin'
+              / 'Contents' / 'Server Plugin')
+sys.path.insert(0, str(BUNDLE_DIR))
+import rgpio  # noqa: E402
+
+SPI_DATA = [0x06, 0x40, 0x00]  # Typical 3-byte MCP320x spi frame.
+
+
+###############################################################################
+#                                                                             #
+#                          MODULE encodeBenchmark.py                          #
+#                                  FUNCTIONS                                  #
+#                                                                             #
+###############################################################################
+
+def genericEncode(cmd, p3, extents, Q=0, L=0, H=0):
+    """ Encode a command using the original _lg_command_ext method. """
+    ext = bytearray(struct.pack('IIHHHH', rgpio.MAGIC, p3, cmd, Q, L, H))
+    for x in extents:
+        if type(x) == type(""):
+            ext.extend(x.encode('latin-1'))
+        else:
+            ext.extend(x)
+    return ext
+
+
+# Generic and fast encoding functions for each hot command.  Each fast
+# function packs the command into a socklock transmit buffer and returns its
+# encoded length.
+
+SL = rgpio._socklock()
+
+COMMANDS = {
+    'GR': (lambda: genericEncode(rgpio._CMD_GR, 8,
+                                 [struct.pack('II', 4, 17)], L=2),
+           lambda: rgpio._ENC_GR.pack_into(SL.tx, 4, 17)),
+    'GW': (lambda: genericEncode(rgpio._CMD_GW, 12,
+                                 [struct.pack('III', 4, 17, 1)], L=3),
+           lambda: rgpio._ENC_GW.pack_into(SL.tx, 4, 17, 1)),
+    'GGR': (lambda: genericEncode(rgpio._CMD_GGR, 8,
+                                  [struct.pack('II', 4, 17)], L=2),
+            lambda: rgpio._ENC_GGR.pack_into(SL.tx, 4, 17)),
+    'I2CRB': (lambda: genericEncode(rgpio._CMD_I2CRB, 8,
+                                    [struct.pack('II', 2, 0x09)], L=2),
+              lambda: rgpio._ENC_I2CRB.pack_into(SL.tx, 2, 0x09)),
+    'I2CWB': (lambda: genericEncode(rgpio._CMD_I2CWB, 12,
+                                    [struct.pack('III', 2, 0x0a, 0x55)], L=3),
+              lambda: rgpio._ENC_I2CWB.pack_into(SL.tx, 2, 0x0a, 0x55)),
+    'I2CRI': (lambda: genericEncode(rgpio._CMD_I2CRI, 12,
+                                    [struct.pack('III', 2, 0x8c, 4)], L=3),
+              lambda: rgpio._ENC_I2CRI.pack_into(SL.tx, 2, 0x8c, 4)),
+    'SPIX': (lambda: genericEncode(rgpio._CMD_SPIX, 4 + len(SPI_DATA),
+                                   [struct.pack('I', 1), SPI_DATA], L=1),
+             lambda: rgpio._encode_spix_into(SL.tx, 1, SPI_DATA))}
+
+
+###############################################################################
+#                                                                             #
+#                          MODULE encodeBenchmark.py                          #
+#                               CLASS NullSocket                              #
+#                                                                             #
+###############################################################################
+
+class NullSocket:
+    """
+    A socket substitute that discards sent commands and returns a canned
+    reply with a status of 3 followed by 3 data bytes.
+    """
+    REPLY = struct.pack('I12s', 3, b'') + bytes((0x01, 0x02, 0x03))
+
+    def __init__(self):
+        self._reply = memoryview(b'')
+
+    def sendall(self, data):
+        self._reply = memoryview(self.REPLY)
+
+    send = sendall
+
+    def recv_into(self, view, nbytes=0):
+        n = min(len(view), len(self._reply))
+        view[:n] = self._reply[:n]
+        self._reply = self._reply[n:]
+        return n
+
+
+def nullSbc():
+    """ Return an rgpio.sbc instance connected to a NullSocket. """
+    sbc = rgpio.sbc.__new__(rgpio.sbc)
+    sbc.sl = rgpio._socklock()
+    sbc.sl.s = NullSocket()
+    return sbc
+
+
+###############################################################################
+#                                                                             #
+#                          MODULE encodeBenchmark.py                          #
+#                                MAIN PROGRAM                                 #
+#                                                                             #
+###############################################################################
+
+def main():
+    """ Verify and time the generic and fast encoding paths. """
+    parser = ArgumentParser(description='rgpio command encoding benchmark')
+    parser.add_argument('-n', '--number', type=int, default=200000,
+                        help='number of calls per measurement')
+    number = parser.parse_args().number
+
+    print('encode cost per call (ns)')
+    print('%-8s %10s %10s %8s' % ('command', 'generic', 'fast', 'speedup'))
+    for name, (generic, fast) in COMMANDS.items():
+        size = fast()
+        if bytes(generic()) != bytes(SL.tx[:size]):
+            sys.exit('%s fast encoding does not match generic encoding'
+                     % name)
+        genericTime = timeit(generic, number=number) / number * 1e9
+        fastTime = timeit(fast, number=number) / number * 1e9
+        print('%-8s %10.0f %10.0f %7.2fx'
+              % (name, genericTime, fastTime, genericTime / fastTime))
+
+    sbc = nullSbc()
+    sl = sbc.sl
+    calls = {
+        'gpio_read': (
+            lambda: rgpio._u2i(rgpio._lg_command_ext(
+                sl, rgpio._CMD_GR, 8, [struct.pack('II', 4, 17)], L=2)),
+            lambda: sbc.gpio_read(4, 17)),
+        'gpio_write': (
+            lambda: rgpio._u2i(rgpio._lg_command_ext(
+                sl, rgpio._CMD_GW, 12, [struct.pack('III', 4, 17, 1)], L=3)),
+            lambda: sbc.gpio_write(4, 17, 1)),
+        'i2c_read_byte_data': (
+            lambda: rgpio._u2i(rgpio._lg_command_ext(
+                sl, rgpio._CMD_I2CRB, 8, [struct.pack('II', 2, 9)], L=2)),
+            lambda: sbc.i2c_read_byte_data(2, 9)),
+        'i2c_write_byte_data': (
+            lambda: rgpio._u2i(rgpio._lg_command_ext(
+                sl, rgpio._CMD_I2CWB, 12, [struct.pack('III', 2, 10, 0x55)],
+                L=3)),
+            lambda: sbc.i2c_write_byte_data(2, 10, 0x55))}
+    print()
+    print('command cost per call with a null socket (ns)')
+    print('%-20s %10s %10s %8s' % ('method', 'generic', 'fast', 'speedup'))
+    for name, (generic, fast) in calls.items():
+        genericTime = timeit(generic, number=number) / number * 1e9
+        fastTime = timeit(fast, number=number) / number * 1e9
+        print('%-20s %10.0f %10.0f %7.2fx'
+              % (name, genericTime, fastTime, genericTime / fastTime))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+# coding=utf-8
+"""
+###############################################################################
+#                                                                             #
+#                            Pi GPIO Indigo Plugin                            #
+#                         MODULE indigo/__init__.py                           #
+#                                                                             #
+###############################################################################
+
+  BUNDLE:  Raspberry Pi General Purpose Input/Output for Indigo
+           (Pi GPIO.indigoPlugin)
+  MODULE:  indigo/__init__.py
+   TITLE:  Stand-in indigo package for benchmarks
+FUNCTION:  The indigo package in the benchmarks folder provides the subset of
+           the Indigo server plugin API that is used by plugin.py and
+           ioDevices.py.  It records every server call so that benchmarks can
+           count server updates.
+   USAGE:  The benchmark programs in this folder import plugin.py and
+           ioDevices.py from the plugin bundle.  Because the benchmarks folder
+           is first on the Python path when a benchmark is run, their import
+           indigo statements import this package instead of the Indigo
+           server's built-in module.
+  AUTHOR:  papamac
+ VERSION:  0.11.0
+    DATE:  October 18, 2026
+
+UNLICENSE:
+
+This is free and unencumbered software released into the public domain.
+
+Anyone is free to copy, modify, publish, use, compile, sell, or
+distribute this software, either in source code form or as a compiled
+binary, for any purpose, commercial or non-commercial, and by any
+means.
+
+In jurisdictions that recognize copyright laws, the author or authors
+of this software dedicate any and all copyright interest in the
+software to the public domain. We make this dedication for the benefit
+of the public at large and to the detriment of our heirs and
+successors. We intend this dedication to be an overt act of
+relinquishment in perpetuity of all present and future rights to this
+software under copyright law.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+OTHER DEALINGS IN THE SOFTWARE.
+
+For more information, please refer to <https://unlicense.org/>
+
+MODULE indigo/__init__.py DESCRIPTION:
+
+The package provides:
+
+PluginBase       A plugin base class with pluginId, pluginPrefs, the
+                 indigo_log_handler attached to the "Plugin" logger, and
+                 stopConcurrentThread/sleep methods.  The Indigo THREADDEBUG
+                 logging level and Logger.threaddebug method are added to the
+                 logging module.
+Device           A device with id, name, deviceTypeId, address, pluginProps,
+                 states, and the ...OnServer update methods.
+Trigger          A plugin event trigger with pluginProps.
+devices          The device database (indigo.devices) with get, iter, and
+                 item access by id or name.  Benchmarks add devices with the
+                 non-API create method.
+triggers         The trigger database (indigo.triggers).
+trigger          trigger.execute.
+server           server.getTime and server.log.
+Dict, List       Dictionary and list types.
+kStateImageSel, kDeviceAction, kUniversalAction
+                 Enumeration constants.
+
+Every server call is counted in the module-level calls Counter by method name
+and in the calls Counter of the device or trigger.  Use reset to clear all
+counts at the start of a benchmark measurement.
+"""
+###############################################################################
+#                                                                             #
+#                         MODULE indigo/__init__.py                           #
+#                   DUNDERS, IMPORTS, and GLOBAL Constants                    #
+#                                                                             #
+###############################################################################
+
+__author__ = 'papamac'
+__version__ = '0.11.0'
+__date__ = '10/18/2026'
+
+from collections import Counter
+from datetime import datetime
+import logging
+from threading import Event, Lock
+
+# Add the Indigo THREADDEBUG logging level.
+
+THREADDEBUG = 5
+logging.addLevelName(THREADDEBUG, 'THREADDEBUG')
+
+
+def _threaddebug(self, message, *args, **kwargs):
+    if self.isEnabledFor(THREADDEBUG):
+        self._log(THREADDEBUG, message, args, **kwargs)
+
+
+logging.Logger.threaddebug = _threaddebug
+
+# Server call counts by method name.
+
+calls = Counter()
+_callsLock = Lock()
+
+
+def _count(obj, method):
+    """ Count a server call for an object (device or trigger). """
+    with _callsLock:
+        calls[method] += 1
+        obj.calls[method] += 1
+
+
+def reset():
+    """ Clear all server call counts. """
+    with _callsLock:
+        calls.clear()
+        for obj in list(devices) + list(triggers):
+            obj.calls.clear()
+
+
+###############################################################################
+#                                                                             #
+#                         MODULE indigo/__init__.py                           #
+#                           CONSTANTS AND TYPES                               #
+#                                                                             #
+###############################################################################
+
+class _Enum:
+    """ A namespace of named enumeration constants. """
+    def __init__(self, *names):
+        for name in names:
+            setattr(self, name, name)
+
+
+kStateImageSel = _Enum('Auto', 'NoImage', 'SensorOff', 'SensorOn',
+                       'SensorTripped', 'PowerOff', 'PowerOn')
+kDeviceAction = _Enum('TurnOn', 'TurnOff', 'Toggle', 'SetBrightness')
+kUniversalAction = _Enum('Beep', 'EnergyUpdate', 'EnergyReset',
+                         'RequestStatus')
+
+
+class Dict(dict):
+    """ Indigo dictionary type. """
+
+
+class List(list):
+    """ Indigo list type. """
+
+
+###############################################################################
+#                                                                             #
+#                         MODULE indigo/__init__.py                           #
+#                            CLASSES Device, Trigger                          #
+#                                                                             #
+###############################################################################
+
+class Device:
+    """ An Indigo plugin device. """
+    _nextId = 1000
+
+    def __init__(self, name, deviceTypeId, pluginProps, states=None,
+                 address=''):
+        Device._nextId += 1
+        self.id = Device._nextId
+        self.name = name
+        self.deviceTypeId = deviceTypeId
+        self.pluginId = 'net.papamac.indigoplugin.pigpio'
+        self.pluginProps = Dict(pluginProps)
+        self.states = Dict(states or {})
+        self.uiStates = {}
+        self.address = address
+        self.configured = True
+        self.enabled = True
+        self.errorState = ''
+        self.displayStateImageSel = kStateImageSel.Auto
+        self.calls = Counter()
+
+    def updateStateOnServer(self, key, value, uiValue=None,
+                            decimalPlaces=None, clearErrorState=True):
+        _count(self, 'updateStateOnServer')
+        self.states[key] = value
+        self.uiStates[key] = uiValue if uiValue is not None else str(value)
+        if clearErrorState:
+            self.errorState = ''
+
+    def updateStatesOnServer(self, keyValueList, clearErrorState=True):
+        _count(self, 'updateStatesOnServer')
+        for item in keyValueList:
+            self.states[item['key']] = item['value']
+            self.uiStates[item['key']] = item.get('uiValue',
+                                                  str(item['value']))
+        if clearErrorState:
+            self.errorState = ''
+
+    def updateStateImageOnServer(self, imageSel):
+        _count(self, 'updateStateImageOnServer')
+        self.displayStateImageSel = imageSel
+
+    def setErrorStateOnServer(self, errorState):
+        _count(self, 'setErrorStateOnServer')
+        self.errorState = errorState or ''
+
+    def replacePluginPropsOnServer(self, pluginProps):
+        _count(self, 'replacePluginPropsOnServer')
+        self.pluginProps = Dict(pluginProps)
+
+    def stateListOrDisplayStateIdChanged(self):
+        _count(self, 'stateListOrDisplayStateIdChanged')
+
+    def refreshFromServer(self):
+        _count(self, 'refreshFromServer')
+
+
+class Trigger:
+    """ An Indigo plugin event trigger. """
+    _nextId = 5000
+
+    def __init__(self, name, pluginTypeId, pluginProps, enabled=True):
+        Trigger._nextId += 1
+        self.id = Trigger._nextId
+        self.name = name
+        self.pluginId = 'net.papamac.indigoplugin.pigpio'
+        self.pluginTypeId = pluginTypeId
+        self.pluginProps = Dict(pluginProps)
+        self.enabled = enabled
+        self.calls = Counter()
+
+    def replacePluginPropsOnServer(self, pluginProps):
+        _count(self, 'replacePluginPropsOnServer')
+        self.pluginProps = Dict(pluginProps)
+
+
+###############################################################################
+#                                                                             #
+#                         MODULE indigo/__init__.py                           #
+#                   DATABASES AND SERVER COMMAND NAMESPACES                   #
+#                                                                             #
+###############################################################################
+
+class _Database:
+    """ A database of objects keyed by both id and name. """
+    def __init__(self):
+        self._byId = {}
+        self._byName = {}
+
+    def create(self, obj):
+        """ Add an object to the database (not part of the Indigo API). """
+        self._byId[obj.id] = obj
+        self._byName[obj.name] = obj
+        return obj
+
+    def delete(self, key):
+        obj = self[key]
+        del self._byId[obj.id]
+        del self._byName[obj.name]
+
+    def clear(self):
+        self._byId.clear()
+        self._byName.clear()
+
+    def _lookup(self, key):
+        return (self._byId if isinstance(key, int) else self._byName).get(key)
+
+    def __getitem__(self, key):
+        obj = self._lookup(key)
+        if obj is None:
+            raise KeyError(key)
+        return obj
+
+    def get(self, key, default=None):
+        obj = self._lookup(key)
+        return default if obj is None else obj
+
+    def __contains__(self, key):
+        return self._lookup(key) is not None
+
+    def __iter__(self):
+        return iter(list(self._byId.values()))
+
+    def __len__(self):
+        return len(self._byId)
+
+    def iter(self, filter=''):
+        """ Iterate over all objects ('self' selects this plugin's). """
+        return iter(self)
+
+
+devices = _Database()
+triggers = _Database()
+
+
+class _TriggerCommands:
+    """ indigo.trigger commands. """
+    @staticmethod
+    def execute(trig):
+        _count(trig, 'execute')
+
+
+class _ServerCommands:
+    """ indigo.server commands. """
+    @staticmethod
+    def getTime():
+        return datetime.now()
+
+    @staticmethod
+    def log(message, type=None, isError=False, level=logging.INFO):
+        logging.getLogger('Plugin').log(
+            logging.ERROR if isError else level, message)
+
+
+trigger = _TriggerCommands()
+server = _ServerCommands()
+
+
+###############################################################################
+#                                                                             #
+#                         MODULE indigo/__init__.py                           #
+#                              CLASS PluginBase                               #
+#                                                                             #
+###############################################################################
+
+class StopThread(Exception):
+    """ Raised by PluginBase.sleep when the concurrent thread is stopped. """
+
+
+class PluginBase:
+    """ The Indigo plugin base class. """
+    StopThread = StopThread
+
+    def __init__(self, pluginId, pluginDisplayName, pluginVersion,
+                 pluginPrefs):
+        self.pluginId = pluginId
+        self.pluginDisplayName = pluginDisplayName
+        self.pluginVersion = pluginVersion
+        self.pluginPrefs = Dict(pluginPrefs)
+        self.stopThread = False
+        self._stopEvent = Event()
+        self.logger = logging.getLogger('Plugin')
+        self.indigo_log_handler = logging.StreamHandler()
+        self.indigo_log_handler.setFormatter(logging.Formatter(
+            '%(asctime)s %(levelname)s %(message)s'))
+        self.logger.addHandler(self.indigo_log_handler)
+
+    def stopConcurrentThread(self):
+        self.stopThread = True
+        self._stopEvent.set()
+
+    def sleep(self, seconds):
+        """ Sleep until the time expires or the thread is stopped. """
+        if self._stopEvent.wait(seconds):
+            raise StopThread()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+###############################################################################
+#                                                                             #
+#                            Pi GPIO Indigo Plugin                            #
+#                           MODULE pollBenchmark.py                           #
+#                                                                             #
+###############################################################################
+
+  BUNDLE:  Raspberry Pi General Purpose Input/Output for Indigo
+           (Pi GPIO.indigoPlugin)
+  MODULE:  pollBenchmark.py
+   TITLE:  End-to-end io device polling throughput benchmark
+FUNCTION:  pollBenchmark.py starts N plugin devices of each io device type
+           against emulated rgpio daemons, runs the plugin poll scheduler for
+           a fixed time, and reports polling throughput, latency, server
+           updates, and cpu time by device type.
+   USAGE:  python3 benchmarks/pollBenchmark.py [-n NUMBER] [-t TIME]
+           [-i INTERVAL] [-l LATENCY] [-H HOSTS] [--types TYPE ...]
+           Run from the top level PiGPIO folder on any computer with Python 3.
+           No Raspberry Pi or Indigo server is needed.
+  AUTHOR:  papamac
+ VERSION:  0.11.0
+    DATE:  October 18, 2026
+
+UNLICENSE:
+
+This is free and unencumbered software released into the public domain.
+
+Anyone is free to copy, modify, publish, use, compile, sell, or
+distribute this software, either in source code form or as a compiled
+binary, for any purpose, commercial or non-commercial, and by any
+means.
+
+In jurisdictions that recognize copyright laws, the author or authors
+of this software dedicate any and all copyright interest in the
+software to the public domain. We make this dedication for the benefit
+of the public at large and to the detriment of our heirs and
+successors. We intend this dedication to be an overt act of
+relinquishment in perpetuity of all present and future rights to this
+software under copyright law.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+OTHER DEALINGS IN THE SOFTWARE.
+
+For more information, please refer to <https://unlicense.org/>
+
+MODULE pollBenchmark.py DESCRIPTION:
+
+The benchmark runs the unmodified plugin.py and ioDevices.py modules with the
+stand-in indigo package in this folder:
+
+1. Start one RgpiodEmulator (a "host") for each simulated Raspberry Pi and
+   attach the chip models needed by the selected device types.
+2. Create N Indigo devices of each type in the stand-in device database,
+   spread across the hosts, and start them with Plugin.deviceStartComm.
+3. Run Plugin.runConcurrentThread (the poll scheduler) in a thread for the
+   measurement time and then stop it with Plugin.stopConcurrentThread.
+4. Stop the devices with Plugin.deviceStopComm and shut down the plugin.
+
+IoDevice.poll (and any subclass override) is wrapped to measure the wall clock
+latency and the thread cpu time of each poll.  Deferred work that a poll
+schedules on the poll scheduler (e.g., an ADC18 result read) is not included.
+The report lists the following for each device type:
+
+polls/s   Achieved polls per second and the target rate (N / interval).
+latency   Per-poll latency percentiles (p50, p90, p99, max) in milliseconds.
+updates   Indigo server calls (state, image, and error updates) per poll.
+cpu       Thread cpu time per poll (microseconds) and the share of total
+          process cpu time.
+
+The per-host poll lag statistics from the poll scheduler workers are listed
+after the device type table.
+
+Device types and their per-host capacities:
+
+pigpio    24 built-in gpio digital inputs (gpio 4-27).
+MCP23017  128 i2c io expander digital inputs (8 chips x 16 bits).
+MCP23S17  128 spi io expander digital inputs (8 chips on spi channel 1).
+MCP3208   8 spi 12-bit ADC channels (spi channel 0).
+MCP3424   32 i2c 18-bit ADC channels (8 chips x 4 channels, 12-bit mode).
+MCP4822   2 spi DAC channels (spi channel 1).
+dkrPiRly  16 i2c relays (4 boards x 4 relays).
+"""
+###############################################################################
+#                                                                             #
+#                           MODULE pollBenchmark.py                           #
+#                   DUNDERS, IMPORTS, and GLOBAL Constants                    #
+#                                                                             #
+###############################################################################
+
+__author__ = 'papamac'
+__version__ = '0.11.0'
+__date__ = '10/18/2026'
+
+from argparse import ArgumentParser
+from collections import defaultdict
+from math import ceil
+from pathlib import Path
+import sys
+from threading import Thread
+import time
+
+# Import the plugin modules from the plugin bundle.  The stand-in indigo
+# package in this folder is found first because the benchmark folder is first
+# on the Python path.
+
+BUNDLE_DIR = (Path(__file__).resolve().parent.parent / 'Pi GPIO.indigoPlugin'
+              / 'Contents' / 'Server Plugin')
+sys.path.insert(1, str(BUNDLE_DIR))
+import indigo  # noqa: E402
+import ioDevices  # noqa: E402
+import plugin  # noqa: E402
+
+from chipModels import addChip  # noqa: E402
+from rgpiodEmulator import RgpiodEmulator  # noqa: E402
+
+PLUGIN_PREFS = {'loggingLevel': 'WARNING',
+                'loggingMessageTypes': [],
+                'runLoopSleepTime': '0.01'}
+
+# Device type capacities per host.
+
+CAPACITY = {'pigpio':   24, 'MCP23017': 128, 'MCP23S17': 128,
+            'MCP3208':   8, 'MCP3424':   32, 'MCP4822':    2,
+            'dkrPiRly': 16}
+
+# Common pluginProps for analog devices.
+
+ANALOG_PROPS = {'scalingFactor': '1.0', 'units': 'V',
+                'displayStateId': 'sensorValue', 'changeThreshold': 'None',
+                'onThreshold': 'None', 'lowLimit': 'None',
+                'highLimit': 'None'}
+
+# Common pluginProps for digital input devices.
+
+DIGITAL_PROPS = {'invert': False, 'pullup': 'up',
+                 'displayStateId': 'onOffState'}
+
+INITIAL_STATES = {'onOffState': False, 'sensorValue': 0.0,
+                  'changeDetected': False, 'limitFault': False}
+
+
+###############################################################################
+#                                                                             #
+#                           MODULE pollBenchmark.py                           #
+#                                  FUNCTIONS                                  #
+#                                                                             #
+###############################################################################
+
+def deviceProps(ioDevType, slot):
+    """
+    Return the deviceTypeId and the device-specific pluginProps for a device
+    of the given type in a host slot (0 to capacity - 1).
+    """
+    if ioDevType == 'pigpio':
+        return 'digitalInput', dict(
+            DIGITAL_PROPS, gpioNumber=str(4 + slot), callback=False,
+            glitchFilter=False, relayInterrupts=False)
+    if ioDevType in ('MCP23017', 'MCP23S17'):
+        chip, bit = divmod(slot, 16)
+        props = dict(DIGITAL_PROPS, ioPort='ab'[bit // 8],
+                     bitNumber=str(bit % 8), priorInterruptRelayGPIO='',
+                     interruptRelayGPIO='', hardwareInterrupt=False)
+        if ioDevType == 'MCP23017':
+            props['i2cAddress'] = '0x%02x' % (0x20 + chip)
+        else:
+            props.update(spiChannel='1', bitRate='1.0', checkSPI=False,
+                         spiDevAddress='0x%02x' % (0x20 + chip))
+        return 'digitalInput', props
+    if ioDevType == 'MCP3208':
+        return 'analogInput', dict(
+            ANALOG_PROPS, spiChannel='0', bitRate='1.0', checkSPI=False,
+            adcChannel=str(slot), inputConfiguration='1',
+            referenceVoltage='3.3')
+    if ioDevType == 'MCP3424':
+        chip, channel = divmod(slot, 4)
+        return 'analogInput', dict(
+            ANALOG_PROPS, i2cAddress='0x%02x' % (0x68 + chip),
+            adcChannel=str(channel), resolution='12', gain='1')
+    if ioDevType == 'MCP4822':
+        return 'analogOutput', dict(
+            ANALOG_PROPS, spiChannel='1', bitRate='1.0', dacChannel=str(slot),
+            gain='1')
+    if ioDevType == 'dkrPiRly':
+        board, relay = divmod(slot, 4)
+        return 'digitalOutput', dict(
+            i2cAddress='0x%02x' % (0x10 + board), relayNumber=str(relay + 1),
+            momentary=False, turnOffDelay='0', displayStateId='onOffState')
+    raise ValueError('unknown device type %s' % ioDevType)
+
+
+def attachChips(emulator, ioDevType, count):
+    """
+    Attach the chip models needed for count devices of a type to a host
+    emulator.
+    """
+    if ioDevType == 'MCP23017':
+        for chip in range(ceil(count / 16)):
+            addChip(emulator, 'MCP23017', 0x20 + chip)
+    elif ioDevType == 'MCP23S17':
+        for chip in range(ceil(count / 16)):
+            addChip(emulator, 'MCP23S17', 1, hwAddress=chip)
+    elif ioDevType == 'MCP3208':
+        adc = addChip(emulator, 'MCP3208', 0)
+        for channel in range(8):
+            adc.setVoltage(channel, 0.3 * (channel + 1))
+    elif ioDevType == 'MCP3424':
+        for chip in range(ceil(count / 4)):
+            adc = addChip(emulator, 'MCP3424', 0x68 + chip)
+            for channel in range(4):
+                adc.setVoltage(channel, 0.25 * (channel + 1))
+    elif ioDevType == 'dkrPiRly':
+        for board in range(ceil(count / 4)):
+            addChip(emulator, 'dkrPiRly', 0x10 + board)
+
+
+def percentile(values, fraction):
+    """ Return a percentile of a sorted list. """
+    if not values:
+        return 0.0
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+###############################################################################
+#                                                                             #
+#                           MODULE pollBenchmark.py                           #
+#                                MAIN PROGRAM                                 #
+#                                                                             #
+###############################################################################
+
+def main():
+    """ Run the benchmark and print the report. """
+    parser = ArgumentParser(description='io device polling benchmark')
+    parser.add_argument('-n', '--number', type=int, default=8,
+                        help='number of devices of each type')
+    parser.add_argument('-t', '--time', type=float, default=10.0,
+                        help='measurement time (seconds)')
+    parser.add_argument('-i', '--interval', type=float, default=0.1,
+                        help='device polling interval (seconds)')
+    parser.add_argument('-l', '--latency', type=float, default=0.0002,
+                        help='emulated daemon command latency (seconds)')
+    parser.add_argument('-H', '--hosts', type=int, default=0,
+                        help='number of emulated hosts (default: minimum '
+                             'needed for the device counts)')
+    parser.add_argument('--types', nargs='+', default=list(CAPACITY),
+                        choices=list(CAPACITY), help='device types')
+    args = parser.parse_args()
+
+    hosts = args.hosts or max(ceil(args.number / CAPACITY[ioDevType])
+                              for ioDevType in args.types)
+    for ioDevType in args.types:
+        if args.number > hosts * CAPACITY[ioDevType]:
+            sys.exit('%s devices of type %s need more than %s hosts'
+                     % (args.number, ioDevType, hosts))
+
+    # Start the emulated hosts and attach the chip models.
+
+    emulators = []
+    for host in range(hosts):
+        emulator = RgpiodEmulator(latency=args.latency)
+        emulator.start()
+        for ioDevType in args.types:
+            count = len(range(host, args.number, hosts))
+            attachChips(emulator, ioDevType, count)
+        emulators.append(emulator)
+
+    # Instrument IoDevice.poll and the subclass poll overrides.
+
+    pollStats = defaultdict(list)  # (latency, cpu) lists by ioDevType.
+
+    def timedPoll(poll):
+        def _timedPoll(ioDev):
+            start, cpuStart = time.perf_counter(), time.thread_time()
+            poll(ioDev)
+            pollStats[ioDev._dev.pluginProps['ioDevType']].append(
+                (time.perf_counter() - start, time.thread_time() - cpuStart))
+        return _timedPoll
+
+    for ioDevClass in vars(ioDevices).values():
+        if (isinstance(ioDevClass, type)
+                and issubclass(ioDevClass, ioDevices.IoDevice)
+                and 'poll' in vars(ioDevClass)):
+            ioDevClass.poll = timedPoll(ioDevClass.poll)
+
+    # Create and start the devices.
+
+    thePlugin = plugin.Plugin('net.papamac.indigoplugin.pigpio', 'Pi GPIO',
+                              '0.11.0', PLUGIN_PREFS)
+    devicesByType = defaultdict(list)
+    for ioDevType in args.types:
+        for n in range(args.number):
+            emulator = emulators[n % hosts]
+            deviceTypeId, props = deviceProps(ioDevType, n // hosts)
+            props.update(hostAddress='localhost', hostId='',
+                         portNumber=str(emulator.port), ioDevType=ioDevType,
+                         polling=True, pollingInterval=str(args.interval),
+                         logAll=False, monitorStatus=False,
+                         statusInterval='10')
+            dev = indigo.devices.create(indigo.Device(
+                '%s-%s' % (ioDevType, n), deviceTypeId, props,
+                INITIAL_STATES))
+            devicesByType[ioDevType].append(dev)
+
+    startTime = time.perf_counter()
+    for ioDevType in args.types:
+        for dev in devicesByType[ioDevType]:
+            thePlugin.deviceStartComm(dev)
+    startupTime = time.perf_counter() - startTime
+    running = sum(1 for devs in devicesByType.values() for dev in devs
+                  if ioDevices.getIoDev(dev))
+
+    # Run the poll scheduler for the measurement time.
+
+    indigo.reset()
+    pollStats.clear()
+    runThread = Thread(target=thePlugin.runConcurrentThread)
+    cpuStart = time.process_time()
+    startTime = time.perf_counter()
+    runThread.start()
+    time.sleep(args.time)
+    thePlugin.stopConcurrentThread()
+    runThread.join()
+    elapsed = time.perf_counter() - startTime
+    cpuTotal = time.process_time() - cpuStart
+    workers = ioDevices._pollScheduler._workers
+
+    # Stop the devices and the emulators.
+
+    for devs in devicesByType.values():
+        for dev in devs:
+            thePlugin.deviceStopComm(dev)
+    thePlugin.shutdown()
+    for emulator in emulators:
+        emulator.stop()
+
+    # Report the results.
+
+    print('%s devices (%s running) on %s hosts; startup %.2f secs; '
+          'interval %s secs; latency %s ms; %.1f secs measured'
+          % (sum(len(devs) for devs in devicesByType.values()), running,
+             hosts, startupTime, args.interval, args.latency * 1000,
+             elapsed))
+    print()
+    print('%-9s %8s %8s %7s %7s %7s %7s %8s %8s %6s'
+          % ('type', 'polls/s', 'target', 'p50 ms', 'p90 ms', 'p99 ms',
+             'max ms', 'upd/poll', 'cpu us', 'cpu %'))
+    for ioDevType in args.types:
+        stats = pollStats[ioDevType]
+        latencies = sorted(stat[0] * 1000 for stat in stats)
+        cpu = sum(stat[1] for stat in stats)
+        updates = sum(sum(dev.calls.values())
+                      for dev in devicesByType[ioDevType])
+        polls = len(stats)
+        print('%-9s %8.1f %8.1f %7.2f %7.2f %7.2f %7.2f %8.2f %8.0f %6.1f'
+              % (ioDevType, polls / elapsed, args.number / args.interval,
+                 percentile(latencies, 0.5), percentile(latencies, 0.9),
+                 percentile(latencies, 0.99),
+                 latencies[-1] if latencies else 0.0,
+                 updates / polls if polls else 0.0,
+                 cpu / polls * 1e6 if polls else 0.0,
+                 100 * cpu / cpuTotal if cpuTotal else 0.0))
+    print()
+    print('%-20s %8s %10s %10s %8s'
+          % ('host', 'polls', 'mean lag', 'max lag', 'dropped'))
+    for hostId, worker in workers.items():
+        meanLag = (worker._totalLagSum / worker._totalPolls
+                   if worker._totalPolls else 0.0)
+        print('%-20s %8s %8.2fms %8.2fms %8s'
+              % (hostId, worker._totalPolls, meanLag * 1000,
+                 worker._totalLagMax * 1000, worker._totalDropped))
+    print()
+    print('server calls: %s' % ', '.join('%s %s' % item for item in
+                                         sorted(indigo.calls.items())))
+    print('process cpu: %.2f secs (%.1f%% of one core)'
+          % (cpuTotal, 100 * cpuTotal / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,930 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+###############################################################################
+#                                                                             #
+#                            Pi GPIO Indigo Plugin                            #
+#                          MODULE rgpiodEmulator.py                           #
+#                                                                             #
+###############################################################################
+
+  BUNDLE:  Raspberry Pi General Purpose Input/Output for Indigo
+           (Pi GPIO.indigoPlugin)
+  MODULE:  rgpiodEmulator.py
+   TITLE:  Local rgpio daemon protocol emulator
+FUNCTION:  rgpiodEmulator.py provides a pure Python server that speaks the
+           rgpio daemon (rgpiod) socket protocol on a localhost port.  It
+           emulates the command subset used by ioDevices.py so that the
+           plugin io devices can be tested and benchmarked without a
+           Raspberry Pi.
+   USAGE:  rgpiodEmulator.py is imported by the benchmark programs in this
+           folder.  It can also be run as a stand-alone server:
+           python3 benchmarks/rgpiodEmulator.py [-p PORT] [-l LATENCY]
+  AUTHOR:  papamac
+ VERSION:  0.11.0
+    DATE:  October 18, 2026
+
+UNLICENSE:
+
+This is free and unencumbered software released into the public domain.
+
+Anyone is free to copy, modify, publish, use, compile, sell, or
+distribute this software, either in source code form or as a compiled
+binary, for any purpose, commercial or non-commercial, and by any
+means.
+
+In jurisdictions that recognize copyright laws, the author or authors
+of this software dedicate any and all copyright interest in the
+software to the public domain. We make this dedication for the benefit
+of the public at large and to the detriment of our heirs and
+successors. We intend this dedication to be an overt act of
+relinquishment in perpetuity of all present and future rights to this
+software under copyright law.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+OTHER DEALINGS IN THE SOFTWARE.
+
+For more information, please refer to <https://unlicense.org/>
+
+MODULE rgpiodEmulator.py DESCRIPTION:
+
+The RgpiodEmulator class runs a threaded TCP server on a localhost port.  Each
+client connection is served by its own thread, as in the real daemon.  A
+command is a 16-byte header (MAGIC, extension length, command, Q, L, H)
+followed by the extension bytes.  The reply is a 16-byte record with the
+signed status in the first four bytes followed, for data commands, by status
+bytes of data.  rgpio.py sbc instances (and rgpioAsync.py sbc instances)
+connect to the emulator exactly as they would to a Raspberry Pi.
+
+The emulator supports the following commands:
+
+files          FO, FR, FC for a small virtual file system that contains
+               /proc/cpuinfo with a configurable Raspberry Pi model name.
+gpio           GO, GC, GSIX, GSOX, GSAX, GSF, GSGIX, GSGOX, GSGF, GR, GW, GGR,
+               GGWX, GMODE, GDEB, GWDOG, GPX, PX, and SX.
+i2c            I2CO, I2CC, I2CRS, I2CWS, I2CRB, I2CWB, I2CRW, I2CWW, I2CRI,
+               I2CWI, I2CRD, I2CWD, and I2CZ.
+spi            SPIO, SPIC, SPIR, SPIW, and SPIX.
+notifications  NOIB, NO, NC, NP, and NR.  Alerts are sent for edges on gpio's
+               claimed for alerts and for watchdog timeouts.
+utilities      FREE, SBC, SHRU, and SHRS.
+
+Other commands return UNKNOWN_COMMAND.
+
+I2C and SPI devices are behavioral models that are attached to the emulator
+at an i2c bus/address or a spi device/channel.  An i2c model implements two
+bus primitives, write(data) and read(count), from which all of the SMBus and
+zip commands are composed.  A spi model implements xfer(data).  The I2cDevice
+and SpiDevice base classes in this module provide simple register file
+models.  Register-accurate chip models are in chipModels.py.  Reads from an
+i2c address with no attached model fail with I2C_READ_FAILED just as they do
+on a real bus.
+
+External inputs are simulated with the setLevel method.  It changes the level
+of an input gpio and sends alerts to any notification streams that have
+claimed the gpio with a matching edge.
+
+Commands are executed and device models are called with the emulator lock
+(RgpiodEmulator.lock) held.  Attached models receive the same lock in their
+lock attribute so that external stimulus methods (e.g., setting a chip input
+from a benchmark thread) can be serialized with the client commands.
+
+Latency is configurable per command.  The emulator sleeps for the latency of
+each command (or the default latency) before sending the reply so that bus
+transfer times and network delays can be modeled.
+"""
+###############################################################################
+#                                                                             #
+#                          MODULE rgpiodEmulator.py                           #
+#                   DUNDERS, IMPORTS, and GLOBAL Constants                    #
+#                                                                             #
+###############################################################################
+
+__author__ = 'papamac'
+__version__ = '0.11.0'
+__date__ = '10/18/2026'
+
+from argparse import ArgumentParser
+from collections import Counter
+from contextlib import nullcontext
+from pathlib import Path
+from socketserver import BaseRequestHandler, ThreadingTCPServer
+import socket
+import struct
+import sys
+from threading import Lock, RLock, Thread, Timer
+import time
+
+# Import rgpio.py from the plugin bundle.
+
+BUNDLE_DIR = (Path(__file__).resolve().parent.parent / 'Pi GPIO.indigoPlugin'
+              / 'Contents' / 'Server Plugin')
+sys.path.insert(0, str(BUNDLE_DIR))
+import rgpio  # noqa: E402
+
+HEADER = struct.Struct('IIHHHH')
+REPLY = struct.Struct('I12s')
+NOTIFY = struct.Struct('QBBBBI')
+
+CPUINFO = ('processor\t: 0\n'
+           'BogoMIPS\t: 108.00\n'
+           'Features\t: fp asimd evtstrm crc32 cpuid\n'
+           'CPU implementer\t: 0x41\n\n'
+           'Hardware\t: BCM2835\n'
+           'Revision\t: c03114\n'
+           'Serial\t\t: 100000001234abcd\n'
+           'Model\t\t: %s Rev 1.4\n')
+
+GPIO_LINES = 54  # Number of lines in the emulated gpio chip.
+
+
+class EmulatorError(Exception):
+    """
+    Raised by the emulator and device models to return a negative rgpio
+    status (e.g., rgpio.I2C_READ_FAILED) to the client.
+    """
+    def __init__(self, status):
+        Exception.__init__(self, rgpio.error_text(status))
+        self.status = status
+
+
+###############################################################################
+#                                                                             #
+#                          MODULE rgpiodEmulator.py                           #
+#                           CLASSES I2cDevice, SpiDevice                      #
+#                                                                             #
+###############################################################################
+
+class I2cDevice:
+    """
+    A generic i2c device model with a 256 byte register file.  The first byte
+    of a write sets the register pointer and any remaining bytes are written
+    to sequential registers.  A read returns bytes from sequential registers
+    starting at the register pointer.  Subclasses override write and read to
+    model specific chips.
+    """
+    lock = nullcontext()  # Replaced by the emulator lock when attached.
+
+    def __init__(self):
+        self.registers = bytearray(256)
+        self.pointer = 0
+
+    def write(self, data):
+        """ Write data bytes to the device. """
+        if data:
+            self.pointer = data[0]
+            for byte in data[1:]:
+                self.registers[self.pointer] = byte
+                self.pointer = (self.pointer + 1) & 0xff
+
+    def read(self, count):
+        """ Read count bytes from the device and return them as bytes. """
+        data = bytearray()
+        for i in range(count):
+            data.append(self.registers[self.pointer])
+            self.pointer = (self.pointer + 1) & 0xff
+        return bytes(data)
+
+
+class SpiDevice:
+    """
+    A generic spi device model that returns zeros for every transfer.
+    Subclasses override xfer to model specific chips.
+    """
+    lock = nullcontext()  # Replaced by the emulator lock when attached.
+
+    def xfer(self, data):
+        """ Transfer data bytes to the device and return the bytes read. """
+        return bytes(len(data))
+
+
+###############################################################################
+#                                                                             #
+#                          MODULE rgpiodEmulator.py                           #
+#                               CLASS _GpioLine                               #
+#                                                                             #
+###############################################################################
+
+class _GpioLine:
+    """ The emulated state of a single gpio line. """
+    def __init__(self):
+        self.owner = None        # Client connection that claimed the line.
+        self.mode = None         # None, 'input', 'output', or 'alert'.
+        self.level = 0
+        self.lFlags = 0
+        self.edges = 0           # Alert edges (RISING_EDGE, etc.).
+        self.notify = None       # Notification handle for alerts.
+        self.debounce = 0        # Debounce time (microseconds).
+        self.watchdog = 0        # Watchdog time (microseconds).
+        self.timer = None        # Watchdog timer.
+        self.group = None        # Group member list if line is a leader.
+        self.tx = None           # Last tx_pulse/tx_pwm/tx_servo parameters.
+
+
+###############################################################################
+#                                                                             #
+#                          MODULE rgpiodEmulator.py                           #
+#                               CLASS _Handler                                #
+#                                                                             #
+###############################################################################
+
+class _Handler(BaseRequestHandler):
+    """
+    Serve a single client connection: receive commands, execute them in the
+    emulator, and send the replies.
+    """
+    def setup(self):
+        self.emulator = self.server.emulator
+        self.sendLock = Lock()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _recv(self, count):
+        """ Receive exactly count bytes; return None if the client closed. """
+        buf = bytearray(count)
+        view = memoryview(buf)
+        received = 0
+        while received < count:
+            try:
+                n = self.request.recv_into(view[received:])
+            except OSError:
+                return None
+            if not n:
+                return None
+            received += n
+        return buf
+
+    def send(self, data):
+        """ Send data to the client under the connection send lock. """
+        with self.sendLock:
+            self.request.sendall(data)
+
+    def handle(self):
+        while True:
+            header = self._recv(HEADER.size)
+            if header is None:
+                break
+            magic, p3, cmd, Q, L, H = HEADER.unpack(header)
+            ext = self._recv(p3) if p3 else bytearray()
+            if ext is None:
+                break
+            status, data = self.emulator.execute(self, cmd, ext)
+            latency = self.emulator.latencies.get(cmd,
+                                                  self.emulator.latency)
+            if latency:
+                time.sleep(latency)
+            try:
+                self.send(REPLY.pack(status & 0xffffffff, b'') + data)
+            except OSError:
+                break
+
+    def finish(self):
+        self.emulator.release(self)
+
+
+###############################################################################
+#                                                                             #
+#                          MODULE rgpiodEmulator.py                           #
+#                            CLASS RgpiodEmulator                             #
+#                                                                             #
+###############################################################################
+
+class RgpiodEmulator:
+    """
+    An rgpio daemon emulator on a localhost port.  Use start and stop (or a
+    with statement) to run the server.  The port attribute is the actual
+    port number after start (the default port of 0 selects a free port).
+    """
+
+    # Command dispatch dictionary: command code -> method name.
+
+    COMMANDS = {
+        rgpio._CMD_FO:    '_fileOpen',
+        rgpio._CMD_FC:    '_fileClose',
+        rgpio._CMD_FR:    '_fileRead',
+        rgpio._CMD_GO:    '_gpiochipOpen',
+        rgpio._CMD_GC:    '_gpiochipClose',
+        rgpio._CMD_GSIX:  '_gpioClaimInput',
+        rgpio._CMD_GSOX:  '_gpioClaimOutput',
+        rgpio._CMD_GSAX:  '_gpioClaimAlert',
+        rgpio._CMD_GSF:   '_gpioFree',
+        rgpio._CMD_GSGIX: '_groupClaimInput',
+        rgpio._CMD_GSGOX: '_groupClaimOutput',
+        rgpio._CMD_GSGF:  '_gpioFree',
+        rgpio._CMD_GR:    '_gpioRead',
+        rgpio._CMD_GW:    '_gpioWrite',
+        rgpio._CMD_GGR:   '_groupRead',
+        rgpio._CMD_GGWX:  '_groupWrite',
+        rgpio._CMD_GMODE: '_gpioGetMode',
+        rgpio._CMD_GDEB:  '_gpioSetDebounce',
+        rgpio._CMD_GWDOG: '_gpioSetWatchdog',
+        rgpio._CMD_GPX:   '_txPulse',
+        rgpio._CMD_PX:    '_txPulse',
+        rgpio._CMD_SX:    '_txPulse',
+        rgpio._CMD_I2CO:  '_i2cOpen',
+        rgpio._CMD_I2CC:  '_i2cClose',
+        rgpio._CMD_I2CRS: '_i2cReadByte',
+        rgpio._CMD_I2CWS: '_i2cWriteByte',
+        rgpio._CMD_I2CRB: '_i2cReadByteData',
+        rgpio._CMD_I2CWB: '_i2cWriteByteData',
+        rgpio._CMD_I2CRW: '_i2cReadWordData',
+        rgpio._CMD_I2CWW: '_i2cWriteWordData',
+        rgpio._CMD_I2CRI: '_i2cReadBlockData',
+        rgpio._CMD_I2CWI: '_i2cWriteBlockData',
+        rgpio._CMD_I2CRD: '_i2cReadDevice',
+        rgpio._CMD_I2CWD: '_i2cWriteDevice',
+        rgpio._CMD_I2CZ:  '_i2cZip',
+        rgpio._CMD_SPIO:  '_spiOpen',
+        rgpio._CMD_SPIC:  '_spiClose',
+        rgpio._CMD_SPIR:  '_spiRead',
+        rgpio._CMD_SPIW:  '_spiWrite',
+        rgpio._CMD_SPIX:  '_spiXfer',
+        rgpio._CMD_NOIB:  '_notifyOpenInBand',
+        rgpio._CMD_NO:    '_notifyOpen',
+        rgpio._CMD_NC:    '_notifyClose',
+        rgpio._CMD_NP:    '_notifyPauseResume',
+        rgpio._CMD_NR:    '_notifyPauseResume',
+        rgpio._CMD_FREE:  '_free',
+        rgpio._CMD_SBC:   '_sbcName',
+        rgpio._CMD_SHRU:  '_ok',
+        rgpio._CMD_SHRS:  '_ok'}
+
+    # Command names for latency settings: name -> command code.
+
+    CODES = {name[5:]: code for name, code in vars(rgpio).items()
+             if name.startswith('_CMD_')}
+
+    def __init__(self, host='localhost', port=0,
+                 model='Raspberry Pi 4 Model B', gpioChip=0, latency=0.0):
+        self.host = host
+        self.port = port
+        self.gpioChip = gpioChip
+        self.latency = latency     # Default command latency (seconds).
+        self.latencies = {}        # Command latencies by command code.
+        self.files = {'/proc/cpuinfo': (CPUINFO % model).encode()}
+        self.lines = [_GpioLine() for i in range(GPIO_LINES)]
+        self.i2cDevices = {}       # Models by (bus, address).
+        self.spiDevices = {}       # Models by (device, channel).
+        self.commandCounts = Counter()
+        self.lock = RLock()
+        self._handles = {}         # (kind, handle) -> (owner, resource).
+        self._nextHandle = Counter()
+        self._notifiers = {}       # Notification handle -> [connection,
+        #                                                     paused].
+        self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    # CONFIGURATION
+
+    def setLatency(self, command, seconds):
+        """
+        Set the latency for a command given its name (e.g., 'I2CRB') or its
+        command code.
+        """
+        code = self.CODES[command] if isinstance(command, str) else command
+        self.latencies[code] = seconds
+
+    def addI2cDevice(self, address, device, bus=1):
+        """ Attach an i2c device model at a bus and address. """
+        device.lock = self.lock
+        self.i2cDevices[(bus, address)] = device
+        return device
+
+    def addSpiDevice(self, channel, device, spiDevice=0):
+        """ Attach a spi device model at a spi device and channel. """
+        device.lock = self.lock
+        self.spiDevices[(spiDevice, channel)] = device
+        return device
+
+    # SERVER CONTROL
+
+    def start(self):
+        """ Start the server thread and return the port number. """
+        ThreadingTCPServer.allow_reuse_address = True
+        self._server = ThreadingTCPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.emulator = self
+        self.port = self._server.server_address[1]
+        Thread(target=self._server.serve_forever, name='rgpiodEmulator',
+               daemon=True).start()
+        return self.port
+
+    def stop(self):
+        """ Stop the server and cancel any watchdog timers. """
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self.lock:
+            for line in self.lines:
+                if line.timer:
+                    line.timer.cancel()
+                    line.timer = None
+
+    # EXTERNAL INPUTS
+
+    def setLevel(self, gpio, level):
+        """
+        Set the level of an input gpio as if it were driven externally and
+        send an alert if the gpio is claimed for alerts on a matching edge.
+        """
+        with self.lock:
+            line = self.lines[gpio]
+            if line.mode == 'output' or line.level == level:
+                line.level = level
+                return
+            line.level = level
+            if line.mode == 'alert':
+                edge = rgpio.RISING_EDGE if level else rgpio.FALLING_EDGE
+                if line.edges & edge:
+                    self._alert(gpio, level)
+                if line.watchdog:
+                    self._startWatchdog(gpio)
+
+    def _alert(self, gpio, level):
+        """ Send an alert record for a gpio to its notification stream. """
+        notifier = self._notifiers.get(self.lines[gpio].notify)
+        if notifier and not notifier[1]:
+            record = NOTIFY.pack(time.monotonic_ns(), self.gpioChip, gpio,
+                                 level, 0, 0)
+            try:
+                notifier[0].send(record)
+            except OSError:
+                pass
+
+    def _startWatchdog(self, gpio):
+        """ (Re)start the watchdog timer for a gpio. """
+        line = self.lines[gpio]
+        if line.timer:
+            line.timer.cancel()
+            line.timer = None
+        if line.watchdog:
+            line.timer = Timer(line.watchdog / 1e6, self._watchdogTimeout,
+                               (gpio,))
+            line.timer.daemon = True
+            line.timer.start()
+
+    def _watchdogTimeout(self, gpio):
+        """ Send a watchdog timeout alert and restart the timer. """
+        with self.lock:
+            if self.lines[gpio].watchdog:
+                self._alert(gpio, rgpio.TIMEOUT)
+                self._startWatchdog(gpio)
+
+    # COMMAND EXECUTION
+
+    def execute(self, conn, cmd, ext):
+        """
+        Execute a command for a client connection and return the status and
+        reply data bytes.
+        """
+        self.commandCounts[cmd] += 1
+        method = self.COMMANDS.get(cmd)
+        if method is None:
+            return rgpio.UNKNOWN_COMMAND, b''
+        try:
+            with self.lock:
+                result = getattr(self, method)(conn, cmd, ext)
+        except EmulatorError as err:
+            return err.status, b''
+        except (struct.error, IndexError):
+            return rgpio.BAD_PARAM_NUM, b''
+        if isinstance(result, int):
+            return result, b''
+        return len(result), bytes(result)
+
+    def release(self, conn):
+        """ Release all resources owned by a client connection. """
+        with self.lock:
+            for key, (owner, resource) in list(self._handles.items()):
+                if owner is conn:
+                    del self._handles[key]
+            for handle, notifier in list(self._notifiers.items()):
+                if notifier[0] is conn:
+                    del self._notifiers[handle]
+            for gpio, line in enumerate(self.lines):
+                if line.owner is conn:
+                    self._freeLine(gpio)
+
+    def _open(self, conn, kind, resource):
+        """ Allocate a handle for a resource. """
+        handle = self._nextHandle[kind]
+        self._nextHandle[kind] += 1
+        self._handles[(kind, handle)] = conn, resource
+        return handle
+
+    def _close(self, kind, handle):
+        """ Close a handle. """
+        if self._handles.pop((kind, handle), None) is None:
+            raise EmulatorError(rgpio.BAD_HANDLE)
+        return rgpio.OKAY
+
+    def _resource(self, kind, handle):
+        """ Return the resource for a handle. """
+        entry = self._handles.get((kind, handle))
+        if entry is None:
+            raise EmulatorError(rgpio.BAD_HANDLE)
+        return entry[1]
+
+    @staticmethod
+    def _ok(conn, cmd, ext):
+        return rgpio.OKAY
+
+    # FILES
+
+    def _fileOpen(self, conn, cmd, ext):
+        mode, = struct.unpack_from('I', ext)
+        name = bytes(ext[4:]).decode()
+        if name not in self.files:
+            return rgpio.NO_FILE_ACCESS
+        if mode != rgpio.FILE_READ:
+            return rgpio.BAD_FILE_MODE
+        return self._open(conn, 'file', [self.files[name], 0])
+
+    def _fileClose(self, conn, cmd, ext):
+        return self._close('file', struct.unpack_from('I', ext)[0])
+
+    def _fileRead(self, conn, cmd, ext):
+        handle, count = struct.unpack_from('II', ext)
+        file = self._resource('file', handle)
+        data = file[0][file[1]:file[1] + count]
+        file[1] += len(data)
+        return data
+
+    # GPIO
+
+    def _gpiochipOpen(self, conn, cmd, ext):
+        chip, = struct.unpack_from('I', ext)
+        if chip != self.gpioChip:
+            return rgpio.CANNOT_OPEN_CHIP
+        return self._open(conn, 'gpio', chip)
+
+    def _gpiochipClose(self, conn, cmd, ext):
+        return self._close('gpio', struct.unpack_from('I', ext)[0])
+
+    def _line(self, conn, handle, gpio, claimed=True):
+        """ Validate a handle and gpio and return the gpio line. """
+        self._resource('gpio', handle)
+        if not 0 <= gpio < GPIO_LINES:
+            raise EmulatorError(rgpio.BAD_GPIO_NUMBER)
+        line = self.lines[gpio]
+        if claimed and line.mode is None:
+            raise EmulatorError(rgpio.GPIO_NOT_ALLOCATED)
+        if line.owner not in (None, conn):
+            raise EmulatorError(rgpio.GPIO_BUSY)
+        return line
+
+    def _claim(self, conn, handle, gpio, mode, lFlags):
+        line = self._line(conn, handle, gpio, claimed=False)
+        if line.timer:
+            line.timer.cancel()
+            line.timer = None
+        line.owner, line.mode, line.lFlags = conn, mode, lFlags
+        line.edges = line.watchdog = line.debounce = 0
+        line.group, line.tx = None, None
+        if mode != 'output':
+            if lFlags & rgpio.SET_PULL_UP:
+                line.level = 1
+            elif lFlags & rgpio.SET_PULL_DOWN:
+                line.level = 0
+        return line
+
+    def _freeLine(self, gpio):
+        line = self.lines[gpio]
+        if line.timer:
+            line.timer.cancel()
+        for member in line.group or ():
+            if member != gpio:
+                self.lines[member].owner = self.lines[member].mode = None
+        self.lines[gpio] = _GpioLine()
+        self.lines[gpio].level = line.level
+
+    def _gpioClaimInput(self, conn, cmd, ext):
+        handle, lFlags, gpio = struct.unpack_from('III', ext)
+        self._claim(conn, handle, gpio, 'input', lFlags)
+        return rgpio.OKAY
+
+    def _gpioClaimOutput(self, conn, cmd, ext):
+        handle, lFlags, gpio, level = struct.unpack_from('IIII', ext)
+        self._claim(conn, handle, gpio, 'output', lFlags).level = level
+        return rgpio.OKAY
+
+    def _gpioClaimAlert(self, conn, cmd, ext):
+        handle, lFlags, eFlags, gpio, notify = struct.unpack_from('IIIII',
+                                                                  ext)
+        line = self._claim(conn, handle, gpio, 'alert', lFlags)
+        line.edges, line.notify = eFlags, notify
+        return rgpio.OKAY
+
+    def _gpioFree(self, conn, cmd, ext):
+        handle, gpio = struct.unpack_from('II', ext)
+        self._line(conn, handle, gpio)
+        self._freeLine(gpio)
+        return rgpio.OKAY
+
+    def _groupClaim(self, conn, ext, mode):
+        handle, lFlags = struct.unpack_from('II', ext)
+        values = struct.unpack_from('%sI' % ((len(ext) - 8) // 4), ext, 8)
+        count = len(values) if mode == 'input' else len(values) // 2
+        gpios = values[:count]
+        for i, gpio in enumerate(gpios):
+            line = self._claim(conn, handle, gpio, mode, lFlags)
+            if mode == 'output':
+                line.level = values[count + i]
+        self.lines[gpios[0]].group = list(gpios)
+        return rgpio.OKAY
+
+    def _groupClaimInput(self, conn, cmd, ext):
+        return self._groupClaim(conn, ext, 'input')
+
+    def _groupClaimOutput(self, conn, cmd, ext):
+        return self._groupClaim(conn, ext, 'output')
+
+    def _gpioRead(self, conn, cmd, ext):
+        handle, gpio = struct.unpack_from('II', ext)
+        return self._line(conn, handle, gpio).level
+
+    def _gpioWrite(self, conn, cmd, ext):
+        handle, gpio, level = struct.unpack_from('III', ext)
+        line = self._line(conn, handle, gpio)
+        if line.mode != 'output':
+            return rgpio.GPIO_NOT_AN_OUTPUT
+        line.level = 1 if level else 0
+        return rgpio.OKAY
+
+    def _groupRead(self, conn, cmd, ext):
+        handle, gpio = struct.unpack_from('II', ext)
+        group = self._line(conn, handle, gpio).group
+        if group is None:
+            return rgpio.NOT_GROUP_LEADER
+        levels = 0
+        for bit, member in enumerate(group):
+            levels |= self.lines[member].level << bit
+        return struct.pack('QI', levels, len(group))
+
+    def _groupWrite(self, conn, cmd, ext):
+        bits, mask, handle, gpio = struct.unpack_from('QQII', ext)
+        line = self._line(conn, handle, gpio)
+        if line.group is None:
+            return rgpio.NOT_GROUP_LEADER
+        if line.mode != 'output':
+            return rgpio.GPIO_NOT_AN_OUTPUT
+        for bit, member in enumerate(line.group):
+            if mask >> bit & 1:
+                self.lines[member].level = bits >> bit & 1
+        return rgpio.OKAY
+
+    def _gpioGetMode(self, conn, cmd, ext):
+        handle, gpio = struct.unpack_from('II', ext)
+        line = self._line(conn, handle, gpio, claimed=False)
+        return {None: 0, 'input': 1, 'output': 2, 'alert': 5}[line.mode]
+
+    def _gpioSetDebounce(self, conn, cmd, ext):
+        handle, gpio, micros = struct.unpack_from('III', ext)
+        self._line(conn, handle, gpio).debounce = micros
+        return rgpio.OKAY
+
+    def _gpioSetWatchdog(self, conn, cmd, ext):
+        handle, gpio, micros = struct.unpack_from('III', ext)
+        line = self._line(conn, handle, gpio)
+        if line.mode != 'alert':
+            return rgpio.BAD_EVENT_REQUEST
+        line.watchdog = micros
+        self._startWatchdog(gpio)
+        return rgpio.OKAY
+
+    def _txPulse(self, conn, cmd, ext):
+        params = struct.unpack_from('IIIIII', ext)
+        line = self._line(conn, params[0], params[1])
+        if line.mode != 'output':
+            return rgpio.GPIO_NOT_AN_OUTPUT
+        line.tx = (cmd,) + params[2:]
+        return 1  # Entries left in the tx queue.
+
+    # I2C
+
+    def _i2cOpen(self, conn, cmd, ext):
+        bus, address, flags = struct.unpack_from('III', ext)
+        if bus > 1:
+            return rgpio.BAD_I2C_BUS
+        if address > 0x7f:
+            return rgpio.BAD_I2C_ADDR
+        return self._open(conn, 'i2c', (bus, address))
+
+    def _i2cClose(self, conn, cmd, ext):
+        return self._close('i2c', struct.unpack_from('I', ext)[0])
+
+    def _i2cDevice(self, handle, status):
+        """ Return the i2c model for a handle or raise status. """
+        device = self.i2cDevices.get(self._resource('i2c', handle))
+        if device is None:
+            raise EmulatorError(status)
+        return device
+
+    def _i2cReadByte(self, conn, cmd, ext):
+        handle, = struct.unpack_from('I', ext)
+        return self._i2cDevice(handle, rgpio.I2C_READ_FAILED).read(1)[0]
+
+    def _i2cWriteByte(self, conn, cmd, ext):
+        handle, byte = struct.unpack_from('II', ext)
+        self._i2cDevice(handle, rgpio.I2C_WRITE_FAILED).write(bytes((byte,)))
+        return rgpio.OKAY
+
+    def _i2cReadByteData(self, conn, cmd, ext):
+        handle, register = struct.unpack_from('II', ext)
+        device = self._i2cDevice(handle, rgpio.I2C_READ_FAILED)
+        device.write(bytes((register,)))
+        return device.read(1)[0]
+
+    def _i2cWriteByteData(self, conn, cmd, ext):
+        handle, register, byte = struct.unpack_from('III', ext)
+        device = self._i2cDevice(handle, rgpio.I2C_WRITE_FAILED)
+        device.write(bytes((register, byte)))
+        return rgpio.OKAY
+
+    def _i2cReadWordData(self, conn, cmd, ext):
+        handle, register = struct.unpack_from('II', ext)
+        device = self._i2cDevice(handle, rgpio.I2C_READ_FAILED)
+        device.write(bytes((register,)))
+        low, high = device.read(2)
+        return low | high << 8
+
+    def _i2cWriteWordData(self, conn, cmd, ext):
+        handle, register, word = struct.unpack_from('III', ext)
+        device = self._i2cDevice(handle, rgpio.I2C_WRITE_FAILED)
+        device.write(bytes((register, word & 0xff, word >> 8 & 0xff)))
+        return rgpio.OKAY
+
+    def _i2cReadBlockData(self, conn, cmd, ext):
+        handle, register, count = struct.unpack_from('III', ext)
+        device = self._i2cDevice(handle, rgpio.I2C_READ_FAILED)
+        device.write(bytes((register,)))
+        return device.read(count)
+
+    def _i2cWriteBlockData(self, conn, cmd, ext):
+        handle, register = struct.unpack_from('II', ext)
+        device = self._i2cDevice(handle, rgpio.I2C_WRITE_FAILED)
+        device.write(bytes((register,)) + bytes(ext[8:]))
+        return rgpio.OKAY
+
+    def _i2cReadDevice(self, conn, cmd, ext):
+        handle, count = struct.unpack_from('II', ext)
+        return self._i2cDevice(handle, rgpio.I2C_READ_FAILED).read(count)
+
+    def _i2cWriteDevice(self, conn, cmd, ext):
+        handle, = struct.unpack_from('I', ext)
+        device = self._i2cDevice(handle, rgpio.I2C_WRITE_FAILED)
+        device.write(bytes(ext[4:]))
+        return rgpio.OKAY
+
+    def _i2cZip(self, conn, cmd, ext):
+        """
+        Execute an i2c_zip command list: End 0, Escape 1, Address 2 P,
+        Flags 3 lsb msb, Read 4 P, Write 5 P ....
+        """
+        handle, = struct.unpack_from('I', ext)
+        bus, address = self._resource('i2c', handle)
+        data = bytes(ext[4:])
+        result = bytearray()
+        i, escape = 0, False
+        while i < len(data) and data[i]:
+            code = data[i]
+            i += 1
+            if code == 1:
+                escape = True
+                continue
+            if code == 3:
+                i += 2
+            elif code in (2, 4, 5):
+                if escape:
+                    p = data[i] | data[i + 1] << 8
+                    i += 2
+                else:
+                    p = data[i]
+                    i += 1
+                if code == 2:
+                    address = p
+                else:
+                    device = self.i2cDevices.get((bus, address))
+                    if code == 4:
+                        if device is None:
+                            return rgpio.I2C_READ_FAILED
+                        result += device.read(p)
+                    else:
+                        if device is None:
+                            return rgpio.I2C_WRITE_FAILED
+                        device.write(data[i:i + p])
+                        i += p
+            else:
+                return rgpio.BAD_I2C_CMD
+            escape = False
+        return result
+
+    # SPI
+
+    def _spiOpen(self, conn, cmd, ext):
+        device, channel, baud, flags = struct.unpack_from('IIII', ext)
+        if channel > 2:
+            return rgpio.BAD_SPI_CHANNEL
+        return self._open(conn, 'spi', (device, channel))
+
+    def _spiClose(self, conn, cmd, ext):
+        return self._close('spi', struct.unpack_from('I', ext)[0])
+
+    def _spiXfer(self, conn, cmd, ext):
+        handle, = struct.unpack_from('I', ext)
+        device = self.spiDevices.get(self._resource('spi', handle),
+                                     SpiDevice())
+        return device.xfer(bytes(ext[4:]))
+
+    def _spiWrite(self, conn, cmd, ext):
+        return len(self._spiXfer(conn, cmd, ext))
+
+    def _spiRead(self, conn, cmd, ext):
+        handle, count = struct.unpack_from('II', ext)
+        device = self.spiDevices.get(self._resource('spi', handle),
+                                     SpiDevice())
+        return device.xfer(bytes(count))
+
+    # NOTIFICATIONS
+
+    def _notifyOpenInBand(self, conn, cmd, ext):
+        handle = self._nextHandle['notify']
+        self._nextHandle['notify'] += 1
+        self._notifiers[handle] = [conn, False]
+        return handle
+
+    @staticmethod
+    def _notifyOpen(conn, cmd, ext):
+        return rgpio.NO_HANDLE  # Pipe notifications are not emulated.
+
+    def _notifyClose(self, conn, cmd, ext):
+        handle, = struct.unpack_from('I', ext)
+        if self._notifiers.pop(handle, None) is None:
+            return rgpio.BAD_HANDLE
+        return rgpio.OKAY
+
+    def _notifyPauseResume(self, conn, cmd, ext):
+        handle, = struct.unpack_from('I', ext)
+        notifier = self._notifiers.get(handle)
+        if notifier is None:
+            return rgpio.BAD_HANDLE
+        notifier[1] = cmd == rgpio._CMD_NP
+        return rgpio.OKAY
+
+    # UTILITIES
+
+    def _free(self, conn, cmd, ext):
+        self.release(conn)
+        return rgpio.OKAY
+
+    @staticmethod
+    def _sbcName(conn, cmd, ext):
+        return b'rgpiodEmulator'
+
+
+###############################################################################
+#                                                                             #
+#                          MODULE rgpiodEmulator.py                           #
+#                                MAIN PROGRAM                                 #
+#                                                                             #
+###############################################################################
+
+def main():
+    """ Run the emulator as a stand-alone server until interrupted. """
+    parser = ArgumentParser(description='rgpio daemon protocol emulator')
+    parser.add_argument('-p', '--port', type=int, default=8889,
+                        help='localhost port number')
+    parser.add_argument('-l', '--latency', type=float, default=0.0,
+                        help='default command latency (seconds)')
+    parser.add_argument('-m', '--model', default='Raspberry Pi 4 Model B',
+                        help='Raspberry Pi model name in /proc/cpuinfo')
+    args = parser.parse_args()
+
+    emulator = RgpiodEmulator(port=args.port, model=args.model,
+                              latency=args.latency)
+    emulator.addI2cDevice(0x20, I2cDevice())
+    print('rgpiodEmulator listening on localhost:%s' % emulator.start())
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    emulator.stop()
+    for cmd, count in sorted(emulator.commandCounts.items()):
+        print('%6s %8s' % (cmd, count))
+
+
+if __name__ == '__main__':
+    main()